@@ -0,0 +1,54 @@
+"""add citation edges
+
+Revision ID: 3f8a2c1d9b47
+Revises: 7da6e11d98ae
+Create Date: 2026-10-19 10:12:31.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c1d9b47'
+down_revision: Union[str, None] = '7da6e11d98ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 创建引用边表
+    op.create_table(
+        'citation_edges',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('citing_key', sa.String(), nullable=False),
+        sa.Column('cited_key', sa.String(), nullable=False),
+        sa.Column('citing_paper_id', sa.Integer(), nullable=True),
+        sa.Column('citing_title', sa.Text(), nullable=True),
+        sa.Column('cited_title', sa.Text(), nullable=True),
+        sa.Column('cited_authors', sa.Text(), nullable=True),
+        sa.Column('cited_year', sa.Integer(), nullable=True),
+        sa.Column('cited_doi', sa.String(), nullable=True),
+        sa.Column('raw', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['citing_paper_id'], ['papers.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('citing_key', 'cited_key', name='uq_citation_edges_citing_cited')
+    )
+
+    # 创建索引
+    op.create_index(op.f('ix_citation_edges_id'), 'citation_edges', ['id'], unique=False)
+    op.create_index(op.f('ix_citation_edges_cited_key'), 'citation_edges', ['cited_key'], unique=False)
+    op.create_index(op.f('ix_citation_edges_citing_paper_id'), 'citation_edges', ['citing_paper_id'], unique=False)
+
+
+def downgrade() -> None:
+    # 删除索引
+    op.drop_index(op.f('ix_citation_edges_citing_paper_id'), table_name='citation_edges')
+    op.drop_index(op.f('ix_citation_edges_cited_key'), table_name='citation_edges')
+    op.drop_index(op.f('ix_citation_edges_id'), table_name='citation_edges')
+
+    # 删除表
+    op.drop_table('citation_edges')
@@ -0,0 +1,29 @@
+"""add paper pdf_url
+
+Revision ID: 9c41d7e2a5b3
+Revises: 3f8a2c1d9b47
+Create Date: 2026-10-19 14:03:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d7e2a5b3'
+down_revision: Union[str, None] = '3f8a2c1d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 上传文件路径（内容寻址存储），按路径统计引用计数
+    op.add_column('papers', sa.Column('pdf_url', sa.String(), nullable=True))
+    op.create_index(op.f('ix_papers_pdf_url'), 'papers', ['pdf_url'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_papers_pdf_url'), table_name='papers')
+    op.drop_column('papers', 'pdf_url')
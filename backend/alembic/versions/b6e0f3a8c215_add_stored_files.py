@@ -0,0 +1,57 @@
+"""add stored files index
+
+Revision ID: b6e0f3a8c215
+Revises: 9c41d7e2a5b3
+Create Date: 2026-10-19 15:27:44.106382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e0f3a8c215'
+down_revision: Union[str, None] = '9c41d7e2a5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 创建文件元数据表
+    op.create_table(
+        'stored_files',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_hash', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('path')
+    )
+
+    # 创建存储总量表（单行，首次访问时扫描磁盘写入）
+    op.create_table(
+        'storage_totals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('file_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # 创建索引
+    op.create_index(op.f('ix_stored_files_id'), 'stored_files', ['id'], unique=False)
+    op.create_index('ix_stored_files_modified_at_id', 'stored_files', ['modified_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    # 删除索引
+    op.drop_index('ix_stored_files_modified_at_id', table_name='stored_files')
+    op.drop_index(op.f('ix_stored_files_id'), table_name='stored_files')
+
+    # 删除表
+    op.drop_table('storage_totals')
+    op.drop_table('stored_files')
@@ -0,0 +1,37 @@
+"""add citation graph version
+
+Revision ID: d2a7c4e91f06
+Revises: b6e0f3a8c215
+Create Date: 2026-10-19 18:02:13.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c4e91f06'
+down_revision: Union[str, None] = 'b6e0f3a8c215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 创建引用图版本表（单行）
+    version_table = op.create_table(
+        'citation_graph_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # 写入初始版本，之后的写入只做原子加一
+    op.bulk_insert(version_table, [{'id': 1, 'version': 0}])
+
+
+def downgrade() -> None:
+    # 删除表
+    op.drop_table('citation_graph_version')
@@ -0,0 +1,27 @@
+"""add user is_superuser
+
+Revision ID: e5b18f3c7a29
+Revises: d2a7c4e91f06
+Create Date: 2026-10-19 21:14:38.402517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b18f3c7a29'
+down_revision: Union[str, None] = 'd2a7c4e91f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 管理员标记，已有用户默认不是管理员
+    op.add_column('users', sa.Column('is_superuser', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'is_superuser')
@@ -32,4 +32,14 @@ async def get_current_user(
     user = db.query(User).filter(User.email == token_data.email).first()
     if user is None:
         raise credentials_exception
-    return user 
\ No newline at end of file
+    return user
+
+async def get_current_superuser(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要管理员权限",
+        )
+    return current_user
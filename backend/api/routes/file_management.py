@@ -1,32 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Dict, Any
-from ...core.database import get_db
-from ...api.deps import get_current_user
-from ...services.file_management import FileManagementService
+from typing import List, Dict, Any, Optional
+from core.database import get_db
+from api.deps import get_current_superuser
+from services.file_management import FileManagementService
+from core.config import settings
 
+# 这些接口直接操作共享的上传目录，只对管理员开放
 router = APIRouter()
 file_service = FileManagementService()
 
+@router.on_event("startup")
+async def start_cleanup_scheduler():
+    """应用启动时开启定时清理"""
+    if settings.FILE_CLEANUP_INTERVAL_HOURS > 0:
+        file_service.start_cleanup_scheduler(
+            settings.FILE_CLEANUP_INTERVAL_HOURS * 3600,
+            settings.FILE_CLEANUP_DAYS
+        )
+
+@router.on_event("shutdown")
+async def stop_cleanup_scheduler():
+    file_service.stop_cleanup_scheduler()
+
 @router.get("/storage")
 async def get_storage_info(
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_superuser)
 ):
     """获取存储信息"""
     return await file_service.get_storage_info()
 
 @router.get("/files")
 async def list_files(
-    page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    current_user = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，不传时返回第一页"),
+    page: Optional[int] = Query(
+        None, ge=1, deprecated=True,
+        description="已弃用：按页码访问使用 OFFSET，开销随页码线性增长，请改用 cursor"
+    ),
+    current_user = Depends(get_current_superuser)
 ):
-    """列出文件"""
-    return await file_service.list_files(page, page_size)
+    """列出文件（按修改时间从新到旧，用 next_cursor 翻页，next_cursor 为空表示没有下一页）"""
+    return await file_service.list_files(page_size, cursor, page)
 
 @router.delete("/files/{file_path:path}")
 async def delete_file(
     file_path: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_superuser)
 ):
     """删除文件"""
     success = await file_service.delete_file(file_path)
@@ -38,7 +57,7 @@ async def delete_file(
 async def move_file(
     source_path: str,
     target_path: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_superuser)
 ):
     """移动文件"""
     success = await file_service.move_file(source_path, target_path)
@@ -49,11 +68,27 @@ async def move_file(
 @router.post("/cleanup")
 async def cleanup_files(
     days: int = Query(30, ge=1),
-    current_user = Depends(get_current_user)
+    dry_run: bool = Query(False, description="只统计将会删除的文件"),
+    background: bool = Query(False, description="立即返回任务，通过 /cleanup/{job_id} 查询进度"),
+    current_user = Depends(get_current_superuser)
 ):
     """清理旧文件"""
-    count = await file_service.cleanup_old_files(days)
+    if background:
+        job = await file_service.start_cleanup(days, dry_run)
+        return {
+            "message": "清理任务已启动",
+            "job": job
+        }
+    count = await file_service.cleanup_old_files(days, dry_run)
     return {
-        "message": f"成功清理 {count} 个文件",
+        "message": f"{'将清理' if dry_run else '成功清理'} {count} 个文件",
         "cleaned_count": count
-    } 
\ No newline at end of file
+    }
+
+@router.get("/cleanup/{job_id}")
+async def get_cleanup_job(
+    job_id: str,
+    current_user = Depends(get_current_superuser)
+):
+    """查询清理任务进度"""
+    return file_service.get_cleanup_job(job_id) 
\ No newline at end of file
@@ -1,18 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from typing import List
 from core.database import get_db
-from models.models import Paper
+from models.models import Paper, PaperAnalysis, Review, CitationEdge
 from schemas.paper import PaperCreate, PaperResponse, PaperAnalysisCreate, PaperAnalysisResponse
 from api.deps import get_current_user
 from services.paper_analysis import PaperAnalysisService
 from services.file_service import FileService
+from services.file_serving import FileServer
 from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 paper_service = PaperAnalysisService()
 file_service = FileService()
+file_server = FileServer(file_service.blob_store, file_service.get_content_hash)
+
+def index_paper_references(paper_id: int, title: str, file_path: str):
+    """后台任务：提取全文章节（写入缓存），并把参考文献写入引用图"""
+    try:
+        sections = file_service.load_pdf_sections(file_path)
+        store = paper_service.citation_store
+        if store is not None and sections.get('references'):
+            count = store.record_sections(title, sections, paper_id=paper_id)
+            logger.info(f"论文 {paper_id} 写入 {count} 条引用")
+    except Exception as e:
+        logger.error(f"索引论文 {paper_id} 的参考文献失败: {str(e)}")
 
 @router.post("/", response_model=PaperResponse)
 def create_paper(
@@ -47,13 +62,39 @@ def get_paper(
         raise HTTPException(status_code=404, detail="Paper not found")
     return paper
 
+@router.delete("/{paper_id}")
+def delete_paper(
+    paper_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    paper = db.query(Paper).filter(Paper.id == paper_id, Paper.author_id == current_user.id).first()
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    
+    pdf_url = paper.pdf_url
+    db.query(PaperAnalysis).filter(PaperAnalysis.paper_id == paper_id).delete(synchronize_session=False)
+    db.query(Review).filter(Review.paper_id == paper_id).delete(synchronize_session=False)
+    # 引用边保留在引用图中，只解除与论文记录的关联
+    db.query(CitationEdge).filter(CitationEdge.citing_paper_id == paper_id).update(
+        {CitationEdge.citing_paper_id: None}, synchronize_session=False
+    )
+    db.delete(paper)
+    db.commit()
+    
+    # 提交后再释放文件：没有其他论文引用同一内容时删除文件并更新索引
+    if pdf_url:
+        file_service.release_upload(pdf_url)
+    return {"message": "Paper deleted successfully"}
+
 @router.get("/{paper_id}/file")
 async def get_paper_file(
     paper_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    paper = db.query(Paper).filter(Paper.id == paper_id, Paper.user_id == current_user.id).first()
+    paper = db.query(Paper).filter(Paper.id == paper_id, Paper.author_id == current_user.id).first()
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
     
@@ -64,11 +105,10 @@ async def get_paper_file(
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Paper file not found")
     
-    return FileResponse(
-        path=file_path,
-        filename=file_path.name,
-        media_type='application/pdf'
-    )
+    # 支持 Range 按需加载和 ETag 条件请求，重复打开和翻页只传输需要的字节
+    # 存储中的文件以内容哈希命名，下载时使用论文标题作为文件名
+    filename = f"{paper.title.strip()}.pdf" if paper.title and paper.title.strip() else f"paper-{paper.id}.pdf"
+    return await file_server.response(request, str(file_path), filename=filename)
 
 @router.post("/{paper_id}/analysis", response_model=PaperAnalysisResponse)
 def create_paper_analysis(
@@ -80,8 +120,11 @@ def create_paper_analysis(
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
     
-    # 分析论文
-    analysis_result = paper_service.analyze_paper(paper.__dict__)
+    # 分析论文（带上按章节切分的全文，上传时已缓存，无需重新读取PDF）
+    paper_data = dict(paper.__dict__)
+    if paper.pdf_url and Path(paper.pdf_url).exists():
+        paper_data['sections'] = file_service.load_pdf_sections(paper.pdf_url)
+    analysis_result = paper_service.analyze_paper(paper_data)
     
     # 创建分析记录
     db_analysis = PaperAnalysis(
@@ -110,6 +153,7 @@ def get_paper_analysis(
 
 @router.post("/upload")
 async def upload_paper(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -136,6 +180,9 @@ async def upload_paper(
         db.commit()
         db.refresh(db_paper)
         
+        # 后台提取全文章节并写入缓存，供之后的论文分析使用；参考文献写入引用图
+        background_tasks.add_task(index_paper_references, db_paper.id, db_paper.title, file_path)
+        
         return {
             "message": "文件上传成功",
             "paper_id": db_paper.id
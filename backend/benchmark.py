@@ -0,0 +1,1141 @@
+"""
+性能基准测试脚本
+
+用法（在 backend 目录下执行）:
+    python benchmark.py layout
+    python benchmark.py layout --baseline
+    python benchmark.py citation-graph --edges 100000 1000000 5000000 --baseline
+    python benchmark.py export --format png
+    python benchmark.py experiment-plots --plots 50 --workers 8
+    python benchmark.py imports --module services.paper_analysis --budget-ms 300 --budget-mb 40
+    python benchmark.py keyword-trends --keywords 10000 --baseline
+    python benchmark.py ingest --files 1 10 50 --concurrency 8 --workers 8
+    python benchmark.py pdf-extract --files 50 --baseline
+    python benchmark.py pdf-pages --pages 200 --workers 1 2 4 8
+    python benchmark.py pdf-backends --corpus tests/fixtures/pdfs
+    python benchmark.py venue --sizes 1000 10000 100000 --baseline
+    python benchmark.py file-cleanup --files 2000 20000 --baseline
+    python benchmark.py file-serving --size-mb 20 --seeks 50
+    python benchmark.py model-sharing --trees 200 --workers 4
+"""
+import argparse
+import asyncio
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _random_citation_graph(num_edges: int, seed: int = 0):
+    """生成随机引用图：节点数约为边数的一半"""
+    rng = np.random.default_rng(seed)
+    num_nodes = max(10, num_edges // 2)
+    edges = rng.integers(0, num_nodes, size=(num_edges, 2))
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    nodes = [f"paper_{i}" for i in range(num_nodes)]
+    return nodes, edges
+
+
+def bench_layout(args):
+    """引用网络布局耗时：冷启动、缓存命中、增量图"""
+    from services.graph_layout import CitationLayoutEngine
+
+    print(f"{'edges':>8} {'nodes':>8} {'cold(s)':>9} {'cached(s)':>10} {'incremental(s)':>15} {'spring(s)':>10}")
+    for num_edges in args.edges:
+        nodes, edges = _random_citation_graph(num_edges)
+        engine = CitationLayoutEngine()
+
+        start = time.perf_counter()
+        engine.layout(nodes, edges)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.layout(nodes, edges)
+        cached = time.perf_counter() - start
+
+        # 增量图：新增 1% 的节点和边
+        extra = max(1, len(nodes) // 100)
+        grown_nodes = nodes + [f"new_{i}" for i in range(extra)]
+        new_edges = np.stack([np.arange(len(nodes), len(grown_nodes)),
+                              np.arange(extra) % len(nodes)], axis=1)
+        start = time.perf_counter()
+        engine.layout(grown_nodes, np.vstack([edges, new_edges]))
+        incremental = time.perf_counter() - start
+
+        spring = "-"
+        if args.baseline and num_edges <= 10000:
+            import networkx as nx
+            graph = nx.Graph()
+            graph.add_edges_from(edges.tolist())
+            start = time.perf_counter()
+            nx.spring_layout(graph)
+            spring = f"{time.perf_counter() - start:.3f}"
+
+        print(f"{num_edges:>8} {len(nodes):>8} {cold:>9.3f} {cached:>10.4f} {incremental:>15.3f} {spring:>10}")
+
+
+def bench_citation_graph(args):
+    """稀疏矩阵引用图分析：构建、PageRank、标签传播社区划分、Top-K 影响力论文"""
+    from services.citation_graph import CitationGraph
+
+    print(f"{'edges':>9} {'nodes':>9} {'build(s)':>9} {'pagerank(s)':>12} {'communities(s)':>15} "
+          f"{'top-k(s)':>9} {'nx pagerank(s)':>15}")
+    for num_edges in args.edges:
+        # 被引方服从长尾分布，接近真实引用图中少数论文被大量引用的情况
+        rng = np.random.default_rng(0)
+        num_nodes = max(10, num_edges // 5)
+        keys = np.array([f"doi:10.0/{i}" for i in range(num_nodes)], dtype=object)
+        citing = keys[rng.integers(0, num_nodes, num_edges)]
+        cited = keys[(rng.pareto(1.2, num_edges) * 100).astype(np.int64) % num_nodes]
+
+        start = time.perf_counter()
+        graph = CitationGraph.from_edges(citing, cited)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph.pagerank()
+        pagerank = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph.communities()
+        communities = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph.influential_papers(args.top_k)
+        top_k = time.perf_counter() - start
+
+        baseline = "-"
+        if args.baseline and num_edges <= args.baseline_max_edges:
+            import networkx as nx
+            nx_graph = nx.DiGraph()
+            nx_graph.add_edges_from(zip(citing, cited))
+            start = time.perf_counter()
+            nx.pagerank(nx_graph)
+            baseline = f"{time.perf_counter() - start:.2f}"
+
+        print(f"{graph.num_edges:>9} {graph.num_nodes:>9} {build:>9.2f} {pagerank:>12.2f} {communities:>15.2f} "
+              f"{top_k:>9.3f} {baseline:>15}")
+
+
+def _sample_trend_inputs(seed: int = 0):
+    """生成覆盖全部十二个趋势图表的示例数据"""
+    rng = np.random.default_rng(seed)
+    years = [str(2015 + i) for i in range(10)]
+    time_series = {
+        'years': years,
+        'paper_counts': rng.integers(50, 500, len(years)).tolist(),
+        'citation_counts': rng.integers(100, 5000, len(years)).tolist(),
+        'keyword_frequencies': [
+            {f"keyword_{j}": int(rng.integers(1, 50)) for j in rng.choice(200, 20, replace=False)}
+            for _ in years
+        ]
+    }
+    topic_evolution = [
+        {
+            'period': f"period_{i + 1}",
+            'top_keywords': {f"keyword_{j}": int(rng.integers(1, 30)) for j in range(10)},
+            'emerging_topics': [f"topic_{i}_{j}" for j in range(5)],
+            'declining_topics': []
+        }
+        for i in range(3)
+    ]
+    citation_trends = {
+        'citation_networks': [
+            {'paper': f"paper_{i}", 'cited_papers': [f"paper_{j}" for j in rng.choice(300, 5)]}
+            for i in range(300)
+        ],
+        'citation_impact': {'methodology_citations': 120, 'result_citations': 80,
+                            'background_citations': 200, 'total_citations': 400}
+    }
+    methodology_evolution = [
+        {
+            'period': f"period_{i + 1}",
+            'methods': [{'method': f"method_{j}", 'innovation_score': float(rng.random())} for j in range(8)],
+            'method_improvements': [{'improvement_type': t} for t in rng.choice(
+                ['efficiency', 'accuracy', 'robustness', 'scalability'], 10)]
+        }
+        for i in range(3)
+    ]
+    experiment_trends = {
+        'dataset_usage': {f"dataset_{j}": int(rng.integers(1, 40)) for j in range(10)},
+        'metric_evolution': {f"metric_{j}": int(rng.integers(1, 40)) for j in range(8)},
+        'experiment_design': {'ablation_studies': 12, 'comparative_analysis': 30,
+                              'statistical_tests': 5, 'cross_validation': 8}
+    }
+    return time_series, topic_evolution, citation_trends, methodology_evolution, experiment_trends
+
+
+def bench_export(args):
+    """静态图片导出：预热耗时与每张图表的平均耗时"""
+    from services.visualization_service import VisualizationService
+
+    time_series, topics, citations, methodology, experiments = _sample_trend_inputs()
+    service = VisualizationService()
+    service.output_dir = tempfile.mkdtemp(prefix="export_bench_")
+    service.export_pool.num_workers = args.workers
+
+    figures = {}
+    figures.update(service.build_trend_figures(time_series))
+    figures.update(service.build_topic_evolution_figures(topics))
+    figures.update(service.build_citation_figures(citations))
+    figures.update(service.build_methodology_figures(methodology))
+    figures.update(service.build_experiment_figures(experiments))
+
+    try:
+        start = time.perf_counter()
+        service.export_pool.export(figures['paper_count_trend'].to_json(), args.format)
+        print(f"预热（启动导出进程）: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        images = service.export_figures(figures, args.format)
+        elapsed = time.perf_counter() - start
+        print(f"导出 {len(images)} 张图表: {elapsed:.2f}s，平均 {elapsed / len(images):.3f}s/张")
+
+        start = time.perf_counter()
+        service.export_figures(figures, args.format)
+        print(f"再次导出（命中内容哈希缓存）: {time.perf_counter() - start:.3f}s")
+    finally:
+        service.export_pool.shutdown()
+        for name in os.listdir(service.output_dir):
+            os.remove(os.path.join(service.output_dir, name))
+        os.rmdir(service.output_dir)
+
+
+def bench_experiment_plots(args):
+    """并行渲染实验图表：与串行渲染逐字节比较，检查线程之间没有互相污染；不一致时以非零状态码退出"""
+    from services.experiment_analysis import ExperimentAnalysisService
+
+    rng = np.random.default_rng(0)
+    datasets = []
+    for i in range(args.plots):
+        groups = [f"g{i}_{j}" for j in range(2 + i % 4)]
+        datasets.append({group: rng.normal(j, 1 + i % 3, size=30).tolist() for j, group in enumerate(groups)})
+    plot_types = ['boxplot' if i % 2 == 0 else 'violin' for i in range(args.plots)]
+
+    # 串行参考结果（单线程、不共享缓存）
+    serial_service = ExperimentAnalysisService(max_workers=1, cache_size=0)
+    start = time.perf_counter()
+    expected = [serial_service.render_chart(data, plot_type, args.format)
+                for data, plot_type in zip(datasets, plot_types)]
+    serial = time.perf_counter() - start
+
+    service = ExperimentAnalysisService(max_workers=args.workers, cache_size=0)
+    service.output_dir = tempfile.mkdtemp(prefix="experiment_bench_")
+
+    async def render_all():
+        return await asyncio.gather(*[
+            service.generate_visualization(data, plot_type, args.format)
+            for data, plot_type in zip(datasets, plot_types)
+        ])
+
+    start = time.perf_counter()
+    paths = asyncio.run(render_all())
+    parallel = time.perf_counter() - start
+
+    failed = False
+    for i, (path, image) in enumerate(zip(paths, expected)):
+        with open(path, 'rb') as f:
+            if f.read() != image:
+                print(f"图表 {i} 与串行渲染结果不一致: {path}")
+                failed = True
+    if len(set(paths)) != len(paths):
+        print("不同数据的图表写入了同一个文件")
+        failed = True
+
+    # 分组顺序不同的数据必须得到不同的缓存键
+    reordered = dict(reversed(list(datasets[0].items())))
+    if service._cache_key(datasets[0], plot_types[0], args.format) == \
+            service._cache_key(reordered, plot_types[0], args.format):
+        print("分组顺序不同的数据得到了相同的缓存键")
+        failed = True
+
+    print(f"plots: {args.plots}，串行 {serial:.2f}s，并行（{args.workers} 线程）{parallel:.2f}s，"
+          f"{'全部一致' if not failed else '存在不一致'}")
+    service.executor.shutdown()
+    serial_service.executor.shutdown()
+    for name in os.listdir(service.output_dir):
+        os.remove(os.path.join(service.output_dir, name))
+    os.rmdir(service.output_dir)
+    if failed:
+        sys.exit(1)
+
+
+def _import_profile(module: str):
+    """在子进程中用 -X importtime 剖析模块导入，返回 [(累计微秒, 自身微秒, 模块名)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=BACKEND_DIR
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return entries
+
+
+def _import_cost(module: str):
+    """在干净的子进程中测量导入耗时（毫秒）和 Python 内存分配峰值（MB）"""
+    timing_code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    # tracemalloc 会拖慢导入，因此内存单独在另一个子进程中测量
+    memory_code = (
+        "import tracemalloc\n"
+        "tracemalloc.start()\n"
+        f"import {module}\n"
+        "print(tracemalloc.get_traced_memory()[1] / 1024 / 1024)\n"
+    )
+    results = []
+    for code in (timing_code, memory_code):
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                              cwd=BACKEND_DIR, check=True)
+        results.append(float(proc.stdout.strip()))
+    return tuple(results)
+
+
+def bench_imports(args):
+    """导入时间预算：输出 importtime 剖析报告，超出预算时以非零状态码退出"""
+    entries = _import_profile(args.module)
+    print(f"{args.module} 导入剖析（按累计耗时排序，前 {args.top} 项）:")
+    print(f"{'cumulative(ms)':>15} {'self(ms)':>9}  module")
+    for cumulative_us, self_us, name in sorted(entries, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>15.1f} {self_us / 1000:>9.1f}  {name}")
+
+    runs = [_import_cost(args.module) for _ in range(args.repeat)]
+    elapsed_ms = min(run[0] for run in runs)
+    memory_mb = min(run[1] for run in runs)
+    print(f"\n导入耗时: {elapsed_ms:.1f}ms（预算 {args.budget_ms}ms），"
+          f"内存峰值: {memory_mb:.1f}MB（预算 {args.budget_mb}MB）")
+
+    heavy = sorted({name.strip().split(".")[0] for _, _, name in entries} & HEAVY_MODULES)
+    if heavy:
+        print(f"导入期间加载了重量级依赖: {', '.join(heavy)}")
+
+    if elapsed_ms > args.budget_ms or memory_mb > args.budget_mb or heavy:
+        sys.exit(1)
+
+
+def bench_keyword_trends(args):
+    """关键词趋势预测：矩阵化最小二乘与逐关键词 LinearRegression 对比"""
+    from services.prediction_service import PredictionService
+
+    rng = np.random.default_rng(0)
+    keyword_frequencies = [
+        {f"keyword_{j}": int(count) for j, count in enumerate(rng.integers(0, 100, args.keywords)) if count}
+        for _ in range(args.years)
+    ]
+    service = PredictionService()
+
+    start = time.perf_counter()
+    trends = service._predict_keyword_trends(keyword_frequencies, args.horizon)
+    elapsed = time.perf_counter() - start
+    print(f"{args.keywords} 个关键词 × {args.years} 年: 矩阵化 {elapsed:.3f}s")
+    print(f"上升最快: {', '.join(trends['rising'][:5])}")
+    print(f"下降最快: {', '.join(trends['falling'][:5])}")
+
+    if args.baseline:
+        from sklearn.linear_model import LinearRegression
+
+        start = time.perf_counter()
+        X = np.arange(args.years).reshape(-1, 1)
+        X_future = np.arange(args.years, args.years + args.horizon).reshape(-1, 1)
+        baseline = {}
+        for keyword in trends['predictions']:
+            y = [year.get(keyword, 0) for year in keyword_frequencies]
+            baseline[keyword] = LinearRegression().fit(X, y).predict(X_future)
+        baseline_elapsed = time.perf_counter() - start
+        max_diff = max(np.abs(np.array(trends['predictions'][k]) - v).max() for k, v in baseline.items())
+        print(f"逐关键词 LinearRegression: {baseline_elapsed:.3f}s "
+              f"（加速 {baseline_elapsed / elapsed:.0f}x，最大偏差 {max_diff:.2e}）")
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def synthetic_pdf(pages, columns: int = 1) -> bytes:
+    """
+    生成纯文本 PDF
+
+    Args:
+        pages: 每页的文本行列表
+        columns: 每页的栏数（双栏时前一半行在左栏，后一半行在右栏）
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    column_width = 512 // columns
+    for lines in pages:
+        per_column = -(-len(lines) // columns) if lines else 0
+        blocks = []
+        for column in range(columns):
+            column_lines = lines[column * per_column:(column + 1) * per_column]
+            blocks.append(f"BT /F1 {10 if columns == 1 else 8} Tf 12 TL {50 + column * column_width} 780 Td "
+                          + " ".join(f"({_pdf_escape(line)}) '" for line in column_lines) + " ET")
+        stream = "\n".join(blocks).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def synthetic_paper_pages(seed: int, num_pages: int = 2, line_words: int = 12):
+    """生成示例论文每页的文本行：标题、作者、摘要和正文，内容随 seed 变化"""
+    rng = np.random.default_rng(seed)
+    words = ["learning", "graph", "neural", "model", "attention", "retrieval", "robust", "efficient",
+             "transformer", "benchmark", "dataset", "training", "inference", "sparse", "representation"]
+    sentence = lambda n: " ".join(rng.choice(words, n)).capitalize() + "."
+    first_page = [
+        f"{sentence(6)[:-1]} for Scalable Paper Analysis {seed}",
+        "Alice Zhang, Bob Smith, Carol Lee",
+        "Department of Computer Science, Example University",
+        "Published as a conference paper at ICLR 2024",
+        "Abstract",
+    ] + [sentence(line_words) for _ in range(12)]
+    body_pages = [[sentence(line_words) for _ in range(45)] for _ in range(num_pages - 1)]
+    return [first_page] + body_pages
+
+
+def synthetic_paper_pdf(seed: int, num_pages: int = 2) -> bytes:
+    """生成带标题、作者、摘要和正文的示例论文 PDF，内容随 seed 变化"""
+    return synthetic_pdf(synthetic_paper_pages(seed, num_pages))
+
+
+def bench_ingest(args):
+    """批量上传吞吐：顺序处理（并发 1）与并发管线对比"""
+    from fastapi import UploadFile
+    from pathlib import Path
+    from services.extraction_cache import ExtractionCache
+    from services.file_service import FileService
+    from services.pdf_extraction import extract_in_worker
+
+    service = FileService()
+    work_dir = tempfile.mkdtemp(prefix="ingest_bench_")
+    service.upload_dir = Path(work_dir)
+    service.extraction_workers = args.workers
+    service.process_pool_min_bytes = args.min_process_kb * 1024
+
+    # 预热进程池，避免把工作进程加载 spaCy 的时间计入第一轮
+    if args.workers > 1:
+        warmup_path = os.path.join(work_dir, "warmup.pdf")
+        with open(warmup_path, "wb") as f:
+            f.write(synthetic_paper_pdf(10 ** 6, args.pages))
+        list(service._get_process_pool().map(extract_in_worker, [warmup_path] * args.workers))
+
+    print(f"{'files':>6} {'sequential(s)':>14} {'concurrent(s)':>14} {'files/s':>9} {'speedup':>8}")
+    seed = 0
+    for num_files in args.files:
+        timings = []
+        for concurrency in (1, args.concurrency):
+            # 每轮使用不同内容和空缓存，避免命中提取缓存
+            service.extraction_cache = ExtractionCache(os.path.join(work_dir, f"cache_{seed}.db"))
+            payloads = [synthetic_paper_pdf(seed + i, args.pages) for i in range(num_files)]
+            seed += num_files
+            files = [UploadFile(io.BytesIO(data), filename=f"paper_{i}.pdf") for i, data in enumerate(payloads)]
+
+            start = time.perf_counter()
+            results = asyncio.run(service.process_multiple_files(files, max_concurrency=concurrency))
+            timings.append(time.perf_counter() - start)
+            failed = [r for r in results if r["status"] != "success"]
+            if failed:
+                print(f"  {len(failed)} 个文件处理失败: {failed[0]['error']}")
+
+        sequential, concurrent = timings
+        print(f"{num_files:>6} {sequential:>14.2f} {concurrent:>14.2f} "
+              f"{num_files / concurrent:>9.1f} {sequential / concurrent:>7.1f}x")
+
+    service.shutdown()
+    for root, _, names in os.walk(work_dir, topdown=False):
+        for name in names:
+            os.remove(os.path.join(root, name))
+        os.rmdir(root)
+
+
+def bench_pdf_extract(args):
+    """PDF 开头信息提取：单次精简管线与逐文件、批量 nlp.pipe 的延迟对比"""
+    import spacy
+    from services.pdf_extraction import PdfInfoExtractor
+
+    work_dir = tempfile.mkdtemp(prefix="extract_bench_")
+    paths = []
+    for i in range(args.files):
+        path = os.path.join(work_dir, f"paper_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(synthetic_paper_pdf(i, args.pages))
+        paths.append(path)
+
+    try:
+        extractor = PdfInfoExtractor(args.model)
+        extractor.extract(paths[0])
+
+        start = time.perf_counter()
+        for path in paths:
+            extractor.extract(path)
+        single = (time.perf_counter() - start) * 1000 / len(paths)
+
+        start = time.perf_counter()
+        extractor.extract_many(paths)
+        batched = (time.perf_counter() - start) * 1000 / len(paths)
+
+        print(f"精简管线 {extractor.nlp.pipe_names}")
+        print(f"  逐文件: {single:.1f}ms/篇")
+        print(f"  nlp.pipe 批量: {batched:.1f}ms/篇")
+
+        if args.baseline:
+            # 原实现：完整管线处理前两页全文，并对摘要前的每个句子再次运行管线
+            nlp = spacy.load(args.model)
+            start = time.perf_counter()
+            for path in paths:
+                text, _ = extractor._read_first_pages(path)
+                doc = nlp(text)
+                for sent in list(doc.sents)[1:]:
+                    if "abstract" in sent.text.lower():
+                        break
+                    nlp(sent.text)
+            baseline = (time.perf_counter() - start) * 1000 / len(paths)
+            print(f"完整管线 {nlp.pipe_names}")
+            print(f"  逐文件: {baseline:.1f}ms/篇（精简后加速 {baseline / batched:.1f}x）")
+    finally:
+        for path in paths:
+            os.remove(path)
+        os.rmdir(work_dir)
+
+
+def bench_pdf_pages(args):
+    """长文档按页分片并行提取：不同进程数下的全文章节提取延迟"""
+    from concurrent.futures import ProcessPoolExecutor
+    from services.pdf_extraction import extract_sections, extract_sections_sharded
+
+    rng = np.random.default_rng(0)
+    words = ["graph", "neural", "model", "attention", "retrieval", "robust", "efficient", "sparse"]
+    headings = {0: "1 Introduction", args.pages // 4: "3 Method", args.pages // 2: "4 Experiments",
+                args.pages - 2: "5 Limitations", args.pages - 1: "References"}
+    pages = [
+        ([headings[i]] if i in headings else []) + [" ".join(rng.choice(words, 14)) for _ in range(50)]
+        for i in range(args.pages)
+    ]
+    work_dir = tempfile.mkdtemp(prefix="pages_bench_")
+    path = os.path.join(work_dir, "thesis.pdf")
+    with open(path, "wb") as f:
+        f.write(synthetic_pdf(pages))
+
+    try:
+        start = time.perf_counter()
+        expected = extract_sections(path)
+        sequential = time.perf_counter() - start
+        print(f"{args.pages} 页，顺序提取: {sequential:.2f}s")
+
+        for workers in args.workers:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # 预热工作进程
+                list(pool.map(abs, range(workers)))
+
+                start = time.perf_counter()
+                sections = extract_sections_sharded(path, pool, args.pages, workers)
+                elapsed = time.perf_counter() - start
+            status = "一致" if sections == expected else "不一致"
+            print(f"  {workers:>2} 进程: {elapsed:.2f}s（加速 {sequential / elapsed:.1f}x，结果{status}）")
+    finally:
+        os.remove(path)
+        os.rmdir(work_dir)
+
+
+def _word_bag(text: str):
+    from collections import Counter
+    return Counter(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def text_fidelity(expected: str, actual: str) -> float:
+    """以词袋 F1 衡量提取文本与参考文本的一致程度（0~1）"""
+    expected_bag, actual_bag = _word_bag(expected), _word_bag(actual)
+    overlap = sum((expected_bag & actual_bag).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(actual_bag.values())
+    recall = overlap / sum(expected_bag.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _run_pdf_backend(name: str, paths):
+    """在独立进程中运行一个后端，返回 (页数, 耗时, 各文件文本, 峰值内存增长MB)"""
+    import resource
+    from services.pdf_backends import get_backend
+
+    backend = get_backend(name)
+    list(backend.iter_pages(paths[0], 0, 1))
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    texts, num_pages = {}, 0
+    for path in paths:
+        pages = list(backend.iter_pages(path))
+        num_pages += len(pages)
+        texts[path] = "\n".join(pages)
+    elapsed = time.perf_counter() - start
+
+    rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    return num_pages, elapsed, texts, rss_growth
+
+
+def bench_pdf_backends(args):
+    """PDF 文本后端对比：吞吐（页/秒）、峰值内存增长和文本保真度"""
+    import glob
+    import multiprocessing as mp
+    from services.pdf_backends import BACKENDS
+
+    work_dir = None
+    if args.corpus:
+        # 夹具语料：目录下的 PDF，同名 .txt 文件（如果存在）作为参考文本
+        paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+        expected = {}
+        for path in paths:
+            reference = os.path.splitext(path)[0] + ".txt"
+            if os.path.exists(reference):
+                with open(reference, encoding="utf-8") as f:
+                    expected[path] = f.read()
+    else:
+        # 合成语料：单栏和双栏论文各一半，参考文本即生成时的文本
+        work_dir = tempfile.mkdtemp(prefix="backend_bench_")
+        paths, expected = [], {}
+        for i in range(args.files):
+            pages = synthetic_paper_pages(i, args.pages)
+            path = os.path.join(work_dir, f"paper_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(synthetic_pdf(pages, columns=1 + i % 2))
+            paths.append(path)
+            expected[path] = "\n".join(line for page in pages for line in page)
+    if not paths:
+        raise SystemExit("语料中没有 PDF 文件")
+
+    print(f"{len(paths)} 个 PDF，{len(expected)} 个带参考文本")
+    print(f"{'backend':>10} {'pages/s':>9} {'peak+MB':>8} {'fidelity':>9}")
+    context = mp.get_context("spawn")
+    try:
+        for name in args.backends or list(BACKENDS):
+            try:
+                with context.Pool(1) as pool:
+                    num_pages, elapsed, texts, rss_growth = pool.apply(_run_pdf_backend, (name, paths))
+            except ImportError as e:
+                print(f"{name:>10} 未安装（{e.name}）")
+                continue
+            scores = [text_fidelity(expected[path], texts[path]) for path in expected]
+            fidelity = f"{np.mean(scores):.3f}" if scores else "-"
+            print(f"{name:>10} {num_pages / elapsed:>9.1f} {rss_growth:>8.1f} {fidelity:>9}")
+    finally:
+        if work_dir:
+            for path in paths:
+                os.remove(path)
+            os.rmdir(work_dir)
+
+
+# 原 _extract_conference 使用的正则，仅作对比基线
+LEGACY_VENUE_PATTERNS = [
+    r'(ICML|ICLR|NeurIPS|CVPR|ACL|SIGGRAPH|OSDI|MLSys|APLOS)\s*\d{4}',
+    r'(Conference|Workshop|Symposium|Journal)\s+on\s+[A-Za-z\s]+',
+    r'[A-Za-z\s]+(Conference|Workshop|Symposium|Journal)'
+]
+
+# 会议识别的回归样例：(文本, 期望结果)
+VENUE_CASES = [
+    ("Published as a conference paper at ICLR 2025\nWe compare with ICML.", "ICLR 2025"),
+    ("In Advances in Neural Information Processing Systems 2023", "NeurIPS 2023"),
+    ("38th Conference on Neural Information Processing Systems (NeurIPS 2024).", "NeurIPS 2024"),
+    ("ASPLOS '24, April 27-May 1, 2024, La Jolla, CA, USA", "ASPLOS"),
+    ("Proceedings of the 3rd Workshop on Efficient Systems\nAlice Smith", "Proceedings of the 3rd Workshop on Efficient Systems"),
+    ("A plain technical report with no venue.", None),
+    # 短缩写只按大写匹配，普通单词不能被当成会议名
+    ("We use a chi-square test to compare the distributions.\nProceedings of Foo Conference",
+     "Proceedings of Foo Conference"),
+    ("The acl and uai columns list atc values.", None),
+    ("CHI '23, April 23-28, 2023, Hamburg, Germany", "CHI"),
+]
+
+
+def _adversarial_venue_inputs(size: int):
+    """构造让回溯正则退化的输入：长串字母和空格，且不出现会议关键词或在末尾才出现"""
+    return {
+        "letters": "a" * size,
+        "words": "ab " * (size // 3),
+        "near-miss": "conferenc " * (size // 10),
+        "on-tail": "Conference on " + "a b " * (size // 4) + "1",
+    }
+
+
+def _time_call(func, text: str) -> float:
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def bench_venue(args):
+    """会议识别：回归样例、对抗输入下的耗时增长，以及与原正则的对比；不满足线性增长时以非零状态码退出"""
+    from services.venue_detector import VenueDetector
+
+    detector = VenueDetector()
+    failed = False
+    for text, expected in VENUE_CASES:
+        result = detector.detect(text)
+        if result != expected:
+            print(f"回归失败: {text[:50]!r} -> {result!r}（期望 {expected!r}）")
+            failed = True
+
+    legacy = [re.compile(pattern, re.IGNORECASE) for pattern in LEGACY_VENUE_PATTERNS]
+
+    def legacy_detect(text):
+        for pattern in legacy:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
+        return None
+
+    sizes = sorted(args.sizes)
+    print(f"{'input':>10} {'chars':>8} {'detector(ms)':>13} {'regex(ms)':>10}")
+    for name in _adversarial_venue_inputs(sizes[0]):
+        timings = []
+        for size in sizes:
+            text = _adversarial_venue_inputs(size)[name]
+            elapsed = min(_time_call(detector.detect, text) for _ in range(args.repeat))
+            timings.append(elapsed)
+            baseline = "-"
+            if args.baseline and size <= args.baseline_max_chars:
+                baseline = f"{_time_call(legacy_detect, text) * 1000:.1f}"
+            print(f"{name:>10} {len(text):>8} {elapsed * 1000:>13.2f} {baseline:>10}")
+
+        # 输入增长 k 倍时耗时增长不应超过 k 倍太多（留出计时噪声的余量）
+        growth = timings[-1] / max(timings[0], 1e-6)
+        allowed = sizes[-1] / sizes[0] * args.slack
+        if growth > allowed:
+            print(f"{name}: 耗时增长 {growth:.1f} 倍，超过线性上限 {allowed:.1f} 倍")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+async def _measure_loop_stalls(work, interval: float = 0.005):
+    """执行 work 协程的同时，用定时心跳测量事件循环卡顿（实际唤醒时间超出预期的部分）"""
+    stalls = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        loop = asyncio.get_running_loop()
+        while not done.is_set():
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            stalls.append(max(0.0, loop.time() - expected))
+
+    monitor = asyncio.create_task(heartbeat())
+    # 让心跳先开始计时
+    await asyncio.sleep(interval)
+    start = time.perf_counter()
+    try:
+        result = await work
+    finally:
+        done.set()
+        await monitor
+    return result, time.perf_counter() - start, np.array(stalls or [0.0])
+
+
+def _legacy_cleanup(upload_dir: str, days: int) -> int:
+    """原来的清理实现：在事件循环中逐个 stat 并删除文件"""
+    from datetime import datetime
+    from pathlib import Path
+
+    count = 0
+    current_time = datetime.now()
+    for file_path in Path(upload_dir).glob('*.pdf'):
+        if file_path.is_file():
+            file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
+            if (current_time - file_time).days > days:
+                os.remove(file_path)
+                count += 1
+    return count
+
+
+def _create_aged_files(upload_dir: str, num_files: int, days_old: int) -> None:
+    old = time.time() - days_old * 86400
+    for i in range(num_files):
+        path = os.path.join(upload_dir, f"old_{i}.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4\n" + b"x" * 1024)
+        os.utime(path, (old, old))
+
+
+def bench_file_cleanup(args):
+    """旧文件清理期间的事件循环卡顿：原来的内联删除与分批后台清理对比；超过卡顿上限时以非零状态码退出"""
+    from pathlib import Path
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from models.models import StoredFile, StorageTotals
+    from services.blob_store import BlobStore
+    from services.file_index import FileIndex
+    from services.file_management import FileManagementService
+
+    work_dir = tempfile.mkdtemp(prefix="cleanup_bench_")
+    upload_dir = os.path.join(work_dir, "uploads")
+    os.makedirs(upload_dir)
+    # 使用独立的 SQLite 库，不触碰部署的数据库
+    engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'index.db')}")
+    for table in (StoredFile.__table__, StorageTotals.__table__):
+        table.create(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    failed = False
+    print(f"{'files':>7} {'mode':>10} {'deleted':>8} {'elapsed(s)':>11} {'max stall(ms)':>14} {'p99 stall(ms)':>14}")
+    for num_files in args.files:
+        modes = (["inline"] if args.baseline else []) + ["background"]
+        for mode in modes:
+            _create_aged_files(upload_dir, num_files, args.days + 5)
+            if mode == "inline":
+                async def inline():
+                    return _legacy_cleanup(upload_dir, args.days)
+                work = inline()
+            else:
+                service = FileManagementService()
+                service.upload_dir = Path(upload_dir)
+                service.blob_store = BlobStore(os.path.join(upload_dir, "blobs"), reference_counts=lambda paths: {})
+                service.cleanup_batch_size = args.batch_size
+                file_index = FileIndex(session_factory=session_factory)
+                file_index.rebuild(service._scan_files())
+                service._file_index = file_index
+                work = service.cleanup_old_files(args.days)
+
+            deleted, elapsed, stalls = asyncio.run(_measure_loop_stalls(work))
+            max_stall, p99 = stalls.max() * 1000, np.percentile(stalls, 99) * 1000
+            print(f"{num_files:>7} {mode:>10} {deleted:>8} {elapsed:>11.2f} {max_stall:>14.1f} {p99:>14.1f}")
+            if deleted != num_files:
+                print(f"  {mode}: 删除了 {deleted} 个文件（期望 {num_files}）")
+                failed = True
+            if mode == "background":
+                service.executor.shutdown()
+                if file_index.totals() != (0, 0):
+                    print(f"  清理后索引总量不为零: {file_index.totals()}")
+                    failed = True
+                if max_stall > args.max_stall_ms:
+                    print(f"  后台清理卡顿 {max_stall:.1f}ms，超过上限 {args.max_stall_ms}ms")
+                    failed = True
+
+    engine.dispose()
+    for root, _, names in os.walk(work_dir, topdown=False):
+        for name in names:
+            os.remove(os.path.join(root, name))
+        os.rmdir(root)
+    if failed:
+        sys.exit(1)
+
+
+def bench_file_serving(args):
+    """论文 PDF 下载的传输字节数：首次打开、重复打开（304）和按页跳转（206），与整文件下载对比；响应不符合预期时以非零状态码退出"""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import FileResponse
+    from fastapi.testclient import TestClient
+    from services.blob_store import BlobStore
+    from services.file_serving import FileServer
+    import hashlib
+
+    work_dir = tempfile.mkdtemp(prefix="serving_bench_")
+    data = np.random.default_rng(0).bytes(int(args.size_mb * 1024 * 1024))
+    blob_store = BlobStore(os.path.join(work_dir, "blobs"), reference_counts=lambda paths: {})
+    path, _ = blob_store.store(io.BytesIO(data), hashlib.sha256(data).hexdigest())
+    server = FileServer(blob_store)
+
+    app = FastAPI()
+
+    @app.get("/file")
+    async def conditional(request: Request):
+        return await server.response(request, path, filename="Attention Is All You Need: 注意力.pdf")
+
+    @app.get("/plain")
+    async def plain():
+        return FileResponse(path, media_type="application/pdf")
+
+    client = TestClient(app)
+    rng = np.random.default_rng(1)
+    offsets = rng.integers(0, len(data) - args.chunk_kb * 1024, size=args.seeks)
+    failed = False
+
+    def run(url, conditional_requests):
+        transferred, start = 0, time.perf_counter()
+        first = client.get(url)
+        transferred += len(first.content)
+        etag = first.headers.get("etag")
+        repeat = client.get(url, headers={"If-None-Match": etag} if conditional_requests and etag else {})
+        transferred += len(repeat.content)
+        for offset in offsets:
+            end = int(offset) + args.chunk_kb * 1024 - 1
+            response = client.get(url, headers={"Range": f"bytes={offset}-{end}"} if conditional_requests else {})
+            transferred += len(response.content)
+            if conditional_requests and (response.status_code != 206 or response.content != data[offset:end + 1]):
+                return None
+        if conditional_requests and repeat.status_code != 304:
+            return None
+        # URL 不是内容寻址的，缓存必须重新验证；下载名取传入的文件名而不是哈希
+        if conditional_requests and (
+            first.headers.get("cache-control") != "private, no-cache"
+            or 'filename="Attention Is All You Need: .pdf"' not in first.headers.get("content-disposition", "")
+        ):
+            return None
+        return transferred, time.perf_counter() - start
+
+    print(f"{'mode':>12} {'requests':>9} {'MB sent':>9} {'elapsed(s)':>11}")
+    for name, url, conditional_requests in (("full-file", "/plain", False), ("range+etag", "/file", True)):
+        result = run(url, conditional_requests)
+        if result is None:
+            print(f"{name}: 304/206 响应或缓存、文件名响应头不符合预期")
+            failed = True
+            continue
+        transferred, elapsed = result
+        print(f"{name:>12} {args.seeks + 2:>9} {transferred / 1024 / 1024:>9.1f} {elapsed:>11.2f}")
+
+    for root, _, names in os.walk(work_dir, topdown=False):
+        for name in names:
+            os.remove(os.path.join(root, name))
+        os.rmdir(root)
+    if failed:
+        sys.exit(1)
+
+
+# 模型共享基准的工作进程：加载模型仓库的当前版本并预测一次，等待所有进程就绪后报告内存
+_MODEL_WORKER_CODE = """
+import json, sys
+import numpy as np
+from services.model_registry import ModelRegistry
+
+def memory():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return fields['Private_Clean'] + fields['Private_Dirty'], fields['Pss']
+
+before = memory()
+_, _, artifacts = ModelRegistry(sys.argv[1]).load()
+model = artifacts['impact_model']
+n_features = getattr(model, 'n_features_in_', None) or model.n_features
+X = np.random.default_rng(0).random((int(sys.argv[2]), n_features))
+model.predict(X)
+mapped = all(isinstance(getattr(model, name), np.memmap) for name in
+             ('children_left', 'children_right', 'feature', 'threshold', 'value')) if hasattr(model, 'roots') else False
+print('ready', flush=True)
+sys.stdin.readline()
+after = memory()
+print(json.dumps({'private_mb': after[0] - before[0], 'pss_mb': after[1] - before[1], 'mapped': mapped}), flush=True)
+"""
+
+
+def _model_worker_memory(registry_root: str, workers: int, samples: int):
+    """同时启动多个加载同一模型版本的工作进程，返回各进程加载后增加的 (私有内存MB, PSS MB, 是否内存映射)"""
+    import json
+    procs = [
+        subprocess.Popen([sys.executable, "-c", _MODEL_WORKER_CODE, registry_root, str(samples)],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=BACKEND_DIR)
+        for _ in range(workers)
+    ]
+    try:
+        for proc in procs:
+            if proc.stdout.readline().strip() != "ready":
+                raise RuntimeError("模型工作进程启动失败")
+        results = []
+        for proc in procs:
+            proc.stdin.write("\n")
+            proc.stdin.flush()
+            results.append(json.loads(proc.stdout.readline()))
+        return results
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+
+
+def bench_model_sharing(args):
+    """
+    模型仓库内存映射加载：多个工作进程同时加载同一版本时每个进程的私有内存
+
+    对比直接发布 sklearn 随机森林（反序列化时节点数组被复制到私有内存）和发布 FlatForest
+    （节点数组以内存映射方式共享），并检查两者预测结果一致。FlatForest 未被内存映射或
+    预测不一致时以非零状态码退出。
+    """
+    import shutil
+    from sklearn.ensemble import RandomForestRegressor
+    from services.flat_forest import FlatForest
+    from services.model_registry import ModelRegistry
+
+    rng = np.random.default_rng(0)
+    X = rng.random((args.samples, 8))
+    y = X @ rng.random(8) + rng.normal(0, 0.1, args.samples)
+    forest = RandomForestRegressor(n_estimators=args.trees, random_state=0, n_jobs=-1).fit(X, y)
+    flat = FlatForest.from_forest(forest)
+
+    failed = False
+    X_test = rng.random((1000, 8))
+    if not np.array_equal(flat.predict(X_test), forest.predict(X_test)):
+        print("FlatForest 的预测结果与 sklearn 不一致")
+        failed = True
+
+    forest_mb = sum(getattr(flat, name).nbytes for name in
+                    ('children_left', 'children_right', 'feature', 'threshold', 'value')) / 1024 / 1024
+    print(f"森林: {args.trees} 棵树，{len(flat.value)} 个节点，节点数组 {forest_mb:.1f}MB，{args.workers} 个工作进程")
+    print(f"{'artifact':>10} {'private/worker(MB)':>19} {'pss/worker(MB)':>15}")
+
+    work_dir = tempfile.mkdtemp(prefix="model_sharing_bench_")
+    try:
+        for name, artifact in (("sklearn", forest), ("flat", flat)):
+            root = os.path.join(work_dir, name)
+            ModelRegistry(root).publish({'impact_model': artifact}, [f"f{i}" for i in range(8)])
+            results = _model_worker_memory(root, args.workers, args.predict_samples)
+            private = np.mean([r['private_mb'] for r in results])
+            pss = np.mean([r['pss_mb'] for r in results])
+            print(f"{name:>10} {private:>19.1f} {pss:>15.1f}")
+            if name == "flat" and not all(r['mapped'] for r in results):
+                print("FlatForest 的节点数组没有以内存映射方式加载")
+                failed = True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failed:
+        sys.exit(1)
+
+
+# 不应在服务模块导入时加载的重量级依赖
+HEAVY_MODULES = {
+    "torch", "transformers", "spacy", "sklearn", "networkx", "rake_nltk", "nltk",
+    "arxiv", "requests", "bs4", "matplotlib", "seaborn", "plotly", "scipy",
+    "pandas", "joblib", "PyPDF2"
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paper Killer 性能基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    layout_parser = subparsers.add_parser("layout", help="引用网络布局")
+    layout_parser.add_argument("--edges", type=int, nargs="+", default=[1000, 10000, 50000])
+    layout_parser.add_argument("--baseline", action="store_true", help="同时测量 networkx.spring_layout（仅限 ≤10k 边）")
+    layout_parser.set_defaults(func=bench_layout)
+
+    graph_parser = subparsers.add_parser("citation-graph", help="引用图 PageRank 与社区划分")
+    graph_parser.add_argument("--edges", type=int, nargs="+", default=[100000, 1000000])
+    graph_parser.add_argument("--top-k", type=int, default=20)
+    graph_parser.add_argument("--baseline", action="store_true", help="同时测量 networkx.pagerank")
+    graph_parser.add_argument("--baseline-max-edges", type=int, default=1000000)
+    graph_parser.set_defaults(func=bench_citation_graph)
+
+    export_parser = subparsers.add_parser("export", help="Plotly 静态图片导出")
+    export_parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    export_parser.add_argument("--workers", type=int, default=2)
+    export_parser.set_defaults(func=bench_export)
+
+    plots_parser = subparsers.add_parser("experiment-plots", help="并行渲染实验图表的一致性")
+    plots_parser.add_argument("--plots", type=int, default=50)
+    plots_parser.add_argument("--workers", type=int, default=8)
+    plots_parser.add_argument("--format", default="png", choices=["png", "svg"])
+    plots_parser.set_defaults(func=bench_experiment_plots)
+
+    imports_parser = subparsers.add_parser("imports", help="模块导入耗时与内存预算")
+    imports_parser.add_argument("--module", default="services.paper_analysis")
+    imports_parser.add_argument("--budget-ms", type=float, default=300)
+    imports_parser.add_argument("--budget-mb", type=float, default=40)
+    imports_parser.add_argument("--top", type=int, default=15)
+    imports_parser.add_argument("--repeat", type=int, default=3)
+    imports_parser.set_defaults(func=bench_imports)
+
+    keyword_parser = subparsers.add_parser("keyword-trends", help="关键词趋势预测")
+    keyword_parser.add_argument("--keywords", type=int, default=10000)
+    keyword_parser.add_argument("--years", type=int, default=10)
+    keyword_parser.add_argument("--horizon", type=int, default=5)
+    keyword_parser.add_argument("--baseline", action="store_true", help="同时测量逐关键词 LinearRegression")
+    keyword_parser.set_defaults(func=bench_keyword_trends)
+
+    ingest_parser = subparsers.add_parser("ingest", help="批量上传处理吞吐")
+    ingest_parser.add_argument("--files", type=int, nargs="+", default=[1, 10, 50])
+    ingest_parser.add_argument("--concurrency", type=int, default=8)
+    ingest_parser.add_argument("--pages", type=int, default=4)
+    ingest_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="解析进程数，1 表示只用线程池")
+    ingest_parser.add_argument("--min-process-kb", type=int, default=0, help="交给进程池解析的最小文件大小")
+    ingest_parser.set_defaults(func=bench_ingest)
+
+    extract_parser = subparsers.add_parser("pdf-extract", help="PDF 开头信息提取延迟")
+    extract_parser.add_argument("--files", type=int, default=50)
+    extract_parser.add_argument("--pages", type=int, default=4)
+    extract_parser.add_argument("--model", default="en_core_web_sm")
+    extract_parser.add_argument("--baseline", action="store_true", help="同时测量原来的完整管线实现")
+    extract_parser.set_defaults(func=bench_pdf_extract)
+
+    pages_parser = subparsers.add_parser("pdf-pages", help="长文档按页分片并行提取")
+    pages_parser.add_argument("--pages", type=int, default=200)
+    pages_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    pages_parser.set_defaults(func=bench_pdf_pages)
+
+    backends_parser = subparsers.add_parser("pdf-backends", help="PDF 文本后端对比")
+    backends_parser.add_argument("--corpus", help="PDF 夹具目录（同名 .txt 为参考文本），默认使用合成语料")
+    backends_parser.add_argument("--files", type=int, default=20)
+    backends_parser.add_argument("--pages", type=int, default=8)
+    backends_parser.add_argument("--backends", nargs="+", help="默认测试全部后端")
+    backends_parser.set_defaults(func=bench_pdf_backends)
+
+    venue_parser = subparsers.add_parser("venue", help="会议/期刊识别的最坏情况耗时")
+    venue_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    venue_parser.add_argument("--repeat", type=int, default=3)
+    venue_parser.add_argument("--slack", type=float, default=3.0, help="允许超出线性增长的倍数")
+    venue_parser.add_argument("--baseline", action="store_true", help="同时测量原正则（只在小输入上运行）")
+    venue_parser.add_argument("--baseline-max-chars", type=int, default=3000)
+    venue_parser.set_defaults(func=bench_venue)
+
+    cleanup_parser = subparsers.add_parser("file-cleanup", help="清理旧文件时的事件循环卡顿")
+    cleanup_parser.add_argument("--files", type=int, nargs="+", default=[2000, 20000])
+    cleanup_parser.add_argument("--days", type=int, default=30)
+    cleanup_parser.add_argument("--batch-size", type=int, default=200)
+    cleanup_parser.add_argument("--max-stall-ms", type=float, default=100, help="后台清理允许的最大卡顿")
+    cleanup_parser.add_argument("--baseline", action="store_true", help="同时测量原来的内联清理")
+    cleanup_parser.set_defaults(func=bench_file_cleanup)
+
+    serving_parser = subparsers.add_parser("file-serving", help="论文 PDF 范围请求与条件请求的传输量")
+    serving_parser.add_argument("--size-mb", type=float, default=20)
+    serving_parser.add_argument("--seeks", type=int, default=50, help="按页跳转的次数")
+    serving_parser.add_argument("--chunk-kb", type=int, default=64, help="每次跳转读取的字节数")
+    serving_parser.set_defaults(func=bench_file_serving)
+
+    sharing_parser = subparsers.add_parser("model-sharing", help="多个工作进程加载同一模型版本时的内存占用")
+    sharing_parser.add_argument("--trees", type=int, default=200)
+    sharing_parser.add_argument("--samples", type=int, default=20000, help="训练样本数（决定每棵树的节点数）")
+    sharing_parser.add_argument("--workers", type=int, default=4)
+    sharing_parser.add_argument("--predict-samples", type=int, default=100)
+    sharing_parser.set_defaults(func=bench_model_sharing)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
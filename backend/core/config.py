@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Paper Killer"
     VERSION: str = "0.1.0"
@@ -21,6 +23,19 @@ class Settings(BaseSettings):
     # CORS配置
     BACKEND_CORS_ORIGINS: list = ["*"]
     
+    # PDF文本提取后端: pypdf2（默认）/ pypdf / pdfminer / pymupdf
+    PDF_TEXT_BACKEND: str = "pypdf2"
+    
+    # PDF提取结果缓存（SQLite），默认放在 backend/cache 下，与启动目录无关
+    EXTRACTION_CACHE_PATH: str = os.path.join(BACKEND_DIR, "cache", "pdf_extraction.db")
+    
+    # 模型仓库根目录（版本化的训练产物），默认放在 backend/model_store 下，与启动目录无关
+    MODEL_REGISTRY_PATH: str = os.path.join(BACKEND_DIR, "model_store")
+    
+    # 上传文件定时清理：间隔（小时，默认 0 不启用，需要在部署配置中显式开启）和保留天数
+    FILE_CLEANUP_INTERVAL_HOURS: float = 0
+    FILE_CLEANUP_DAYS: int = 30
+    
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,109 @@
+"""
+爬取论文的参考文献入库脚本
+
+读取爬虫输出的论文语料（JSON/JSONL），下载每篇论文的 PDF（或使用本地 pdf_path），
+在进程池中逐页提取参考文献章节并解析，最后写入 citation_edges 引用图。
+重复运行是幂等的：每篇论文的引用边会被整体替换。
+
+用法（在 backend 目录下执行）:
+    python ingest_citations.py iclr2025_papers.json --base-url https://openreview.net
+    python ingest_citations.py corpus.jsonl --workers 8 --download-dir cache/pdfs
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from train_models import load_corpus
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 工作进程的参数（由 _init_worker 设置）
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_worker(base_url: str, download_dir: str, backend: Optional[str], timeout: float):
+    _worker_options.update(base_url=base_url, download_dir=download_dir, backend=backend, timeout=timeout)
+
+
+def _resolve_pdf(paper: Dict[str, Any]) -> Optional[str]:
+    """返回论文 PDF 的本地路径，必要时下载到 download_dir（按链接哈希命名，已下载的直接复用）"""
+    if paper.get('pdf_path') and os.path.exists(paper['pdf_path']):
+        return paper['pdf_path']
+    link = paper.get('pdf_link') or paper.get('pdf_url')
+    if not link:
+        return None
+
+    import requests
+    url = urljoin(_worker_options['base_url'], link)
+    path = os.path.join(_worker_options['download_dir'], hashlib.sha1(url.encode()).hexdigest() + '.pdf')
+    if not os.path.exists(path):
+        response = requests.get(url, timeout=_worker_options['timeout'])
+        response.raise_for_status()
+        with open(path + '.part', 'wb') as f:
+            f.write(response.content)
+        os.replace(path + '.part', path)
+    return path
+
+
+def _extract_references(paper: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+    """下载并解析一篇论文的参考文献，失败时返回 None"""
+    from services.pdf_extraction import extract_sections
+    from services.reference_parser import parse_references
+    try:
+        path = _resolve_pdf(paper)
+        if path is None:
+            return paper, None
+        sections = extract_sections(path, backend=_worker_options['backend'])
+        return paper, parse_references(sections.get('references', ''))
+    except Exception as e:
+        logger.error(f"解析参考文献失败（{paper.get('title', '')[:50]}）: {str(e)}")
+        return paper, None
+
+
+def ingest(args) -> Dict[str, Any]:
+    from services.citation_store import CitationStore
+
+    papers = []
+    for path in args.corpus:
+        papers.extend(load_corpus(path))
+    os.makedirs(args.download_dir, exist_ok=True)
+    store = CitationStore()
+
+    start = time.perf_counter()
+    stats = {'papers': len(papers), 'indexed': 0, 'skipped': 0, 'edges': 0}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.base_url, args.download_dir, args.backend, args.timeout)) as executor:
+        # 解析在工作进程中并行，写库集中在主进程
+        for paper, references in executor.map(_extract_references, papers, chunksize=4):
+            if not references:
+                stats['skipped'] += 1
+                continue
+            stats['edges'] += store.replace_references(paper.get('title', ''), references, paper.get('doi'))
+            stats['indexed'] += 1
+    stats['elapsed_s'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="解析爬取论文的参考文献并写入引用图")
+    parser.add_argument("corpus", nargs="+", help="论文语料文件（.json 或 .jsonl）")
+    parser.add_argument("--base-url", default="https://openreview.net", help="相对 PDF 链接的基础地址")
+    parser.add_argument("--download-dir", default="cache/pdfs")
+    parser.add_argument("--backend", default=None, help="PDF 文本后端，默认使用 PyPDF2")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    stats = ingest(args)
+    print(f"论文: {stats['papers']}，入库: {stats['indexed']}，跳过: {stats['skipped']}，"
+          f"引用边: {stats['edges']}，耗时 {stats['elapsed_s']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from api.routes import paper, auth
+from api.routes import paper, auth, file_management
 from core.config import settings
 import os
 
@@ -34,6 +34,7 @@ templates = Jinja2Templates(directory="templates")
 # 包含路由
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(paper.router, prefix=f"{settings.API_V1_STR}/papers", tags=["papers"])
+app.include_router(file_management.router, prefix=f"{settings.API_V1_STR}/files", tags=["files"])
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -62,6 +63,15 @@ async def root(request: Request):
                     {"path": "/papers/{paper_id}/analysis", "method": "GET", "description": "获取分析结果"}
                 ]
             },
+            {
+                "name": "文件管理",
+                "description": "上传文件的存储统计、列表和定期清理",
+                "endpoints": [
+                    {"path": "/files/storage", "method": "GET", "description": "获取存储信息"},
+                    {"path": "/files/files", "method": "GET", "description": "列出文件"},
+                    {"path": "/files/cleanup", "method": "POST", "description": "清理旧文件"}
+                ]
+            },
             {
                 "name": "用户认证",
                 "description": "安全的用户认证和授权系统",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Float
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Boolean, JSON, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from core.database import Base
 from datetime import datetime
@@ -11,6 +11,7 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False)  # 管理员可以管理上传目录中的文件
     created_at = Column(DateTime, default=datetime.utcnow)
 
     papers = relationship("Paper", back_populates="author")
@@ -24,6 +25,8 @@ class Paper(Base):
     keywords = Column(String)
     status = Column(String)  # draft, submitted, accepted, rejected
     target_conference = Column(String)
+    # 上传文件在内容寻址存储中的路径，相同内容的论文共享同一路径（用于统计引用计数）
+    pdf_url = Column(String, index=True)
     author_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -77,4 +80,52 @@ class PaperAnalysis(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 关系
-    paper = relationship("Paper", back_populates="analysis") 
\ No newline at end of file
+    paper = relationship("Paper", back_populates="analysis") 
+
+class CitationEdge(Base):
+    """从参考文献中解析出的引用边：citing_key 对应的论文引用了 cited_key 对应的论文"""
+    __tablename__ = "citation_edges"
+    # (citing_key, cited_key) 唯一索引同时用于按引用方查询
+    __table_args__ = (UniqueConstraint("citing_key", "cited_key", name="uq_citation_edges_citing_cited"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    citing_key = Column(String, nullable=False)  # doi:... 或 title:<规范化标题>
+    cited_key = Column(String, nullable=False, index=True)
+    citing_paper_id = Column(Integer, ForeignKey("papers.id"), index=True)  # 上传的论文才有
+    citing_title = Column(Text)
+    cited_title = Column(Text)
+    cited_authors = Column(Text)
+    cited_year = Column(Integer)
+    cited_doi = Column(String)
+    raw = Column(Text)  # 原始参考文献条目
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CitationGraphVersion(Base):
+    """引用图版本号（单行），每次写入引用边时在同一事务中加一，用于判断缓存的图是否过期"""
+    __tablename__ = "citation_graph_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StoredFile(Base):
+    """上传文件的元数据索引，文件列表和存储统计直接查询此表，不再遍历目录"""
+    __tablename__ = "stored_files"
+    # 列表按 (modified_at, id) 做键集分页
+    __table_args__ = (Index("ix_stored_files_modified_at_id", "modified_at", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    content_hash = Column(String)  # 内容寻址存储中的文件才有
+    created_at = Column(DateTime, nullable=False)
+    modified_at = Column(DateTime, nullable=False)
+
+class StorageTotals(Base):
+    """上传文件的总大小和总数（单行），与 stored_files 在同一事务中增量更新"""
+    __tablename__ = "storage_totals"
+
+    id = Column(Integer, primary_key=True)
+    total_size = Column(BigInteger, nullable=False, default=0)
+    file_count = Column(Integer, nullable=False, default=0)
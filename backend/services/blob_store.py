@@ -0,0 +1,203 @@
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_HASH_NAME = re.compile(r'^[0-9a-f]{64}$')
+
+
+def paper_reference_counts(paths: Iterable[str]) -> Dict[str, int]:
+    """统计每个路径被多少条论文记录（Paper.pdf_url）引用，未被引用的路径不出现在结果中"""
+    from sqlalchemy import func
+    from core.database import SessionLocal
+    from models.models import Paper
+
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+    session = SessionLocal()
+    try:
+        return dict(
+            session.query(Paper.pdf_url, func.count(Paper.id))
+            .filter(Paper.pdf_url.in_(paths)).group_by(Paper.pdf_url).all()
+        )
+    finally:
+        session.close()
+
+
+class BlobStore:
+    """
+    按内容寻址的上传文件存储
+
+    文件以 SHA-256 命名，按哈希前缀分两级子目录存放（blobs/ab/cd/<hash>.pdf），
+    单个目录下的文件数保持在较小规模。相同内容只存一份，多条论文记录的 pdf_url
+    指向同一个文件；引用计数即指向该路径的论文记录数，归零后文件才能被删除。
+
+    重复上传命中已有文件时会刷新其修改时间，修改时间在 grace_seconds 内的文件不会被删除，
+    避免在新论文记录提交之前（此时引用计数仍为 0）把文件删掉。
+
+    上传时内容哈希要读完才知道，先流式写入 incoming 目录下的临时文件（与分片目录在同一文件系统），
+    再由 commit 原子重命名到哈希对应的路径。
+    """
+
+    def __init__(self, root: str = "uploads/blobs", suffix: str = ".pdf",
+                 reference_counts: Optional[Callable[[Iterable[str]], Dict[str, int]]] = None,
+                 grace_seconds: float = 600):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.incoming = self.root / "incoming"
+        self.incoming.mkdir(exist_ok=True)
+        self.suffix = suffix
+        self.reference_counts = reference_counts or paper_reference_counts
+        self.grace_seconds = grace_seconds
+        self._purge_incoming()
+
+    def path_for(self, content_hash: str) -> Path:
+        """内容哈希对应的存储路径"""
+        return self.root / content_hash[:2] / content_hash[2:4] / f"{content_hash}{self.suffix}"
+
+    def hash_of(self, path: str) -> Optional[str]:
+        """从存储路径中取出内容哈希，不是本存储中的文件时返回 None"""
+        candidate = Path(path)
+        content_hash = candidate.stem
+        if candidate.suffix != self.suffix or not _HASH_NAME.match(content_hash):
+            return None
+        return content_hash if self._same_path(candidate, self.path_for(content_hash)) else None
+
+    def contains(self, path: str) -> bool:
+        return self.hash_of(path) is not None
+
+    def store(self, source: BinaryIO, content_hash: str) -> Tuple[str, bool]:
+        """
+        保存内容，返回 (存储路径, 是否新写入)
+
+        内容已存在时不写磁盘；否则先写入同一分片目录下的临时文件，再原子重命名，
+        并发上传相同内容时最后一次重命名覆盖的也是相同字节。
+        """
+        path = self.path_for(content_hash)
+        try:
+            os.utime(path)
+            return str(path), False
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        source.seek(0)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".blob-", delete=False) as buffer:
+            tmp_path = buffer.name
+            try:
+                shutil.copyfileobj(source, buffer, 1024 * 1024)
+            except BaseException:
+                buffer.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+        return str(path), True
+
+    def create_temp(self) -> BinaryIO:
+        """创建接收上传内容的临时文件（调用方负责关闭，之后 commit 或 discard）"""
+        return tempfile.NamedTemporaryFile(dir=self.incoming, prefix=".blob-", delete=False)
+
+    def commit(self, tmp_path: str, content_hash: str) -> Tuple[str, bool]:
+        """
+        把写完的临时文件存为 content_hash 对应的文件，返回 (存储路径, 是否新写入)
+
+        内容已存在时删除临时文件并刷新已有文件的修改时间；否则原子重命名到分片目录。
+        """
+        path = self.path_for(content_hash)
+        try:
+            os.utime(path)
+            self.discard(tmp_path)
+            return str(path), False
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+        return str(path), True
+
+    def discard(self, tmp_path: str) -> None:
+        """删除未提交的临时文件"""
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def reference_count(self, path: str) -> int:
+        """指向该文件的论文记录数（按规范路径统计，与 store 返回的路径一致）"""
+        content_hash = self.hash_of(path)
+        if content_hash is None:
+            return 0
+        canonical = str(self.path_for(content_hash))
+        return self.reference_counts([canonical]).get(canonical, 0)
+
+    def release(self, path: str) -> bool:
+        """
+        论文记录删除后调用：文件不再被引用时删除，返回是否删除了文件
+
+        仍在宽限期内的文件留给之后的清理任务处理。
+        """
+        if not self.contains(path) or not self.past_grace(path) or self.reference_count(path) > 0:
+            return False
+        return self.delete(path)
+
+    def past_grace(self, path: str, now: Optional[float] = None) -> bool:
+        """文件最近一次写入或被重复上传命中已超过宽限期"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        return (now or time.time()) - mtime > self.grace_seconds
+
+    def delete(self, path: str) -> bool:
+        """删除文件并清理空的分片目录"""
+        blob = Path(path)
+        try:
+            blob.unlink()
+        except FileNotFoundError:
+            return False
+        for directory in (blob.parent, blob.parent.parent):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+        logger.info(f"删除未被引用的文件: {path}")
+        return True
+
+    def iter_files(self) -> Iterator[os.DirEntry]:
+        """遍历所有存储的文件（只扫描两级分片目录，跳过临时文件）"""
+        for first in self._scan_dirs(self.root):
+            for second in self._scan_dirs(first.path):
+                with os.scandir(second.path) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.endswith(self.suffix) and not entry.name.startswith('.'):
+                            yield entry
+
+    def unreferenced(self, paths: List[str]) -> List[str]:
+        """筛选出没有论文记录引用的文件（一次批量查询）"""
+        canonical = [str(self.path_for(Path(path).stem)) for path in paths]
+        counts = self.reference_counts(canonical)
+        return [path for path, key in zip(paths, canonical) if counts.get(key, 0) == 0]
+
+    def _purge_incoming(self) -> None:
+        # 进程在上传途中退出时留下的临时文件
+        cutoff = time.time() - self.grace_seconds
+        with os.scandir(self.incoming) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.startswith('.blob-') and entry.stat().st_mtime < cutoff:
+                    self.discard(entry.path)
+
+    @staticmethod
+    def _scan_dirs(path) -> List[os.DirEntry]:
+        with os.scandir(path) as entries:
+            return [entry for entry in entries if entry.is_dir() and len(entry.name) == 2]
+
+    @staticmethod
+    def _same_path(a: Path, b: Path) -> bool:
+        return os.path.normpath(os.path.abspath(a)) == os.path.normpath(os.path.abspath(b))
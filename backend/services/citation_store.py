@@ -0,0 +1,210 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import logging
+import threading
+from datetime import datetime
+from .reference_parser import paper_key, parse_references
+
+logger = logging.getLogger(__name__)
+
+# 引用图版本号所在的行
+_VERSION_ID = 1
+
+
+def _chunks(keys: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(keys), size):
+        yield keys[i:i + size]
+
+
+class CitationStore:
+    """
+    持久化的引用图
+
+    上传和爬取的论文的参考文献解析后写入 citation_edges 表，引用网络、引用影响力和高被引论文
+    都通过 citing_key / cited_key 上的索引查询，不再在每次请求时重新扫描文本。
+
+    citation_graph_version 中的版本号随每次写入在同一事务中加一，缓存的整图按版本号判断是否过期。
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None, batch_size: int = 500):
+        # 数据库依赖在构造时才导入，只做文本分析时不需要连接数据库
+        from models.models import CitationEdge, CitationGraphVersion
+        if session_factory is None:
+            from core.database import SessionLocal
+            session_factory = SessionLocal
+        self.Edge = CitationEdge
+        self.Version = CitationGraphVersion
+        self.session_factory = session_factory
+        # IN 查询每批的键数
+        self.batch_size = batch_size
+
+        # 按引用图版本缓存的稀疏矩阵图（PageRank、社区等结果缓存在图实例上）
+        self._graph = None
+        self._graph_version: Optional[int] = None
+        self._graph_lock = threading.Lock()
+
+    def record_references(self, title: str, references_text: str, doi: Optional[str] = None,
+                          paper_id: Optional[int] = None) -> int:
+        """解析参考文献章节并替换该论文已有的引用边，返回写入的边数"""
+        return self.replace_references(title, parse_references(references_text), doi, paper_id)
+
+    def record_sections(self, title: str, sections: Dict[str, str], doi: Optional[str] = None,
+                        paper_id: Optional[int] = None) -> int:
+        """从章节切分结果中取出参考文献章节并入库"""
+        return self.record_references(title, sections.get('references', ''), doi, paper_id)
+
+    def replace_references(self, title: str, references: List[Dict[str, Any]], doi: Optional[str] = None,
+                           paper_id: Optional[int] = None) -> int:
+        """用解析好的参考文献替换该论文的引用边（重复导入同一篇论文是幂等的）"""
+        citing_key = paper_key(title, doi)
+        if citing_key == 'title:':
+            logger.warning("论文缺少标题和 DOI，跳过引用入库")
+            return 0
+
+        rows = [
+            {
+                'citing_key': citing_key,
+                'cited_key': reference['key'],
+                'citing_paper_id': paper_id,
+                'citing_title': title,
+                'cited_title': reference['title'],
+                'cited_authors': reference['authors'],
+                'cited_year': reference['year'],
+                'cited_doi': reference['doi'],
+                'raw': reference['raw']
+            }
+            for reference in references if reference['key'] != citing_key
+        ]
+
+        session = self.session_factory()
+        try:
+            session.query(self.Edge).filter(self.Edge.citing_key == citing_key).delete(synchronize_session=False)
+            if rows:
+                session.bulk_insert_mappings(self.Edge, rows)
+            self._bump_version(session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return len(rows)
+
+    def indexed_papers(self, keys: Iterable[str]) -> Set[str]:
+        """返回已有引用边的论文键"""
+        found = set()
+        self._each_batch(keys, lambda session, batch: found.update(
+            key for key, in session.query(self.Edge.citing_key)
+            .filter(self.Edge.citing_key.in_(batch)).distinct()
+        ))
+        return found
+
+    def references_of(self, keys: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """按引用方批量读取参考文献：{citing_key: [{'key', 'title', 'year'}]}"""
+        references: Dict[str, List[Dict[str, Any]]] = {}
+
+        def collect(session, batch):
+            query = session.query(
+                self.Edge.citing_key, self.Edge.cited_key, self.Edge.cited_title, self.Edge.cited_year
+            ).filter(self.Edge.citing_key.in_(batch)).order_by(self.Edge.citing_key, self.Edge.id)
+            for citing_key, cited_key, cited_title, cited_year in query:
+                references.setdefault(citing_key, []).append(
+                    {'key': cited_key, 'title': cited_title, 'year': cited_year}
+                )
+
+        self._each_batch(keys, collect)
+        return references
+
+    def citation_counts(self, keys: Iterable[str]) -> Dict[str, int]:
+        """被引次数（入度）：{cited_key: 次数}，未被引用的键不出现在结果中"""
+        from sqlalchemy import func
+        counts: Dict[str, int] = {}
+        self._each_batch(keys, lambda session, batch: counts.update(
+            session.query(self.Edge.cited_key, func.count(self.Edge.id))
+            .filter(self.Edge.cited_key.in_(batch)).group_by(self.Edge.cited_key).all()
+        ))
+        return counts
+
+    def most_cited(self, citing_keys: Optional[Iterable[str]] = None, min_citations: int = 2,
+                   limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        高被引论文
+
+        给定 citing_keys 时只统计这些论文之间及其对外的引用（例如某一批爬取的论文），
+        否则统计全库。结果按被引次数降序。
+        """
+        from sqlalchemy import func
+        count = func.count(self.Edge.id).label('citations')
+
+        session = self.session_factory()
+        try:
+            query = session.query(
+                self.Edge.cited_key, func.max(self.Edge.cited_title), func.max(self.Edge.cited_year), count
+            )
+            if citing_keys is not None:
+                citing_keys = list(citing_keys)
+                if not citing_keys:
+                    return []
+                query = query.filter(self.Edge.citing_key.in_(citing_keys))
+            rows = (query.group_by(self.Edge.cited_key)
+                    .having(count >= min_citations)
+                    .order_by(count.desc())
+                    .limit(limit).all())
+        finally:
+            session.close()
+        return [
+            {'key': key, 'title': title, 'year': year, 'citations': citations}
+            for key, title, year, citations in rows
+        ]
+
+    def graph_version(self) -> int:
+        """引用图版本号（一次主键查询）；还没有版本行时为 0"""
+        session = self.session_factory()
+        try:
+            row = session.get(self.Version, _VERSION_ID)
+            return row.version if row is not None else 0
+        finally:
+            session.close()
+
+    def _bump_version(self, session) -> None:
+        # 原子加一；迁移会写入版本行，只有 create_all 建的库第一次写入时需要插入
+        updated = session.query(self.Version).filter(self.Version.id == _VERSION_ID).update({
+            self.Version.version: self.Version.version + 1,
+            self.Version.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        if not updated:
+            session.add(self.Version(id=_VERSION_ID, version=1))
+
+    def load_graph(self, fetch_size: int = 100000):
+        """
+        读取整个引用图为 CitationGraph
+
+        同一版本只从数据库读取一次，之后的请求直接复用缓存的图及其分析结果。
+        """
+        from .citation_graph import CitationGraph
+        version = self.graph_version()
+        with self._graph_lock:
+            if self._graph is None or self._graph_version != version:
+                citing, cited = [], []
+                session = self.session_factory()
+                try:
+                    query = session.query(self.Edge.citing_key, self.Edge.cited_key).yield_per(fetch_size)
+                    for citing_key, cited_key in query:
+                        citing.append(citing_key)
+                        cited.append(cited_key)
+                finally:
+                    session.close()
+                self._graph = CitationGraph.from_edges(citing, cited)
+                self._graph_version = version
+                logger.info(f"加载引用图: {self._graph.num_nodes} 个节点，{self._graph.num_edges} 条边")
+            return self._graph
+
+    def _each_batch(self, keys: Iterable[str], func: Callable) -> None:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        session = self.session_factory()
+        try:
+            for batch in _chunks(keys, self.batch_size):
+                func(session, batch)
+        finally:
+            session.close()
@@ -1,11 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
 import json
 import re
 from datetime import datetime
 import logging
 import time
 import os
+try:
+    from .lazy_imports import lazy_import
+except ImportError:
+    # 作为脚本直接运行时（python services/crawler.py）
+    from lazy_imports import lazy_import
+
+# 网络请求和HTML解析依赖在首次抓取时才导入
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,7 +30,7 @@ class ICLRCrawler:
         try:
             login_url = "https://openreview.net/login"
             response = self.session.get(login_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = bs4.BeautifulSoup(response.text, 'html.parser')
             
             # 获取登录表单的 token
             token = soup.find('input', {'name': 'token'})['value']
@@ -64,7 +71,7 @@ class ICLRCrawler:
             # 获取论文列表
             response = self.session.get(self.base_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = bs4.BeautifulSoup(response.text, 'html.parser')
             
             papers = []
             paper_elements = soup.find_all('div', class_='note')
@@ -192,7 +199,7 @@ class ICLRCrawler:
             review_url = f"https://openreview.net/forum?id={paper_id}"
             response = self.session.get(review_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = bs4.BeautifulSoup(response.text, 'html.parser')
             
             reviews = []
             review_elements = soup.find_all('div', class_='note-content-review')
@@ -1,14 +1,44 @@
 from typing import Dict, List, Any
 import numpy as np
-from scipy import stats
-import matplotlib.pyplot as plt
-import seaborn as sns
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+from .lazy_imports import lazy_import
+
+# scipy/seaborn/matplotlib 在首次统计或绘图时才导入
+stats = lazy_import('scipy.stats')
+sns = lazy_import('seaborn')
+mpl = lazy_import('matplotlib')
+mpl_figure = lazy_import('matplotlib.figure')
+mpl_backend_agg = lazy_import('matplotlib.backends.backend_agg')
 
 class ExperimentAnalysisService:
-    def __init__(self):
-        self.plt = plt
+    def __init__(self, max_workers: int = 4, cache_size: int = 128):
         self.sns = sns
         
+        # 渲染线程池：每次调用使用独立的Figure对象，不依赖pyplot全局状态
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        
+        # SVG 元素 id 的哈希盐默认每次随机，这里在创建服务时（渲染线程启动前）设置一次固定值，
+        # 保证相同数据输出一致。svg.hashsalt 是进程级配置，matplotlib 没有按图设置的方式；
+        # 部署配置中已经设置了的值保持不变
+        if mpl.rcParams['svg.hashsalt'] is None:
+            mpl.rcParams['svg.hashsalt'] = 'experiment-analysis'
+        
+        # 按数据哈希缓存渲染结果
+        self.cache_size = cache_size
+        self._render_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # 图片输出目录
+        self.output_dir = "static/experiments"
+        os.makedirs(self.output_dir, exist_ok=True)
+        
     async def analyze_experiment_results(self, data: Dict[str, List[float]]) -> Dict:
         """
         分析实验结果
@@ -51,26 +81,79 @@ class ExperimentAnalysisService:
             't_test': t_test.pvalue
         }
     
-    async def generate_visualization(self, 
-                                   data: Dict[str, List[float]], 
-                                   plot_type: str = 'boxplot') -> str:
+    async def generate_visualization(self,
+                                   data: Dict[str, List[float]],
+                                   plot_type: str = 'boxplot',
+                                   image_format: str = 'png') -> str:
         """
-        生成数据可视化
+        生成数据可视化，返回图片文件路径（在渲染线程池中绘制）
         """
-        plt.figure(figsize=(10, 6))
+        loop = asyncio.get_event_loop()
+        image = await loop.run_in_executor(
+            self.executor,
+            self.render_chart,
+            data,
+            plot_type,
+            image_format
+        )
+        
+        # 以数据哈希命名，并发请求不会写同一个文件
+        file_path = os.path.join(self.output_dir, f"{self._cache_key(data, plot_type, image_format)}.{image_format}")
+        if not os.path.exists(file_path):
+            tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(image)
+            os.replace(tmp_path, file_path)
         
+        return file_path
+    
+    def render_chart(self,
+                     data: Dict[str, List[float]],
+                     plot_type: str = 'boxplot',
+                     image_format: str = 'png') -> bytes:
+        """同步渲染图表（线程安全，按数据哈希缓存）"""
+        if plot_type not in ('boxplot', 'violin'):
+            raise ValueError(f"不支持的图表类型: {plot_type}")
+        if image_format not in ('png', 'svg'):
+            raise ValueError(f"不支持的图片格式: {image_format}")
+        
+        key = self._cache_key(data, plot_type, image_format)
+        with self._cache_lock:
+            if key in self._render_cache:
+                self._render_cache.move_to_end(key)
+                return self._render_cache[key]
+        
+        fig = mpl_figure.Figure(figsize=(10, 6))
+        mpl_backend_agg.FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        
+        groups = list(data.keys())
+        values = [data[group] for group in groups]
         if plot_type == 'boxplot':
-            self.sns.boxplot(data=[data[group] for group in data.keys()])
-            plt.xticks(range(len(data)), data.keys())
-        elif plot_type == 'violin':
-            self.sns.violinplot(data=[data[group] for group in data.keys()])
-            plt.xticks(range(len(data)), data.keys())
+            self.sns.boxplot(data=values, ax=ax)
+        else:
+            self.sns.violinplot(data=values, ax=ax)
+        ax.set_xticks(range(len(groups)))
+        ax.set_xticklabels(groups)
+        
+        ax.set_title('Experiment Results Visualization')
+        ax.set_ylabel('Values')
         
-        plt.title('Experiment Results Visualization')
-        plt.ylabel('Values')
+        # SVG中不写入生成时间（哈希盐在 __init__ 中固定），保证相同数据的输出一致
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format,
+                    metadata={'Date': None} if image_format == 'svg' else None)
+        image = buffer.getvalue()
         
-        # 保存图片
-        plt.savefig('experiment_results.png')
-        plt.close()
+        with self._cache_lock:
+            self._render_cache[key] = image
+            while len(self._render_cache) > self.cache_size:
+                self._render_cache.popitem(last=False)
         
-        return 'experiment_results.png' 
\ No newline at end of file
+        return image
+    
+    @staticmethod
+    def _cache_key(data: Dict[str, List[float]], plot_type: str, image_format: str) -> str:
+        """根据数据内容和图表参数计算缓存键（保留分组顺序，顺序不同时横轴不同）"""
+        payload = json.dumps([list(data.items()), plot_type, image_format], default=float)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """计算文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    PDF 信息提取结果的持久化缓存
+
+    以 (文件内容 SHA-256, 提取器版本) 为键存放在 SQLite 中。数据库使用 WAL 模式，
+    多个工作进程和服务重启之间共享同一份缓存；提取逻辑变化时提升提取器版本即可让旧结果失效。
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        # 默认路径来自配置（EXTRACTION_CACHE_PATH）
+        db_path = db_path or settings.EXTRACTION_CACHE_PATH
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_extractions ("
+                " content_hash TEXT NOT NULL,"
+                " extractor_version TEXT NOT NULL,"
+                " result TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, extractor_version))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程使用独立的连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, content_hash: str, extractor_version: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的提取结果，未命中时返回 None"""
+        try:
+            row = self._connect().execute(
+                "SELECT result FROM pdf_extractions WHERE content_hash = ? AND extractor_version = ?",
+                (content_hash, extractor_version)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"读取提取缓存失败: {str(e)}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, content_hash: str, extractor_version: str, result: Dict[str, Any]) -> None:
+        """写入提取结果（缓存写入失败不影响主流程）"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pdf_extractions VALUES (?, ?, ?, ?)",
+                    (content_hash, extractor_version, json.dumps(result, ensure_ascii=False), time.time())
+                )
+        except sqlite3.Error as e:
+            logger.error(f"写入提取缓存失败: {str(e)}")
+
+    def purge_stale(self, *extractor_versions: str) -> int:
+        """删除不属于给定提取器版本的缓存，返回删除的条数（至少给出一个要保留的版本）"""
+        if not extractor_versions:
+            # 空的 NOT IN () 会匹配所有行，清空整个缓存
+            raise ValueError("purge_stale 需要至少一个要保留的提取器版本")
+        placeholders = ", ".join("?" for _ in extractor_versions)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM pdf_extractions WHERE extractor_version NOT IN ({placeholders})",
+                extractor_versions
+            )
+        return cursor.rowcount
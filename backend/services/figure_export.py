@@ -0,0 +1,159 @@
+from typing import Dict, Optional
+from concurrent.futures import Future
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _export_worker_main(jobs: "mp.Queue", results: "mp.Queue") -> None:
+    """导出进程主循环：常驻并保持渲染器预热，逐个处理队列中的图表"""
+    import plotly.io as pio
+
+    # 预热：首次导出会启动 kaleido 渲染进程，之后的调用复用该进程
+    try:
+        pio.to_image({"data": [], "layout": {}}, format="png")
+    except Exception as e:
+        logger.error(f"导出进程预热失败: {str(e)}")
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        # 任务格式: (任务ID, 图表JSON, 格式, 宽, 高, 缩放)
+        job_id, fig_json, image_format, width, height, scale = job
+        try:
+            image = pio.to_image(
+                pio.from_json(fig_json, skip_invalid=True),
+                format=image_format,
+                width=width,
+                height=height,
+                scale=scale
+            )
+            results.put((job_id, image, None))
+        except Exception as e:
+            results.put((job_id, None, str(e)))
+
+
+class FigureExportPool:
+    """
+    常驻的 Plotly 静态图片导出进程池
+
+    每个导出进程只启动一次渲染器，图表以 JSON 的形式经本地队列发送，
+    返回 PNG/SVG 等格式的图片字节。导出进程意外退出时，未完成的任务全部以异常结束，
+    下一次提交时重新启动进程池。
+    """
+
+    def __init__(self, num_workers: int = 2, liveness_interval: float = 1.0):
+        self.num_workers = num_workers
+        # 分发线程检查导出进程存活的间隔（秒）
+        self.liveness_interval = liveness_interval
+        self._context = mp.get_context("spawn")
+        self._jobs = None
+        self._results = None
+        self._workers = []
+        self._dispatcher = None
+        self._pending: Dict[int, Future] = {}
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """启动导出进程（重复调用无副作用）"""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self._workers:
+            return
+        self._jobs = self._context.Queue()
+        self._results = self._context.Queue()
+        workers = []
+        for _ in range(self.num_workers):
+            worker = self._context.Process(
+                target=_export_worker_main,
+                args=(self._jobs, self._results),
+                daemon=True
+            )
+            worker.start()
+            workers.append(worker)
+        self._workers = workers
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_results, args=(self._results, workers), daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, fig_json: str, image_format: str = "png",
+               width: Optional[int] = None, height: Optional[int] = None,
+               scale: float = 1.0) -> Future:
+        """提交导出任务，返回结果为图片字节的 Future"""
+        future: Future = Future()
+        # 启动、登记和入队在同一把锁内完成，进程池失效时登记过的任务一定会被通知
+        with self._lock:
+            self._start_locked()
+            job_id = next(self._job_ids)
+            self._pending[job_id] = future
+            self._jobs.put((job_id, fig_json, image_format, width, height, scale))
+        return future
+
+    def export(self, fig_json: str, image_format: str = "png",
+               width: Optional[int] = None, height: Optional[int] = None,
+               scale: float = 1.0, timeout: Optional[float] = 60) -> bytes:
+        """同步导出单个图表"""
+        return self.submit(fig_json, image_format, width, height, scale).result(timeout)
+
+    def shutdown(self) -> None:
+        """停止所有导出进程"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        if not workers:
+            return
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        # 通知分发线程退出
+        self._results.put(None)
+        self._dispatcher.join(timeout=10)
+
+    def _dispatch_results(self, results: "mp.Queue", workers: list) -> None:
+        """将导出进程返回的结果分发给对应的 Future；发现导出进程退出时让未完成的任务失败"""
+        while True:
+            try:
+                item = results.get(timeout=self.liveness_interval)
+            except queue.Empty:
+                if all(worker.is_alive() for worker in workers):
+                    continue
+                self._fail_pool(workers)
+                break
+            if item is None:
+                break
+            job_id, image, error = item
+            with self._lock:
+                future = self._pending.pop(job_id, None)
+            if future is None:
+                continue
+            if error is None:
+                future.set_result(image)
+            else:
+                future.set_exception(RuntimeError(f"图表导出失败: {error}"))
+
+    def _fail_pool(self, workers: list) -> None:
+        """导出进程意外退出：停止这一代进程池，所有未完成的 Future 以异常结束"""
+        with self._lock:
+            if self._workers is not workers:
+                # 已经关闭或重启过
+                return
+            self._workers = []
+            pending, self._pending = self._pending, {}
+        logger.error(f"图表导出进程意外退出，{len(pending)} 个任务失败，下次导出时重启进程池")
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("图表导出进程意外退出"))
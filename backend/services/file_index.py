@@ -0,0 +1,260 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import base64
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 运行总量所在的行
+_TOTALS_ID = 1
+
+
+def encode_cursor(modified_at: datetime, file_id: int) -> str:
+    """分页游标：上一页最后一个文件的 (modified_at, id)"""
+    raw = f"{modified_at.isoformat()}|{file_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析分页游标，格式不对时抛出 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        modified_at, file_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(modified_at), int(file_id)
+    except Exception:
+        raise ValueError(f"无效的分页游标: {cursor}")
+
+
+def file_record(path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """读取文件元数据，生成 stored_files 的一行"""
+    stat = os.stat(path)
+    return {
+        'path': os.path.normpath(path),
+        'name': Path(path).name,
+        'size': stat.st_size,
+        'content_hash': content_hash,
+        'created_at': datetime.fromtimestamp(stat.st_ctime),
+        'modified_at': datetime.fromtimestamp(stat.st_mtime)
+    }
+
+
+class FileIndex:
+    """
+    上传文件的元数据索引
+
+    stored_files 表随保存、删除、移动和清理同步更新，storage_totals 保存总大小和总数，
+    与文件行在同一事务中增量调整。存储统计是一次主键查询，文件列表按 (modified_at, id)
+    做键集分页，两者的开销都与文件总数无关。
+
+    storage_totals 中没有记录表示索引尚未建立（例如刚升级的部署），此时写入只更新文件行，
+    由 ensure_built 扫描一次磁盘建立完整索引。
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None, batch_size: int = 1000):
+        # 数据库依赖在构造时才导入
+        from models.models import StoredFile, StorageTotals
+        if session_factory is None:
+            from core.database import SessionLocal
+            session_factory = SessionLocal
+        self.File = StoredFile
+        self.Totals = StorageTotals
+        self.session_factory = session_factory
+        # 重建索引时每批插入的行数
+        self.batch_size = batch_size
+
+    def is_built(self) -> bool:
+        session = self.session_factory()
+        try:
+            return session.get(self.Totals, _TOTALS_ID) is not None
+        finally:
+            session.close()
+
+    def ensure_built(self, scan: Callable[[], Iterable[Tuple[str, Optional[str]]]]) -> bool:
+        """索引尚未建立时按 scan 返回的 (路径, 内容哈希) 重建，返回是否进行了重建"""
+        if self.is_built():
+            return False
+        self.rebuild(scan())
+        return True
+
+    def rebuild(self, files: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """清空索引并按给定文件重新建立（用于首次建立或与磁盘对账），返回文件数"""
+        session = self.session_factory()
+        try:
+            session.query(self.File).delete(synchronize_session=False)
+            session.query(self.Totals).delete(synchronize_session=False)
+            total_size = count = 0
+            batch: List[Dict[str, Any]] = []
+            for path, content_hash in files:
+                try:
+                    row = file_record(path, content_hash)
+                except FileNotFoundError:
+                    continue
+                batch.append(row)
+                total_size += row['size']
+                count += 1
+                if len(batch) >= self.batch_size:
+                    session.bulk_insert_mappings(self.File, batch)
+                    batch = []
+            if batch:
+                session.bulk_insert_mappings(self.File, batch)
+            session.add(self.Totals(id=_TOTALS_ID, total_size=total_size, file_count=count))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        logger.info(f"重建文件索引: {count} 个文件，共 {total_size} 字节")
+        return count
+
+    def record(self, path: str, content_hash: Optional[str] = None) -> None:
+        """
+        保存文件后调用：新增或更新文件行（重复上传只刷新修改时间）
+
+        新行用 INSERT ... ON CONFLICT DO NOTHING 插入，相同内容的并发上传同时写入同一路径时，
+        只有真正插入的一方计入总量，另一方按已有行更新。
+        """
+        row = file_record(path, content_hash)
+        session = self.session_factory()
+        try:
+            if self._insert_new(session, row):
+                self._adjust_totals(session, row['size'], 1)
+            else:
+                existing = session.query(self.File).filter(self.File.path == row['path']).first()
+                self._adjust_totals(session, row['size'] - existing.size, 0)
+                for key, value in row.items():
+                    setattr(existing, key, value)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _insert_new(self, session, row: Dict[str, Any]) -> bool:
+        """插入文件行，路径已存在时不插入，返回是否插入"""
+        dialect = session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # 其他数据库没有 ON CONFLICT，先查询再插入
+            if session.query(self.File.id).filter(self.File.path == row['path']).first() is not None:
+                return False
+            session.add(self.File(**row))
+            session.flush()
+            return True
+        statement = insert(self.File).values(**row).on_conflict_do_nothing(index_elements=['path'])
+        return session.execute(statement).rowcount > 0
+
+    def remove(self, path: str) -> bool:
+        """删除文件后调用，返回索引中是否有该文件"""
+        session = self.session_factory()
+        try:
+            existing = session.query(self.File).filter(self.File.path == os.path.normpath(path)).first()
+            if existing is None:
+                return False
+            self._adjust_totals(session, -existing.size, -1)
+            session.delete(existing)
+            session.commit()
+            return True
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def remove_many(self, paths: List[str]) -> int:
+        """批量删除文件行（清理任务每批一个事务），返回索引中实际存在的文件数"""
+        from sqlalchemy import func
+        paths = [os.path.normpath(path) for path in paths]
+        if not paths:
+            return 0
+        session = self.session_factory()
+        try:
+            matched = self.File.path.in_(paths)
+            count, total_size = session.query(func.count(self.File.id), func.sum(self.File.size)).filter(matched).one()
+            if count:
+                self._adjust_totals(session, -(total_size or 0), -count)
+                session.query(self.File).filter(matched).delete(synchronize_session=False)
+            session.commit()
+            return count
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def move(self, source: str, target: str) -> None:
+        """移动文件后调用：更新路径和文件名"""
+        session = self.session_factory()
+        try:
+            existing = session.query(self.File).filter(self.File.path == os.path.normpath(source)).first()
+            if existing is None:
+                session.add(self.File(**file_record(target)))
+                self._adjust_totals(session, os.path.getsize(target), 1)
+            else:
+                existing.path = os.path.normpath(target)
+                existing.name = Path(target).name
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def totals(self) -> Tuple[int, int]:
+        """(总字节数, 文件数)"""
+        session = self.session_factory()
+        try:
+            totals = session.get(self.Totals, _TOTALS_ID)
+            return (totals.total_size, totals.file_count) if totals is not None else (0, 0)
+        finally:
+            session.close()
+
+    def page(self, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Tuple[List[Any], Optional[str]]:
+        """
+        按修改时间从新到旧取一页文件，返回 (文件行, 下一页游标)
+
+        给定游标时从游标之后继续（键集分页，走 (modified_at, id) 索引）；
+        不带游标时可以用 offset 兼容按页码访问（已弃用：OFFSET 需要跳过前面所有行）。
+        """
+        from sqlalchemy import and_, or_
+        session = self.session_factory()
+        try:
+            query = session.query(self.File)
+            if cursor:
+                modified_at, file_id = decode_cursor(cursor)
+                query = query.filter(or_(
+                    self.File.modified_at < modified_at,
+                    and_(self.File.modified_at == modified_at, self.File.id < file_id)
+                ))
+            query = query.order_by(self.File.modified_at.desc(), self.File.id.desc())
+            if not cursor and offset:
+                query = query.offset(offset)
+            rows = query.limit(limit + 1).all()
+        finally:
+            session.close()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].modified_at, rows[-1].id)
+
+    def modified_before(self, cutoff: datetime) -> List[str]:
+        """修改时间早于 cutoff 的文件路径"""
+        session = self.session_factory()
+        try:
+            return [path for path, in session.query(self.File.path).filter(self.File.modified_at < cutoff)]
+        finally:
+            session.close()
+
+    def _adjust_totals(self, session, size_delta: int, count_delta: int) -> None:
+        # 原子增量更新；索引尚未建立时没有总量行，更新不生效，由重建统一计算
+        if size_delta or count_delta:
+            session.query(self.Totals).filter(self.Totals.id == _TOTALS_ID).update({
+                self.Totals.total_size: self.Totals.total_size + size_delta,
+                self.Totals.file_count: self.Totals.file_count + count_delta
+            }, synchronize_session=False)
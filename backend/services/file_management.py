@@ -1,9 +1,20 @@
 import os
 import shutil
-from typing import List, Dict, Any
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import HTTPException
+from .blob_store import BlobStore
+from .file_index import FileIndex
+
+logger = logging.getLogger(__name__)
 
 class FileManagementService:
     def __init__(self):
@@ -11,16 +22,49 @@ class FileManagementService:
         self.upload_dir.mkdir(exist_ok=True)
         self.max_storage_size = 1024 * 1024 * 1024  # 1GB
         self.allowed_extensions = {'.pdf'}
+        # 上传文件按内容哈希存放在 uploads/blobs 的分片目录中，旧版本的上传仍在 uploads 根目录
+        self.blob_store = BlobStore(self.upload_dir / "blobs")
+        # 文件元数据索引，首次使用时才连接数据库
+        self._file_index: Optional[FileIndex] = None
+        self._file_index_lock = threading.Lock()
+
+        # 文件系统和数据库调用都是阻塞的，放到线程池中执行，不占用事件循环
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+        # 后台清理：每批处理的文件数，以及保留的最近任务数
+        self.cleanup_batch_size = 200
+        self.max_cleanup_jobs = 20
+        self._cleanup_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._scheduler_task: Optional[asyncio.Task] = None
+
+    @property
+    def file_index(self) -> FileIndex:
+        """文件元数据索引；索引尚未建立时扫描一次磁盘建立"""
+        with self._file_index_lock:
+            if self._file_index is None:
+                file_index = FileIndex()
+                file_index.ensure_built(self._scan_files)
+                self._file_index = file_index
+            return self._file_index
+
+    def _scan_files(self):
+        """遍历所有上传文件：根目录下的旧文件和内容寻址存储中的文件，返回 (路径, 内容哈希)"""
+        for file_path in self.upload_dir.glob('*.pdf'):
+            if file_path.is_file():
+                yield str(file_path), None
+        for entry in self.blob_store.iter_files():
+            yield entry.path, Path(entry.path).stem
+
+    async def _run_blocking(self, func, *args):
+        """在线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
 
     async def get_storage_info(self) -> Dict[str, Any]:
-        """获取存储信息"""
+        """获取存储信息（读取索引中的运行总量）"""
         try:
-            total_size = 0
-            file_count = 0
-            for file_path in self.upload_dir.glob('**/*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-                    file_count += 1
+            total_size, file_count = await self._run_blocking(lambda: self.file_index.totals())
 
             return {
                 "total_size": total_size,
@@ -34,59 +78,56 @@ class FileManagementService:
                 detail=f"获取存储信息失败: {str(e)}"
             )
 
-    async def list_files(self, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
-        """列出文件"""
+    async def list_files(self, page_size: int = 20, cursor: Optional[str] = None,
+                         page: Optional[int] = None) -> Dict[str, Any]:
+        """
+        列出文件，按修改时间从新到旧
+
+        默认按游标翻页：不带游标返回第一页，之后传入上一页返回的 next_cursor 继续，
+        开销与翻到第几页无关。page 已弃用，只为兼容旧客户端保留：按页码访问需要
+        OFFSET 跳过前面所有行，开销随页码线性增长；给定 cursor 时忽略 page。
+        """
         try:
-            files = []
-            for file_path in self.upload_dir.glob('*.pdf'):
-                if file_path.is_file():
-                    stat = file_path.stat()
-                    files.append({
-                        "name": file_path.name,
-                        "size": stat.st_size,
-                        "created_at": datetime.fromtimestamp(stat.st_ctime),
-                        "modified_at": datetime.fromtimestamp(stat.st_mtime),
-                        "path": str(file_path)
-                    })
-
-            # 按修改时间排序
-            files.sort(key=lambda x: x["modified_at"], reverse=True)
-
-            # 分页
-            start = (page - 1) * page_size
-            end = start + page_size
-            paginated_files = files[start:end]
+            rows, next_cursor, total = await self._run_blocking(self._list_files_sync, page_size, cursor, page)
 
             return {
-                "files": paginated_files,
-                "total": len(files),
+                "files": [
+                    {
+                        "name": row.name,
+                        "size": row.size,
+                        "created_at": row.created_at,
+                        "modified_at": row.modified_at,
+                        "path": row.path,
+                        "content_hash": row.content_hash
+                    }
+                    for row in rows
+                ],
+                "total": total,
                 "page": page,
-                "page_size": page_size
+                "page_size": page_size,
+                "next_cursor": next_cursor
             }
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"列出文件失败: {str(e)}"
             )
 
+    def _list_files_sync(self, page_size: int, cursor: Optional[str], page: Optional[int]):
+        offset = (page - 1) * page_size if page and not cursor else 0
+        rows, next_cursor = self.file_index.page(page_size, cursor=cursor, offset=offset)
+        _, total = self.file_index.totals()
+        return rows, next_cursor, total
+
     async def delete_file(self, file_path: str) -> bool:
         """删除文件"""
         try:
-            path = Path(file_path)
-            if not path.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail="文件不存在"
-                )
-
-            if path.suffix.lower() not in self.allowed_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail="不支持的文件类型"
-                )
-
-            os.remove(path)
-            return True
+            return await self._run_blocking(self._delete_file_sync, file_path)
         except HTTPException:
             raise
         except Exception as e:
@@ -95,26 +136,34 @@ class FileManagementService:
                 detail=f"删除文件失败: {str(e)}"
             )
 
+    def _delete_file_sync(self, file_path: str) -> bool:
+        path = self._resolve_upload_path(file_path)
+        file_path = str(path)
+        if not path.exists():
+            raise HTTPException(
+                status_code=404,
+                detail="文件不存在"
+            )
+
+        # 文件可能被论文记录引用（内容寻址的文件还可能被多篇论文共享），仍有引用时不能删除
+        references = self._reference_count(file_path)
+        if references > 0:
+            raise HTTPException(
+                status_code=409,
+                detail=f"文件仍被 {references} 篇论文引用"
+            )
+        file_index = self.file_index
+        if self.blob_store.contains(file_path):
+            self.blob_store.delete(file_path)
+        else:
+            os.remove(path)
+        file_index.remove(file_path)
+        return True
+
     async def move_file(self, source_path: str, target_path: str) -> bool:
         """移动文件"""
         try:
-            source = Path(source_path)
-            target = Path(target_path)
-
-            if not source.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail="源文件不存在"
-                )
-
-            if target.exists():
-                raise HTTPException(
-                    status_code=400,
-                    detail="目标文件已存在"
-                )
-
-            shutil.move(source, target)
-            return True
+            return await self._run_blocking(self._move_file_sync, source_path, target_path)
         except HTTPException:
             raise
         except Exception as e:
@@ -123,20 +172,243 @@ class FileManagementService:
                 detail=f"移动文件失败: {str(e)}"
             )
 
-    async def cleanup_old_files(self, days: int = 30) -> int:
-        """清理旧文件"""
-        try:
-            count = 0
-            current_time = datetime.now()
-            for file_path in self.upload_dir.glob('*.pdf'):
-                if file_path.is_file():
-                    file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if (current_time - file_time).days > days:
-                        os.remove(file_path)
-                        count += 1
-            return count
-        except Exception as e:
+    def _move_file_sync(self, source_path: str, target_path: str) -> bool:
+        source = self._resolve_upload_path(source_path)
+        target = self._resolve_upload_path(target_path)
+        source_path, target_path = str(source), str(target)
+
+        if not source.exists():
+            raise HTTPException(
+                status_code=404,
+                detail="源文件不存在"
+            )
+
+        if self._in_blob_store(source) or self._in_blob_store(target):
+            raise HTTPException(
+                status_code=400,
+                detail="内容寻址存储中的文件不能移动"
+            )
+
+        if target.exists():
+            raise HTTPException(
+                status_code=400,
+                detail="目标文件已存在"
+            )
+
+        # 论文记录按路径引用文件，移动后记录会指向不存在的文件
+        references = self._reference_count(source_path)
+        if references > 0:
+            raise HTTPException(
+                status_code=409,
+                detail=f"文件仍被 {references} 篇论文引用"
+            )
+
+        # 先确保索引已建立，否则首次建立时的扫描会把移动后的文件再算一次
+        file_index = self.file_index
+        shutil.move(source, target)
+        file_index.move(source_path, target_path)
+        return True
+
+    def _resolve_upload_path(self, file_path: str) -> Path:
+        """
+        校验客户端传入的路径，返回以 upload_dir 开头的规范路径（与索引中的路径一致）
+
+        解析 ..、符号链接和绝对路径后必须位于上传目录内，且是 PDF 文件，否则返回 400。
+        """
+        upload_root = self.upload_dir.resolve()
+        resolved = Path(file_path).resolve()
+        if not resolved.is_relative_to(upload_root) or resolved == upload_root:
+            raise HTTPException(
+                status_code=400,
+                detail="只能操作上传目录中的文件"
+            )
+        if resolved.suffix.lower() not in self.allowed_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail="不支持的文件类型"
+            )
+        return self.upload_dir / resolved.relative_to(upload_root)
+
+    def _in_blob_store(self, path: Path) -> bool:
+        return path.resolve().is_relative_to(self.blob_store.root.resolve())
+
+    def _reference_count(self, file_path: str) -> int:
+        """指向该文件的论文记录数"""
+        if self.blob_store.contains(file_path):
+            return self.blob_store.reference_count(file_path)
+        return 0 if self._unreferenced_legacy([file_path]) else 1
+
+    def _unreferenced_legacy(self, paths: List[str]) -> List[str]:
+        """
+        筛选出没有论文记录引用的旧文件（一次批量查询）
+
+        旧版本上传把 "uploads/<文件名>" 这样的路径直接写入 Paper.pdf_url，
+        按原样、规范化和绝对路径三种写法匹配。
+        """
+        candidates = {
+            path: {path, os.path.normpath(path), os.path.abspath(path)}
+            for path in paths
+        }
+        counts = self.blob_store.reference_counts(
+            [candidate for forms in candidates.values() for candidate in forms]
+        )
+        return [
+            path for path in paths
+            if not any(counts.get(candidate, 0) for candidate in candidates[path])
+        ]
+
+    async def cleanup_old_files(self, days: int = 30, dry_run: bool = False) -> int:
+        """清理旧文件并等待完成，返回删除（dry_run 时为将会删除）的文件数"""
+        job = await self.start_cleanup(days, dry_run)
+        if self._cleanup_task is not None:
+            await asyncio.shield(self._cleanup_task)
+        job = self.get_cleanup_job(job["id"])
+        if job["status"] == "failed":
             raise HTTPException(
                 status_code=500,
-                detail=f"清理文件失败: {str(e)}"
-            ) 
\ No newline at end of file
+                detail=f"清理文件失败: {job['error']}"
+            )
+        return job["deleted"]
+
+    async def start_cleanup(self, days: int = 30, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        启动后台清理任务并立即返回任务状态
+
+        过期文件从索引中按修改时间查出，分批在线程池中删除，批与批之间让出事件循环，
+        进度可通过 get_cleanup_job 查询。根目录下的旧文件和内容寻址存储中的文件都只清理
+        没有论文记录引用的（内容寻址的文件重复上传会刷新修改时间）。dry_run 只统计将会删除的文件。
+        同一时间只运行一个清理任务：参数相同的任务在运行时返回该任务，参数不同时返回 409。
+        """
+        if self.cleanup_running():
+            job = self._running_job()
+            if job["days"] != days or job["dry_run"] != dry_run:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"已有清理任务在运行（days={job['days']}, dry_run={job['dry_run']}），请等待其完成"
+                )
+            return job
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "pending",
+            "days": days,
+            "dry_run": dry_run,
+            "total": 0,
+            "processed": 0,
+            "deleted": 0,
+            "freed_bytes": 0,
+            "candidates": [],
+            "error": None,
+            "started_at": datetime.now(),
+            "finished_at": None
+        }
+        self._cleanup_jobs[job["id"]] = job
+        while len(self._cleanup_jobs) > self.max_cleanup_jobs:
+            self._cleanup_jobs.popitem(last=False)
+        self._cleanup_task = asyncio.create_task(self._run_cleanup(job))
+        return dict(job)
+
+    def get_cleanup_job(self, job_id: str) -> Dict[str, Any]:
+        """查询清理任务的进度"""
+        job = self._cleanup_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=404,
+                detail="清理任务不存在"
+            )
+        return dict(job)
+
+    def cleanup_running(self) -> bool:
+        return self._cleanup_task is not None and not self._cleanup_task.done()
+
+    def _running_job(self) -> Dict[str, Any]:
+        for job in reversed(self._cleanup_jobs.values()):
+            if job["status"] in ("pending", "running"):
+                return dict(job)
+        return dict(next(reversed(self._cleanup_jobs.values())))
+
+    async def _run_cleanup(self, job: Dict[str, Any]) -> None:
+        job["status"] = "running"
+        try:
+            cutoff = datetime.now() - timedelta(days=job["days"] + 1)
+            candidates = await self._run_blocking(lambda: self.file_index.modified_before(cutoff))
+            job["total"] = len(candidates)
+
+            for start in range(0, len(candidates), self.cleanup_batch_size):
+                batch = candidates[start:start + self.cleanup_batch_size]
+                deleted, freed_bytes = await self._run_blocking(self._cleanup_batch, batch, job["dry_run"])
+                job["processed"] += len(batch)
+                job["deleted"] += len(deleted)
+                job["freed_bytes"] += freed_bytes
+                if job["dry_run"]:
+                    job["candidates"].extend(deleted)
+
+            job["status"] = "completed"
+            logger.info(
+                f"清理任务 {job['id']} 完成: {'将删除' if job['dry_run'] else '删除'} "
+                f"{job['deleted']}/{job['total']} 个文件，{job['freed_bytes']} 字节"
+            )
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"清理任务 {job['id']} 失败: {str(e)}")
+        finally:
+            job["finished_at"] = datetime.now()
+
+    def _cleanup_batch(self, paths: List[str], dry_run: bool) -> Tuple[List[str], int]:
+        """处理一批过期文件（在线程池中执行），返回 (删除的文件, 释放的字节数)"""
+        legacy, blobs, missing = [], [], []
+        for file_path in paths:
+            if not os.path.exists(file_path):
+                missing.append(file_path)
+            elif self.blob_store.contains(file_path):
+                if self.blob_store.past_grace(file_path):
+                    blobs.append(file_path)
+            else:
+                legacy.append(file_path)
+        # 旧文件和内容寻址的文件都只清理没有论文记录引用的
+        removable = self._unreferenced_legacy(legacy) + self.blob_store.unreferenced(blobs)
+
+        deleted, freed_bytes = [], 0
+        for file_path in removable:
+            try:
+                size = os.path.getsize(file_path)
+                if not dry_run:
+                    if self.blob_store.contains(file_path):
+                        if not self.blob_store.delete(file_path):
+                            continue
+                    else:
+                        os.remove(file_path)
+            except FileNotFoundError:
+                missing.append(file_path)
+                continue
+            deleted.append(file_path)
+            freed_bytes += size
+
+        if not dry_run:
+            self.file_index.remove_many(deleted + missing)
+        return deleted, freed_bytes
+
+    def start_cleanup_scheduler(self, interval_seconds: float, days: int = 30) -> None:
+        """在当前事件循环中定期启动清理任务（应用启动时调用）"""
+        if self._scheduler_task is not None and not self._scheduler_task.done():
+            return
+
+        async def schedule():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                if self.cleanup_running():
+                    logger.info("已有清理任务在运行，跳过本次定时清理")
+                    continue
+                try:
+                    await self.cleanup_old_files(days)
+                except Exception as e:
+                    logger.error(f"定时清理失败: {str(e)}")
+
+        self._scheduler_task = asyncio.create_task(schedule())
+
+    def stop_cleanup_scheduler(self) -> None:
+        """停止定时清理（正在运行的清理任务会继续执行完）"""
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
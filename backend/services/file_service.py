@@ -1,51 +1,88 @@
+from __future__ import annotations
 import os
-import shutil
-from typing import Dict, Any, Optional, List, Tuple
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, AsyncIterator, BinaryIO, Callable, Tuple
 from fastapi import UploadFile, HTTPException
-import PyPDF2
 from pathlib import Path
-import re
-from datetime import datetime
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-import spacy
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import logging
-from functools import lru_cache
+import multiprocessing
 import time
+from core.config import settings
+from .blob_store import BlobStore
+from .extraction_cache import ExtractionCache, file_sha256
+from .file_index import FileIndex
+from .pdf_extraction import (
+    PdfInfoExtractor, init_extraction_worker, extract_in_worker, extract_many_in_worker,
+    extract_sections, extract_sections_sharded, page_count
+)
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _write_chunk(buffer: BinaryIO, digest: Any, chunk: bytes) -> None:
+    """写入一块上传内容并更新哈希（在线程池中执行）"""
+    digest.update(chunk)
+    buffer.write(chunk)
+
+
 class FileService:
+    # 提取逻辑变化时提升版本号，旧的缓存结果随之失效
+    EXTRACTOR_VERSION = "5"
+    # 全文章节切分结果的缓存版本，与提取器版本分开计数
+    SECTIONS_VERSION = "sections-2"
+    
     def __init__(self):
         self.upload_dir = Path("uploads")
         self.upload_dir.mkdir(exist_ok=True)
         self.max_file_size = 10 * 1024 * 1024  # 10MB
         self.allowed_extensions = {'.pdf'}
         self.executor = ThreadPoolExecutor(max_workers=4)
+        # 上传的磁盘写入单独使用一个线程池，不会排在解析任务后面
+        self.io_executor = ThreadPoolExecutor(max_workers=4)
+        
+        # 按内容寻址的分片存储：相同内容的上传只保存一份
+        self.blob_store = BlobStore(self.upload_dir / "blobs")
+        # 文件元数据索引（供文件列表和存储统计使用），首次保存文件时才连接数据库
+        self._file_index: Optional[FileIndex] = None
+        self._file_index_lock = threading.Lock()
+        
+        # PDF文本提取后端，按部署配置选择；缓存版本包含后端名称，切换后端不会复用旧结果
+        self.pdf_backend = settings.PDF_TEXT_BACKEND
+        self.info_cache_version = f"{self.EXTRACTOR_VERSION}:{self.pdf_backend}"
+        self.sections_cache_version = f"{self.SECTIONS_VERSION}:{self.pdf_backend}"
+        
+        # 进程池提取：每个工作进程加载一次 spaCy 模型，小文件仍在线程池中解析
+        self.extraction_workers = os.cpu_count() or 1
+        self.process_pool_min_bytes = 256 * 1024
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        
+        # 长文档按页分片并行提取：页数达到阈值时才分片，每片至少 min_pages_per_shard 页
+        self.page_shard_threshold = 40
+        self.min_pages_per_shard = 10
+        
+        # 批量上传时同时保存的文件数上限（解析并发由线程池大小限制）
+        self.max_concurrent_files = 8
+        # 批量上传时一次送去解析的文件数上限，以及拆分到多个解析进程时每块至少的文件数
+        self.extraction_batch_size = 32
+        self.min_files_per_chunk = 4
+        
+        # 按文件内容哈希缓存提取结果，跨进程和重启共享
+        self.extraction_cache = ExtractionCache()
+        
+        # 上传时顺带计算的内容哈希（文件路径 -> SHA-256），提取时无需再次读取文件
+        self._content_hashes: "OrderedDict[str, str]" = OrderedDict()
+        self._content_hashes_lock = threading.Lock()
+        self.max_remembered_hashes = 1024
         
         try:
-            # 下载必要的NLTK数据
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            nltk.download('wordnet', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-            
-            # 加载spaCy模型
-            self.nlp = spacy.load("en_core_web_sm")
-            
-            # 初始化TF-IDF向量化器
-            self.vectorizer = TfidfVectorizer(
-                max_features=100,
-                stop_words='english',
-                ngram_range=(1, 3)
-            )
+            # 主进程中的提取器，用于在线程池中解析小文件
+            self.extractor = PdfInfoExtractor(backend=self.pdf_backend)
         except Exception as e:
             logger.error(f"初始化失败: {str(e)}")
             raise HTTPException(
@@ -54,21 +91,15 @@ class FileService:
             )
 
     async def save_upload_file(self, file: UploadFile) -> str:
-        """保存上传的文件"""
+        """
+        保存上传的文件，返回其在内容寻址存储中的路径
+        
+        先校验扩展名和PDF文件头，再单次流式写入存储的临时文件，同时计算哈希和大小，
+        超出大小限制立即中止，内存中只保留当前的一块。内容已存在时删除临时文件并返回已有路径；
+        否则原子重命名到哈希前缀分片目录。磁盘写入和查重都在 I/O 线程池中执行，不阻塞事件循环。
+        """
         start_time = time.time()
         try:
-            # 验证文件大小
-            file_size = 0
-            chunk_size = 8192
-            while chunk := await file.read(chunk_size):
-                file_size += len(chunk)
-                if file_size > self.max_file_size:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"文件大小超过限制（{self.max_file_size/1024/1024}MB）"
-                    )
-            await file.seek(0)
-
             # 验证文件扩展名
             file_ext = Path(file.filename).suffix.lower()
             if file_ext not in self.allowed_extensions:
@@ -76,18 +107,51 @@ class FileService:
                     status_code=400,
                     detail=f"不支持的文件类型，仅支持PDF文件"
                 )
-
-            # 生成唯一文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_filename = f"{timestamp}_{file.filename}"
-            file_path = self.upload_dir / safe_filename
-
-            # 保存文件
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            logger.info(f"文件保存成功: {file_path}, 耗时: {time.time() - start_time:.2f}秒")
-            return str(file_path)
+            
+            # 验证PDF文件头（规范允许文件头前有少量前导字节）
+            chunk_size = 64 * 1024
+            chunk = await file.read(chunk_size)
+            if b"%PDF-" not in chunk[:1024]:
+                raise HTTPException(
+                    status_code=400,
+                    detail="文件内容不是有效的PDF"
+                )
+            
+            # 流式写入临时文件，同时计算哈希和大小
+            loop = asyncio.get_running_loop()
+            digest = hashlib.sha256()
+            file_size = 0
+            buffer = await loop.run_in_executor(self.io_executor, self.blob_store.create_temp)
+            try:
+                while chunk:
+                    file_size += len(chunk)
+                    if file_size > self.max_file_size:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"文件大小超过限制（{self.max_file_size/1024/1024}MB）"
+                        )
+                    await loop.run_in_executor(self.io_executor, _write_chunk, buffer, digest, chunk)
+                    chunk = await file.read(chunk_size)
+                await loop.run_in_executor(self.io_executor, buffer.close)
+                
+                content_hash = digest.hexdigest()
+                file_path, created = await loop.run_in_executor(
+                    self.io_executor, self.blob_store.commit, buffer.name, content_hash
+                )
+            except BaseException:
+                # 校验失败、写入出错或请求被取消时删除临时文件
+                buffer.close()
+                self.blob_store.discard(buffer.name)
+                raise
+            
+            self._remember_content_hash(file_path, content_hash)
+            await loop.run_in_executor(self.io_executor, self._record_in_index, file_path, content_hash)
+            
+            if created:
+                logger.info(f"文件保存成功: {file_path}, 大小: {file_size}字节, 耗时: {time.time() - start_time:.2f}秒")
+            else:
+                logger.info(f"文件内容已存在，复用: {file_path}, 耗时: {time.time() - start_time:.2f}秒")
+            return file_path
         except HTTPException:
             raise
         except Exception as e:
@@ -97,19 +161,84 @@ class FileService:
                 detail=f"文件保存失败: {str(e)}"
             )
 
+    def _record_in_index(self, file_path: str, content_hash: str) -> None:
+        """把保存的文件写入元数据索引（在 I/O 线程池中执行）；索引写入失败不影响上传，之后重建索引时会对账"""
+        try:
+            with self._file_index_lock:
+                if self._file_index is None:
+                    self._file_index = FileIndex()
+            self._file_index.record(file_path, content_hash)
+        except Exception as e:
+            logger.warning(f"文件索引更新失败: {file_path}, {str(e)}")
+
+    def release_upload(self, file_path: str) -> bool:
+        """
+        论文记录删除（并提交）后调用：没有其他论文引用同一文件时删除文件并更新元数据索引
+        
+        仍在宽限期内的文件留给之后的清理任务处理；返回是否删除了文件。
+        """
+        if not self.blob_store.release(file_path):
+            return False
+        try:
+            with self._file_index_lock:
+                if self._file_index is None:
+                    self._file_index = FileIndex()
+            self._file_index.remove(file_path)
+        except Exception as e:
+            logger.warning(f"文件索引更新失败: {file_path}, {str(e)}")
+        return True
+
+    def _remember_content_hash(self, file_path: str, content_hash: str) -> None:
+        """记录上传时计算的内容哈希（只保留最近的若干条）"""
+        with self._content_hashes_lock:
+            self._content_hashes[file_path] = content_hash
+            self._content_hashes.move_to_end(file_path)
+            while len(self._content_hashes) > self.max_remembered_hashes:
+                self._content_hashes.popitem(last=False)
+
+    def get_content_hash(self, file_path: str) -> str:
+        """获取文件内容的 SHA-256：内容寻址存储中的文件直接取文件名，其次使用上传时计算的结果"""
+        content_hash = self.blob_store.hash_of(file_path)
+        if content_hash is not None:
+            return content_hash
+        with self._content_hashes_lock:
+            content_hash = self._content_hashes.get(file_path)
+        return content_hash or file_sha256(file_path)
+
     async def extract_pdf_info(self, file_path: str) -> Dict[str, Any]:
-        """从PDF文件中提取信息"""
+        """
+        从PDF文件中提取信息
+        
+        先按内容哈希查询提取缓存；未命中时小文件在线程池中解析，
+        大文件交给进程池，解析不受 GIL 限制，可以占满所有CPU核心。
+        """
         start_time = time.time()
         try:
-            # 使用线程池执行PDF解析
             loop = asyncio.get_event_loop()
+            content_hash = await loop.run_in_executor(self.executor, self.get_content_hash, file_path)
             result = await loop.run_in_executor(
                 self.executor,
-                self._extract_pdf_info_sync,
-                file_path
+                self.extraction_cache.get,
+                content_hash,
+                self.info_cache_version
             )
+            
+            if result is None:
+                executor, extract = self._select_extraction_backend(file_path)
+                result = await loop.run_in_executor(executor, extract, file_path)
+                await loop.run_in_executor(
+                    self.executor,
+                    self.extraction_cache.put,
+                    content_hash,
+                    self.info_cache_version,
+                    result
+                )
+            else:
+                logger.info(f"命中PDF提取缓存: {file_path}")
+            
             logger.info(f"PDF解析成功: {file_path}, 耗时: {time.time() - start_time:.2f}秒")
-            return result
+            # 同一内容可能保存在不同路径下，路径以本次请求为准
+            return {**result, "file_path": file_path}
         except Exception as e:
             logger.error(f"PDF解析失败: {str(e)}")
             raise HTTPException(
@@ -117,202 +246,168 @@ class FileService:
                 detail=f"PDF解析失败: {str(e)}"
             )
 
-    @lru_cache(maxsize=100)
-    def _extract_pdf_info_sync(self, file_path: str) -> Dict[str, Any]:
-        """同步执行PDF解析（使用缓存）"""
-        try:
-            with open(file_path, 'rb') as file:
-                # 创建PDF阅读器对象
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # 获取页数
-                num_pages = len(pdf_reader.pages)
-                
-                # 提取前两页文本
-                text = ""
-                for i in range(min(2, num_pages)):
-                    text += pdf_reader.pages[i].extract_text() + "\n"
-                
-                # 使用spaCy进行文本分析
-                doc = self.nlp(text)
-                
-                # 提取标题和摘要
-                title, abstract = self._extract_title_and_abstract(doc)
-                
-                # 提取作者信息
-                authors = self._extract_authors(doc)
-                
-                # 提取会议/期刊信息
-                conference = self._extract_conference(doc)
-                
-                # 提取年份
-                year = self._extract_year(doc)
-                
-                # 提取关键词
-                keywords = self._extract_keywords(doc)
-                
-                return {
-                    "title": title,
-                    "abstract": abstract,
-                    "authors": authors,
-                    "conference": conference,
-                    "year": year,
-                    "keywords": keywords,
-                    "num_pages": num_pages,
-                    "file_path": file_path
-                }
-        except Exception as e:
-            logger.error(f"PDF解析失败: {str(e)}")
-            raise
-
-    def _extract_title_and_abstract(self, doc: spacy.tokens.Doc) -> Tuple[str, str]:
-        """提取标题和摘要"""
+    async def extract_pdf_info_many(self, file_paths: List[str]) -> List[Any]:
+        """
+        批量提取多个PDF的信息，结果顺序与输入一致
+        
+        先按内容哈希查询缓存，未命中的文件分成若干块调用 extract_many（块数不超过解析进程数，
+        总大小达到阈值的块交给进程池）。某一块解析失败时退回逐个文件解析，
+        失败文件对应位置为 HTTPException 而不是结果。
+        """
+        loop = asyncio.get_event_loop()
+        results: List[Any] = [None] * len(file_paths)
+        hashes = await loop.run_in_executor(self.executor, self._cached_infos, file_paths, results)
+        
+        misses = [i for i, result in enumerate(results) if result is None]
+        num_chunks = max(1, min(self.extraction_workers, len(misses) // self.min_files_per_chunk))
+        chunks = [misses[i::num_chunks] for i in range(num_chunks)] if misses else []
+        
+        async def extract_chunk(chunk: List[int]) -> None:
+            paths = [file_paths[i] for i in chunk]
+            try:
+                executor, extract_many = self._select_batch_backend(paths)
+                infos = await loop.run_in_executor(executor, extract_many, paths)
+            except Exception as e:
+                # 整块失败时逐个解析，只有出错的文件返回错误
+                logger.warning(f"批量解析失败，改为逐个解析: {str(e)}")
+                for i, result in zip(chunk, await asyncio.gather(
+                    *(self.extract_pdf_info(file_paths[i]) for i in chunk), return_exceptions=True
+                )):
+                    results[i] = result
+                return
+            for i, info in zip(chunk, infos):
+                await loop.run_in_executor(
+                    self.executor,
+                    self.extraction_cache.put,
+                    hashes[i],
+                    self.info_cache_version,
+                    info
+                )
+                results[i] = {**info, "file_path": file_paths[i]}
+        
+        await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks))
+        return results
+    
+    def _cached_infos(self, file_paths: List[str], results: List[Any]) -> List[str]:
+        """查询提取缓存（在线程池中执行），命中的结果写入 results，返回各文件的内容哈希"""
+        hashes = []
+        for i, file_path in enumerate(file_paths):
+            content_hash = self.get_content_hash(file_path)
+            hashes.append(content_hash)
+            cached = self.extraction_cache.get(content_hash, self.info_cache_version)
+            if cached is not None:
+                logger.info(f"命中PDF提取缓存: {file_path}")
+                results[i] = {**cached, "file_path": file_path}
+        return hashes
+    
+    async def extract_pdf_sections(self, file_path: str) -> Dict[str, str]:
+        """
+        提取PDF全文并按章节切分（引言、方法、实验、局限性、参考文献等）
+        
+        逐页读取，内存占用与单页大小相关而不是整篇论文；结果按内容哈希缓存，
+        之后的分析直接使用缓存的章节文本，无需重新读取PDF。
+        """
+        start_time = time.time()
         try:
-            sentences = list(doc.sents)
-            title = ""
-            abstract = ""
-            in_abstract = False
+            loop = asyncio.get_event_loop()
+            content_hash = await loop.run_in_executor(self.executor, self.get_content_hash, file_path)
+            sections = await loop.run_in_executor(
+                self.executor,
+                self.extraction_cache.get,
+                content_hash,
+                self.sections_cache_version
+            )
             
-            for sent in sentences:
-                text = sent.text.strip()
-                if not text:
-                    continue
-                
-                # 如果还没有找到标题，当前句子就是标题
-                if not title:
-                    title = text
-                    continue
-                
-                # 检查是否进入摘要部分
-                if "abstract" in text.lower():
-                    in_abstract = True
-                    continue
-                
-                # 如果在摘要部分，收集摘要内容
-                if in_abstract:
-                    if len(abstract) > 1000:  # 限制摘要长度
-                        break
-                    abstract += text + " "
+            if sections is None:
+                sections = await loop.run_in_executor(self.executor, self._extract_sections_sync, file_path)
+                await loop.run_in_executor(
+                    self.executor,
+                    self.extraction_cache.put,
+                    content_hash,
+                    self.sections_cache_version,
+                    sections
+                )
             
-            return title, abstract.strip()
+            logger.info(f"PDF章节提取成功: {file_path}, 章节: {list(sections)}, 耗时: {time.time() - start_time:.2f}秒")
+            return sections
         except Exception as e:
-            logger.error(f"提取标题和摘要失败: {str(e)}")
-            return "", ""
+            logger.error(f"PDF章节提取失败: {str(e)}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"PDF章节提取失败: {str(e)}"
+            )
 
-    def _extract_authors(self, doc: spacy.tokens.Doc) -> str:
-        """提取作者信息"""
-        try:
-            authors = []
-            found_title = False
-            
-            for sent in doc.sents:
-                text = sent.text.strip()
-                if not text:
-                    continue
-                
-                if not found_title:
-                    found_title = True
-                    continue
-                
-                if "abstract" in text.lower():
-                    break
-                
-                # 使用spaCy的命名实体识别
-                sent_doc = self.nlp(text)
-                person_entities = [ent.text for ent in sent_doc.ents if ent.label_ == "PERSON"]
-                
-                if person_entities:
-                    authors.extend(person_entities)
-                elif any(keyword in text.lower() for keyword in ['university', 'institute', '@', '.edu']):
-                    authors.append(text)
-            
-            return '; '.join(authors) if authors else ""
-        except Exception as e:
-            logger.error(f"提取作者信息失败: {str(e)}")
-            return ""
+    def load_pdf_sections(self, file_path: str) -> Dict[str, str]:
+        """同步获取章节文本（供同步路由使用），优先读取缓存"""
+        content_hash = self.get_content_hash(file_path)
+        sections = self.extraction_cache.get(content_hash, self.sections_cache_version)
+        if sections is None:
+            sections = self._extract_sections_sync(file_path)
+            self.extraction_cache.put(content_hash, self.sections_cache_version, sections)
+        return sections
 
-    def _extract_conference(self, doc: spacy.tokens.Doc) -> Optional[str]:
-        """提取会议/期刊信息"""
-        try:
-            # 使用spaCy的命名实体识别
-            org_entities = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-            
-            # 常见的会议/期刊名称模式
-            conference_patterns = [
-                r'(ICML|ICLR|NeurIPS|CVPR|ACL|SIGGRAPH|OSDI|MLSys|APLOS)\s*\d{4}',
-                r'(Conference|Workshop|Symposium|Journal)\s+on\s+[A-Za-z\s]+',
-                r'[A-Za-z\s]+(Conference|Workshop|Symposium|Journal)'
-            ]
-            
-            # 首先检查组织实体
-            for org in org_entities:
-                for pattern in conference_patterns:
-                    if re.search(pattern, org, re.IGNORECASE):
-                        return org
-            
-            # 如果没有找到，检查整个文本
-            text = doc.text
-            for pattern in conference_patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    return match.group(0)
-            
-            return None
-        except Exception as e:
-            logger.error(f"提取会议/期刊信息失败: {str(e)}")
-            return None
+    def _extract_sections_sync(self, file_path: str) -> Dict[str, str]:
+        """
+        提取全文章节
+        
+        页数达到 page_shard_threshold 的长文档按页范围分片，各工作进程独立打开文件提取自己的页，
+        结果按页序拼接后再切分章节；其余文件整体交给进程池或在当前线程中提取。
+        """
+        num_pages = page_count(file_path, self.pdf_backend) if self.extraction_workers > 1 else 0
+        num_shards = self._num_page_shards(num_pages)
+        if num_shards > 1:
+            return extract_sections_sharded(file_path, self._get_process_pool(), num_pages, num_shards,
+                                            backend=self.pdf_backend)
+        
+        if self.extraction_workers > 1 and os.path.getsize(file_path) >= self.process_pool_min_bytes:
+            return self._get_process_pool().submit(
+                extract_sections, file_path, backend=self.pdf_backend
+            ).result()
+        return extract_sections(file_path, backend=self.pdf_backend)
 
-    def _extract_year(self, doc: spacy.tokens.Doc) -> Optional[int]:
-        """提取年份信息"""
-        try:
-            # 使用spaCy的命名实体识别
-            date_entities = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
-            
-            # 首先检查日期实体
-            for date in date_entities:
-                year_match = re.search(r'\b(19|20)\d{2}\b', date)
-                if year_match:
-                    return int(year_match.group(0))
-            
-            # 如果没有找到，检查整个文本
-            text = doc.text
-            year_match = re.search(r'\b(19|20)\d{2}\b', text)
-            if year_match:
-                return int(year_match.group(0))
-            
-            return None
-        except Exception as e:
-            logger.error(f"提取年份信息失败: {str(e)}")
-            return None
+    def _num_page_shards(self, num_pages: int) -> int:
+        """根据页数决定分片数"""
+        if num_pages < self.page_shard_threshold:
+            return 1
+        return max(1, min(self.extraction_workers, num_pages // self.min_pages_per_shard))
 
-    def _extract_keywords(self, doc: spacy.tokens.Doc) -> List[str]:
-        """提取关键词"""
-        try:
-            # 获取文本
-            text = doc.text
-            
-            # 分词和词形还原
-            tokens = word_tokenize(text.lower())
-            lemmatizer = WordNetLemmatizer()
-            tokens = [lemmatizer.lemmatize(token) for token in tokens]
-            
-            # 去除停用词
-            stop_words = set(stopwords.words('english'))
-            tokens = [token for token in tokens if token not in stop_words]
-            
-            # 使用TF-IDF提取关键词
-            tfidf_matrix = self.vectorizer.fit_transform([text])
-            feature_names = self.vectorizer.get_feature_names_out()
-            
-            # 获取前10个关键词
-            keywords = []
-            for i in range(min(10, len(feature_names))):
-                keywords.append(feature_names[i])
-            
-            return keywords
-        except Exception as e:
-            logger.error(f"提取关键词失败: {str(e)}")
-            return []
+    def _select_extraction_backend(self, file_path: str) -> Tuple[Executor, Callable[[str], Dict[str, Any]]]:
+        """根据文件大小选择解析后端，返回 (执行器, 解析函数)"""
+        if self.extraction_workers > 1 and os.path.getsize(file_path) >= self.process_pool_min_bytes:
+            return self._get_process_pool(), extract_in_worker
+        return self.executor, self._extract_pdf_info_sync
+    
+    def _select_batch_backend(self, file_paths: List[str]) -> Tuple[Executor, Callable[[List[str]], List[Dict[str, Any]]]]:
+        """按一批文件的总大小选择解析后端，返回 (执行器, 批量解析函数)"""
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        if self.extraction_workers > 1 and total_size >= self.process_pool_min_bytes:
+            return self._get_process_pool(), extract_many_in_worker
+        return self.executor, self.extractor.extract_many
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """首次需要时创建解析进程池"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.extraction_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_extraction_worker,
+                    initargs=(self.pdf_backend,)
+                )
+            return self._process_pool
+    
+    def _extract_pdf_info_sync(self, file_path: str) -> Dict[str, Any]:
+        """在当前进程中同步执行PDF解析"""
+        return self.extractor.extract(file_path)
+    
+    def shutdown(self) -> None:
+        """关闭线程池和解析进程池"""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        self.executor.shutdown()
+        self.io_executor.shutdown()
 
     async def cleanup_file(self, file_path: str):
         """清理临时文件"""
@@ -324,21 +419,97 @@ class FileService:
             logger.error(f"文件清理失败: {str(e)}")
             # 不抛出异常，因为清理失败不影响主要功能
 
-    async def process_multiple_files(self, files: List[UploadFile]) -> List[Dict[str, Any]]:
-        """处理多个文件"""
-        results = []
-        for file in files:
+    async def process_multiple_files(self, files: List[UploadFile],
+                                     max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """处理多个文件，结果顺序与上传顺序一致"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        async for result in self.iter_process_multiple_files(files, max_concurrency):
+            results[result["index"]] = result
+        return results
+
+    async def iter_process_multiple_files(self, files: List[UploadFile],
+                                          max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        并发处理多个文件，按完成顺序逐个返回结果
+        
+        保存文件受信号量限制；已保存的文件攒成批次交给 extract_pdf_info_many，
+        批内文件的开头区域通过 nlp.pipe 成批送入 spaCy。解析时后续文件继续保存，
+        多个批次可以同时解析，解析完成的文件立即返回。单个文件失败只影响该文件的结果。
+        
+        Args:
+            files: 上传的文件列表
+            max_concurrency: 同时保存的文件数上限，默认为 max_concurrent_files
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrent_files)
+        # 同时解析的批次数上限，前一批解析时下一批可以开始
+        batch_slots = asyncio.Semaphore(max(1, self.extraction_workers))
+        saved: asyncio.Queue = asyncio.Queue()
+        done: asyncio.Queue = asyncio.Queue()
+        
+        async def save(index: int, file: UploadFile) -> None:
             try:
-                file_path = await self.save_upload_file(file)
-                pdf_info = await self.extract_pdf_info(file_path)
-                results.append({
-                    "status": "success",
-                    "data": pdf_info
-                })
+                async with semaphore:
+                    file_path = await self.save_upload_file(file)
+                saved.put_nowait((index, file.filename, file_path))
             except Exception as e:
-                logger.error(f"处理文件失败: {str(e)}")
-                results.append({
-                    "status": "error",
-                    "error": str(e)
-                })
-        return results 
\ No newline at end of file
+                done.put_nowait(self._file_result(index, file.filename, error=e))
+                saved.put_nowait(None)
+        
+        async def extract(batch: List[Tuple[int, str, str]]) -> None:
+            try:
+                infos = await self.extract_pdf_info_many([file_path for _, _, file_path in batch])
+            except Exception as e:
+                infos = [e] * len(batch)
+            finally:
+                batch_slots.release()
+            for (index, filename, _), info in zip(batch, infos):
+                if isinstance(info, Exception):
+                    done.put_nowait(self._file_result(index, filename, error=info))
+                else:
+                    done.put_nowait(self._file_result(index, filename, pdf_info=info))
+        
+        async def dispatch() -> None:
+            # 等到有空闲的解析名额时，把已保存的文件（至少一个）作为一批送去解析
+            remaining = len(files)
+            while remaining:
+                await batch_slots.acquire()
+                items = [await saved.get()]
+                while len(items) < self.extraction_batch_size and not saved.empty():
+                    items.append(saved.get_nowait())
+                remaining -= len(items)
+                batch = [item for item in items if item is not None]
+                if batch:
+                    tasks.append(asyncio.ensure_future(extract(batch)))
+                else:
+                    batch_slots.release()
+        
+        tasks = [
+            asyncio.ensure_future(save(index, file))
+            for index, file in enumerate(files)
+        ]
+        tasks.append(asyncio.ensure_future(dispatch()))
+        try:
+            for _ in files:
+                yield await done.get()
+        finally:
+            # 调用方提前停止迭代时取消尚未完成的任务
+            for task in tasks:
+                task.cancel()
+
+    def _file_result(self, index: int, filename: str, pdf_info: Optional[Dict[str, Any]] = None,
+                     error: Optional[Exception] = None) -> Dict[str, Any]:
+        """批量处理中单个文件的结果，异常转换为错误结果"""
+        if error is not None:
+            logger.error(f"处理文件失败（{filename}）: {str(error)}")
+            return {
+                "index": index,
+                "filename": filename,
+                "status": "error",
+                "error": error.detail if isinstance(error, HTTPException) else str(error)
+            }
+        return {
+            "index": index,
+            "filename": filename,
+            "status": "success",
+            "data": pdf_info
+        }
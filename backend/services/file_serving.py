@@ -0,0 +1,179 @@
+from typing import Callable, Iterator, Optional, Tuple
+import asyncio
+import os
+import re
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import quote
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from .blob_store import BlobStore
+from .extraction_cache import file_sha256
+
+# 论文文件的 URL 不随内容变化（pdf_url 可能被更新或重新上传），浏览器可以缓存，但每次使用前用 ETag 重新验证
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# 文件名中不能出现的字符：路径分隔符、引号和控制字符
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\x00-\x1f\x7f"\\/]')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    解析 Range 请求头，返回闭区间 (start, end)
+
+    只支持单个字节范围（PDF 阅读器按需加载时每次请求一段）；没有 Range、格式不对或
+    请求多个范围时返回 None，按完整内容响应。范围全部落在文件之外时抛出 RangeNotSatisfiable。
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, last = (part.strip() for part in spec.split("-", 1))
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if start >= size:
+                raise RangeNotSatisfiable()
+            if end < start:
+                return None
+        elif last:
+            # 后缀范围：最后 N 个字节
+            length = int(last)
+            if length == 0:
+                raise RangeNotSatisfiable()
+            start, end = max(0, size - length), size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+    if start < 0:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def iter_file(path: str, start: int, length: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """按块读取文件的一段（同步生成器，由 Starlette 在线程池中迭代）"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def content_disposition(filename: str, fallback: str = "document.pdf") -> str:
+    """inline 的 Content-Disposition：ASCII 的 filename 兼容旧客户端，filename* 保留原始的 UTF-8 文件名"""
+    filename = _UNSAFE_FILENAME_CHARS.sub("_", filename).strip().lstrip(".") or fallback
+    ascii_name = " ".join(filename.encode("ascii", "ignore").decode().split())
+    if not ascii_name or ascii_name.startswith("."):
+        ascii_name = fallback
+    return f'inline; filename="{ascii_name}"; filename*=UTF-8\'\'{quote(filename)}'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 比较（弱比较：忽略 W/ 前缀）"""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class FileServer:
+    """
+    论文 PDF 的条件请求与范围请求
+
+    强 ETag 取自内容哈希：内容寻址存储中的文件直接取文件名，旧文件按 (路径, 修改时间, 大小)
+    缓存计算结果。If-None-Match 命中时返回 304；Range 请求返回 206 和对应字节段，
+    If-Range 与当前 ETag（或 Last-Modified）不一致时忽略 Range 返回完整内容。
+    响应的 URL 不是内容寻址的，所以一律带 no-cache：浏览器保留副本，但每次都带 If-None-Match 重新验证，
+    未变化时只返回 304。
+    """
+
+    def __init__(self, blob_store: BlobStore, content_hash: Optional[Callable[[str], str]] = None,
+                 max_cached_hashes: int = 1024):
+        self.blob_store = blob_store
+        self.content_hash = content_hash or file_sha256
+        self.max_cached_hashes = max_cached_hashes
+        self._hashes: "OrderedDict[Tuple[str, float, int], str]" = OrderedDict()
+        self._hashes_lock = threading.Lock()
+
+    def etag_for(self, path: str, stat: os.stat_result) -> str:
+        content_hash = self.blob_store.hash_of(path)
+        if content_hash is None:
+            key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+            with self._hashes_lock:
+                content_hash = self._hashes.get(key)
+            if content_hash is None:
+                content_hash = self.content_hash(path)
+                with self._hashes_lock:
+                    self._hashes[key] = content_hash
+                    while len(self._hashes) > self.max_cached_hashes:
+                        self._hashes.popitem(last=False)
+        return f'"{content_hash}"'
+
+    async def response(self, request: Request, path: str, filename: Optional[str] = None,
+                       media_type: str = "application/pdf") -> Response:
+        """按请求头生成 200 / 206 / 304 / 416 响应"""
+        loop = asyncio.get_running_loop()
+        stat = await loop.run_in_executor(None, os.stat, path)
+        # 旧文件第一次请求时需要读完整个文件计算哈希，放到线程池中
+        etag = await loop.run_in_executor(None, self.etag_for, path, stat)
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        size = stat.st_size
+
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": REVALIDATE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes"
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        if self._if_range_matches(request.headers.get("if-range"), etag, stat.st_mtime):
+            try:
+                byte_range = parse_range(request.headers.get("range"), size)
+            except RangeNotSatisfiable:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+        headers["Content-Disposition"] = content_disposition(filename or Path(path).name)
+        if byte_range is None:
+            headers["Content-Length"] = str(size)
+            return StreamingResponse(iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+        start, end = byte_range
+        length = end - start + 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(iter_file(path, start, length), status_code=206,
+                                 media_type=media_type, headers=headers)
+
+    @staticmethod
+    def _if_range_matches(if_range: Optional[str], etag: str, mtime: float) -> bool:
+        """If-Range：实体标签按强比较，日期需与 Last-Modified 一致；没有该头时视为匹配"""
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == etag
+        try:
+            return int(parsedate_to_datetime(if_range).timestamp()) == int(mtime)
+        except (TypeError, ValueError):
+            return False
@@ -0,0 +1,80 @@
+from typing import Any, List
+import numpy as np
+
+
+class FlatForest:
+    """
+    随机森林回归模型的扁平数组表示
+
+    sklearn 的 Tree 在反序列化时会把节点数组复制到自己的缓冲区，即使以 mmap_mode='r' 加载，
+    每个工作进程仍各持有一份整片森林。这里把所有树的节点拼接成几个普通 numpy 数组
+    （子节点下标已加上所在树的偏移），joblib 以内存映射方式加载后数组直接指向文件，
+    同一台机器上的工作进程共享页缓存。预测时所有树、所有样本同时逐层向下走，
+    判定规则与 sklearn 相同（特征值转为 float32 后与阈值比较），结果一致。
+    """
+
+    def __init__(self, children_left: np.ndarray, children_right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, value: np.ndarray, roots: np.ndarray, n_features: int):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.n_features = n_features
+
+    @classmethod
+    def from_forest(cls, forest: Any) -> "FlatForest":
+        """从训练好的 RandomForestRegressor（单输出）转换"""
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("只支持单输出的回归森林")
+
+        lefts: List[np.ndarray] = []
+        rights: List[np.ndarray] = []
+        features: List[np.ndarray] = []
+        thresholds: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        roots: List[int] = []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            left = tree.children_left.astype(np.int64)
+            right = tree.children_right.astype(np.int64)
+            leaf = left == -1
+            lefts.append(np.where(leaf, -1, left + offset))
+            rights.append(np.where(leaf, -1, right + offset))
+            # 叶子节点的特征下标为 -2，改为 0 以便统一索引（叶子不会再比较）
+            features.append(np.where(leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(tree.threshold.astype(np.float64))
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(lefts), np.concatenate(rights), np.concatenate(features),
+            np.concatenate(thresholds), np.concatenate(values),
+            np.asarray(roots, dtype=np.int64), int(forest.n_features_in_)
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def tree_predictions(self, X: np.ndarray) -> np.ndarray:
+        """各棵树的预测值，形状为 (树数, 样本数)"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"输入特征数应为 {self.n_features}")
+
+        nodes = np.repeat(np.asarray(self.roots)[:, None], X.shape[0], axis=1)
+        samples = np.broadcast_to(np.arange(X.shape[0]), nodes.shape)
+        active = self.children_left[nodes] != -1
+        while active.any():
+            current = nodes[active]
+            go_left = X[samples[active], self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, self.children_left[current], self.children_right[current])
+            active = self.children_left[nodes] != -1
+        return np.asarray(self.value[nodes])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.tree_predictions(X).mean(axis=0)
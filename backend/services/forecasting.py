@@ -0,0 +1,144 @@
+from typing import Callable, Dict, Tuple, Union
+import numpy as np
+from .lazy_imports import lazy_import
+
+sklearn_ensemble = lazy_import('sklearn.ensemble')
+
+
+class TrendForecaster:
+    """时间序列趋势预测器基类：按等间隔时间点拟合，并外推未来若干期"""
+
+    def fit(self, y: np.ndarray) -> "TrendForecaster":
+        raise NotImplementedError
+
+    def predict(self, horizon: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class LinearTrendForecaster(TrendForecaster):
+    """线性趋势 y = a + b·t（闭式最小二乘解）"""
+
+    def fit(self, y: np.ndarray) -> "LinearTrendForecaster":
+        y = np.asarray(y, dtype=float)
+        self.n = len(y)
+        if self.n < 2:
+            self.intercept, self.slope = (float(y[0]) if self.n else 0.0), 0.0
+        else:
+            self.slope, self.intercept = np.polyfit(np.arange(self.n), y, 1)
+        fitted = self.intercept + self.slope * np.arange(self.n)
+        self.sse = float(((y - fitted) ** 2).sum())
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        t = np.arange(self.n, self.n + horizon)
+        return self.intercept + self.slope * t
+
+
+class ExponentialTrendForecaster(TrendForecaster):
+    """指数趋势 y = A·exp(b·t)，对 log(y) 做线性拟合；序列含非正值时退化为线性趋势"""
+
+    def fit(self, y: np.ndarray) -> "ExponentialTrendForecaster":
+        y = np.asarray(y, dtype=float)
+        self.n = len(y)
+        self.fallback = None
+        if self.n < 2 or (y <= 0).any():
+            self.fallback = LinearTrendForecaster().fit(y)
+            self.sse = self.fallback.sse
+            return self
+        self.rate, self.log_scale = np.polyfit(np.arange(self.n), np.log(y), 1)
+        fitted = np.exp(self.log_scale + self.rate * np.arange(self.n))
+        self.sse = float(((y - fitted) ** 2).sum())
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        if self.fallback is not None:
+            return self.fallback.predict(horizon)
+        t = np.arange(self.n, self.n + horizon)
+        return np.exp(self.log_scale + self.rate * t)
+
+
+class ForestTrendForecaster(TrendForecaster):
+    """随机森林回归，仅在历史数据足够长时使用"""
+
+    def __init__(self, n_estimators: int = 100, n_jobs: int = -1, random_state: int = 42):
+        self.n_estimators = n_estimators
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, y: np.ndarray) -> "ForestTrendForecaster":
+        y = np.asarray(y, dtype=float)
+        self.n = len(y)
+        self.model = sklearn_ensemble.RandomForestRegressor(
+            n_estimators=self.n_estimators,
+            n_jobs=self.n_jobs,
+            random_state=self.random_state
+        )
+        self.model.fit(np.arange(self.n).reshape(-1, 1), y)
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        return self.model.predict(np.arange(self.n, self.n + horizon).reshape(-1, 1))
+
+
+class AutoTrendForecaster(TrendForecaster):
+    """
+    自动选择预测器
+
+    历史数据较短时在线性和指数趋势中选择残差更小的一个；
+    历史数据达到 forest_min_history 期时使用并行训练的随机森林。
+    """
+
+    def __init__(self, forest_min_history: int = 30, n_jobs: int = -1):
+        self.forest_min_history = forest_min_history
+        self.n_jobs = n_jobs
+
+    def fit(self, y: np.ndarray) -> "AutoTrendForecaster":
+        if len(y) >= self.forest_min_history:
+            self.selected = ForestTrendForecaster(n_jobs=self.n_jobs).fit(y)
+        else:
+            candidates = [LinearTrendForecaster().fit(y), ExponentialTrendForecaster().fit(y)]
+            self.selected = min(candidates, key=lambda model: model.sse)
+        return self
+
+    def predict(self, horizon: int) -> np.ndarray:
+        return self.selected.predict(horizon)
+
+
+def fit_linear_trends(matrix: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    对矩阵中的每一列同时拟合线性趋势
+
+    所有列共享同一个设计矩阵 [1, t]，一次最小二乘求解即可得到全部系数。
+
+    Args:
+        matrix: 形状为 (时间点数, 序列数) 的矩阵
+        horizon: 外推的期数
+
+    Returns:
+        (斜率, 截距, 形状为 (horizon, 序列数) 的预测值)
+    """
+    num_points = matrix.shape[0]
+    t = np.arange(num_points, dtype=float)
+    design = np.column_stack([np.ones(num_points), t])
+    (intercepts, slopes), *_ = np.linalg.lstsq(design, matrix, rcond=None)
+
+    t_future = np.arange(num_points, num_points + horizon, dtype=float)
+    predictions = intercepts[np.newaxis, :] + np.outer(t_future, slopes)
+    return slopes, intercepts, predictions
+
+
+FORECASTERS: Dict[str, Callable[[], TrendForecaster]] = {
+    'auto': AutoTrendForecaster,
+    'linear': LinearTrendForecaster,
+    'exponential': ExponentialTrendForecaster,
+    'forest': ForestTrendForecaster
+}
+
+
+def create_forecaster(forecaster: Union[str, Callable[[], TrendForecaster]]) -> TrendForecaster:
+    """根据名称或工厂函数创建预测器"""
+    if callable(forecaster):
+        return forecaster()
+    if forecaster not in FORECASTERS:
+        raise ValueError(f"不支持的预测器: {forecaster}")
+    return FORECASTERS[forecaster]()
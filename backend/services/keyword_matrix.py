@@ -0,0 +1,71 @@
+from typing import List, Dict, Tuple
+import numpy as np
+
+
+def build_keyword_matrix(keyword_frequencies: List[Dict[str, float]]) -> Tuple[List[str], np.ndarray]:
+    """
+    将逐年的关键词频率构建为 年份×关键词 矩阵
+
+    Args:
+        keyword_frequencies: 每年一个 {关键词: 频率} 字典
+
+    Returns:
+        (按首次出现顺序排列的关键词列表, 形状为 (年份数, 关键词数) 的矩阵)
+    """
+    index: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+    for row, year_freq in enumerate(keyword_frequencies):
+        for keyword, count in year_freq.items():
+            rows.append(row)
+            cols.append(index.setdefault(keyword, len(index)))
+            values.append(count)
+
+    matrix = np.zeros((len(keyword_frequencies), len(index)))
+    matrix[rows, cols] = values
+    return list(index), matrix
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    用 argpartition 取得分最高的 k 个下标
+
+    Returns:
+        下标数组，按得分降序排列，得分相同时下标小的在前
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def select_top_keywords(matrix: np.ndarray, top_n: int, rank_by: str = 'total') -> np.ndarray:
+    """
+    选出得分最高的 top_n 个关键词列
+
+    Args:
+        matrix: 年份×关键词 矩阵
+        top_n: 保留的关键词数量
+        rank_by: 排序依据 ('total' 按总频率, 'variance' 按逐年方差)
+
+    Returns:
+        列下标数组，按得分降序排列，得分相同时保持首次出现顺序；
+        top_n <= 0 或矩阵为空时返回空数组
+    """
+    if rank_by not in ('total', 'variance'):
+        raise ValueError(f"不支持的排序依据: {rank_by}")
+    if top_n <= 0 or matrix.size == 0:
+        return np.array([], dtype=int)
+
+    scores = matrix.sum(axis=0) if rank_by == 'total' else matrix.var(axis=0)
+
+    num_keywords = matrix.shape[1]
+    if top_n < num_keywords:
+        # 先用 argpartition 取候选，再对候选做稳定排序
+        threshold = np.partition(scores, num_keywords - top_n)[num_keywords - top_n]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(num_keywords)
+
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return order[:top_n]
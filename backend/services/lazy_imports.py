@@ -0,0 +1,35 @@
+from types import ModuleType
+import importlib
+
+
+class LazyModule(ModuleType):
+    """模块代理：首次访问属性时才真正导入模块"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            # import_module 自带导入锁，并发首次访问也只会导入一次
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    延迟导入重量级依赖
+
+    用法:
+        spacy = lazy_import('spacy')
+        spacy.load('en_core_web_sm')  # 此时才导入 spacy
+    """
+    return LazyModule(name)
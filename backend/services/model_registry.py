@@ -0,0 +1,156 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from core.config import settings
+from .lazy_imports import lazy_import
+
+joblib = lazy_import('joblib')
+
+logger = logging.getLogger(__name__)
+
+
+def _file_sha256(path: str) -> str:
+    """计算文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    版本化的模型产物仓库
+
+    目录结构:
+        <root>/versions/<版本>/manifest.json   版本清单：产物文件、校验和、特征定义
+        <root>/versions/<版本>/<名称>.joblib   模型产物（未压缩，其中的 numpy 数组可内存映射）
+        <root>/CURRENT                          当前生效的版本号
+
+    新版本先写入临时目录，完整写入后再整体重命名为正式版本目录；
+    切换版本通过原子替换 CURRENT 文件完成，读取方不会看到写了一半的版本。
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    CURRENT_NAME = 'CURRENT'
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MODEL_REGISTRY_PATH
+        self.versions_dir = os.path.join(self.root, 'versions')
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def publish(self, artifacts: Dict[str, Any], feature_schema: List[str],
+                metadata: Optional[Dict[str, Any]] = None, promote: bool = True) -> str:
+        """
+        发布一个新版本
+
+        Args:
+            artifacts: {产物名称: 可被 joblib 序列化的对象}
+            feature_schema: 模型输入特征名称（按顺序）
+            metadata: 附加信息，例如训练指标
+            promote: 发布后是否立即切换为当前版本
+
+        Returns:
+            新版本号
+        """
+        version = datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S') + '-' + uuid.uuid4().hex[:6]
+        staging_dir = os.path.join(self.root, f".staging-{version}")
+        os.makedirs(staging_dir)
+
+        try:
+            files = {}
+            for name, artifact in artifacts.items():
+                filename = f"{name}.joblib"
+                path = os.path.join(staging_dir, filename)
+                # 不压缩，否则无法以 mmap 方式加载
+                joblib.dump(artifact, path)
+                files[name] = {'file': filename, 'sha256': _file_sha256(path)}
+
+            manifest = {
+                'version': version,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'feature_schema': list(feature_schema),
+                'artifacts': files,
+                'metadata': metadata or {}
+            }
+            with open(os.path.join(staging_dir, self.MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            os.rename(staging_dir, os.path.join(self.versions_dir, version))
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"已发布模型版本 {version}")
+        if promote:
+            self.promote(version)
+        return version
+
+    def promote(self, version: str) -> None:
+        """将指定版本设为当前版本（原子操作）"""
+        if not os.path.exists(os.path.join(self.versions_dir, version, self.MANIFEST_NAME)):
+            raise ValueError(f"模型版本不存在: {version}")
+
+        tmp_path = os.path.join(self.root, f".{self.CURRENT_NAME}.{uuid.uuid4().hex}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, self.CURRENT_NAME))
+        logger.info(f"当前模型版本切换为 {version}")
+
+    def current_version(self) -> Optional[str]:
+        """读取当前版本号，尚未发布过任何版本时返回 None"""
+        try:
+            with open(os.path.join(self.root, self.CURRENT_NAME), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self) -> List[str]:
+        """列出所有已发布的版本（按时间升序）"""
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if os.path.exists(os.path.join(self.versions_dir, name, self.MANIFEST_NAME))
+        )
+
+    def read_manifest(self, version: str) -> Dict[str, Any]:
+        """读取版本清单"""
+        with open(os.path.join(self.versions_dir, version, self.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load(self, version: Optional[str] = None, mmap: bool = True,
+             verify: bool = True) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        加载一个版本的全部产物
+
+        以 mmap_mode='r' 加载时，产物中的普通 numpy 数组直接映射自文件，
+        同一台机器上的多个工作进程共享操作系统页缓存。注意 sklearn 的树模型在反序列化时
+        会把节点数组复制到私有缓冲区，映射不起作用；需要共享的森林应以 FlatForest 发布。
+
+        Args:
+            version: 版本号，默认为当前版本
+            mmap: 是否以只读内存映射方式加载
+            verify: 是否校验产物文件的 SHA-256
+
+        Returns:
+            (版本号, 版本清单, {产物名称: 对象})
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError("模型仓库中没有可用的版本")
+
+        version_dir = os.path.join(self.versions_dir, version)
+        manifest = self.read_manifest(version)
+
+        artifacts = {}
+        for name, entry in manifest['artifacts'].items():
+            path = os.path.join(version_dir, entry['file'])
+            if verify and _file_sha256(path) != entry['sha256']:
+                raise ValueError(f"模型产物校验失败: {version}/{entry['file']}")
+            artifacts[name] = joblib.load(path, mmap_mode='r' if mmap else None)
+
+        return version, manifest, artifacts
@@ -1,22 +1,23 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import numpy as np
-from transformers import pipeline
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import arxiv
-import requests
-from bs4 import BeautifulSoup
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 import re
+import logging
 from collections import Counter
-import networkx as nx
-from rake_nltk import Rake
-from .visualization_service import VisualizationService
-from .prediction_service import PredictionService
+from .lazy_imports import lazy_import
+from .reference_parser import paper_key
+
+# 重量级依赖在首次使用时才导入
+transformers = lazy_import('transformers')
+spacy = lazy_import('spacy')
+sklearn_text = lazy_import('sklearn.feature_extraction.text')
+sklearn_pairwise = lazy_import('sklearn.metrics.pairwise')
+nltk = lazy_import('nltk')
+nltk_corpus = lazy_import('nltk.corpus')
+nltk_stem = lazy_import('nltk.stem')
+nx = lazy_import('networkx')
+rake_nltk = lazy_import('rake_nltk')
+
+logger = logging.getLogger(__name__)
 
 class PaperAnalysisService:
     def __init__(self):
@@ -25,27 +26,29 @@ class PaperAnalysisService:
         nltk.download('stopwords')
         nltk.download('wordnet')
         
-        # 初始化NLP模型
-        self.nlp = spacy.load("en_core_web_sm")
-        self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-        self.vectorizer = TfidfVectorizer(
+        # NLP模型在首次使用时加载
+        self._nlp = None
+        self._summarizer = None
+        self.vectorizer = sklearn_text.TfidfVectorizer(
             max_features=10,
             stop_words='english',
             ngram_range=(1, 2)
         )
         
         # 初始化RAKE
-        self.rake = Rake(
+        self.rake = rake_nltk.Rake(
             min_length=1,
             max_length=3,
             include_repeated_phrases=False
         )
         
-        # 初始化可视化服务
-        self.visualization_service = VisualizationService()
+        # 可视化服务和预测服务在首次使用时初始化
+        self._visualization_service = None
+        self._prediction_service = None
         
-        # 初始化预测服务
-        self.prediction_service = PredictionService()
+        # 引用图存储在首次使用时连接数据库，连接失败时退回到摘要正则分析
+        self._citation_store = None
+        self._citation_store_loaded = False
         
         # 初始化质量评估指标
         self.quality_metrics = {
@@ -70,6 +73,48 @@ class PaperAnalysisService:
             'metrics': ['accuracy', 'precision', 'recall', 'F1', 'BLEU'],
             'baseline': ['baseline', 'comparison', 'state-of-the-art', 'SOTA']
         }
+    
+    @property
+    def nlp(self):
+        """spaCy模型（首次访问时加载）"""
+        if self._nlp is None:
+            self._nlp = spacy.load("en_core_web_sm")
+        return self._nlp
+    
+    @property
+    def summarizer(self):
+        """摘要生成模型（首次访问时加载）"""
+        if self._summarizer is None:
+            self._summarizer = transformers.pipeline("summarization", model="facebook/bart-large-cnn")
+        return self._summarizer
+    
+    @property
+    def visualization_service(self):
+        """可视化服务（首次访问时初始化）"""
+        if self._visualization_service is None:
+            from .visualization_service import VisualizationService
+            self._visualization_service = VisualizationService()
+        return self._visualization_service
+    
+    @property
+    def prediction_service(self):
+        """预测服务（首次访问时初始化）"""
+        if self._prediction_service is None:
+            from .prediction_service import PredictionService
+            self._prediction_service = PredictionService()
+        return self._prediction_service
+    
+    @property
+    def citation_store(self):
+        """引用图存储（首次访问时初始化，数据库不可用时为 None）"""
+        if not self._citation_store_loaded:
+            self._citation_store_loaded = True
+            try:
+                from .citation_store import CitationStore
+                self._citation_store = CitationStore()
+            except Exception as e:
+                logger.warning(f"引用图存储不可用，引用分析将只使用摘要: {str(e)}")
+        return self._citation_store
         
     def extract_keywords(self, text: str, method: str = 'combined') -> Dict[str, List[str]]:
         """
@@ -105,14 +150,14 @@ class PaperAnalysisService:
     def _extract_keywords_tfidf(self, text: str) -> List[str]:
         """使用TF-IDF方法提取关键词"""
         # 分词
-        tokens = word_tokenize(text.lower())
+        tokens = nltk.word_tokenize(text.lower())
         
         # 去除停用词
-        stop_words = set(stopwords.words('english'))
+        stop_words = set(nltk_corpus.stopwords.words('english'))
         tokens = [token for token in tokens if token not in stop_words]
         
         # 词形还原
-        lemmatizer = WordNetLemmatizer()
+        lemmatizer = nltk_stem.WordNetLemmatizer()
         tokens = [lemmatizer.lemmatize(token) for token in tokens]
         
         # 使用TF-IDF提取关键词
@@ -134,11 +179,11 @@ class PaperAnalysisService:
     def _extract_keywords_textrank(self, text: str) -> List[str]:
         """使用TextRank算法提取关键词"""
         # 分词
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text.lower())
+        sentences = nltk.sent_tokenize(text)
+        words = nltk.word_tokenize(text.lower())
         
         # 去除停用词
-        stop_words = set(stopwords.words('english'))
+        stop_words = set(nltk_corpus.stopwords.words('english'))
         words = [word for word in words if word not in stop_words]
         
         # 构建词图
@@ -168,7 +213,14 @@ class PaperAnalysisService:
         return [keyword for keyword, score in keywords]
 
     def analyze_paper(self, paper: Dict[str, Any]) -> Dict[str, str]:
-        """分析论文内容"""
+        """
+        分析论文内容
+        
+        paper 中带有 sections（FileService 提取的 {章节名: 文本}）时，方法、结果、局限性
+        和未来工作等分析使用对应章节的全文，否则退回使用摘要。
+        """
+        sections = paper.get('sections') or {}
+        
         # 提取关键词
         keywords = self.extract_keywords(paper['abstract'])
         
@@ -177,16 +229,16 @@ class PaperAnalysisService:
         main_contribution = summary[0]['summary_text']
         
         # 分析方法论
-        methodology = self._analyze_methodology(paper['abstract'])
+        methodology = self._analyze_methodology(self._section_text(paper, sections, 'method'))
         
         # 分析结果
-        results = self._analyze_results(paper['abstract'])
+        results = self._analyze_results(self._section_text(paper, sections, 'experiments'))
         
         # 分析局限性
-        limitations = self._analyze_limitations(paper['abstract'])
+        limitations = self._analyze_limitations(self._section_text(paper, sections, 'limitations', 'conclusion'))
         
         # 分析未来工作
-        future_work = self._analyze_future_work(paper['abstract'])
+        future_work = self._analyze_future_work(self._section_text(paper, sections, 'conclusion', 'limitations'))
         
         # 分析引用
         citations = self._analyze_citations(paper['abstract'])
@@ -198,18 +250,12 @@ class PaperAnalysisService:
         innovations = self._analyze_innovations(paper['abstract'])
         
         # 分析实验方法
-        experiments = self._analyze_experiments(paper['abstract'])
+        experiments = self._analyze_experiments(self._section_text(paper, sections, 'experiments'))
         
         # 预测论文影响力
-        impact_prediction = self.prediction_service.predict_paper_impact({
-            'title': paper.get('title', ''),
-            'abstract': paper.get('abstract', ''),
-            'authors': paper.get('authors', []),
-            'citation_count': citations['total_citations'],
-            'keywords': keywords['combined'],
-            'innovation_score': quality_score['methodology'],
-            'experiment_score': quality_score['experiments']
-        })
+        impact_prediction = self.prediction_service.predict_paper_impact(
+            self.extract_impact_features(paper, keywords, citations, quality_score)
+        )
         
         return {
             'keywords': keywords,
@@ -225,6 +271,38 @@ class PaperAnalysisService:
             'impact_prediction': impact_prediction
         }
 
+    def _section_text(self, paper: Dict[str, Any], sections: Dict[str, str], *names: str) -> str:
+        """取指定章节的文本，章节都不存在时返回摘要"""
+        text = "\n".join(sections[name] for name in names if sections.get(name))
+        return text or paper['abstract']
+
+    def extract_impact_features(self, paper: Dict[str, Any], keywords: Dict[str, List[str]] = None,
+                                citations: Dict[str, Any] = None,
+                                quality_score: Dict[str, float] = None) -> Dict[str, Any]:
+        """
+        提取影响力模型所需的论文特征
+        
+        已经计算过的关键词、引用和质量评分可以直接传入，未传入的部分从摘要中重新提取。
+        离线训练和在线预测共用这一方法，保证两边的特征一致。
+        """
+        abstract = paper.get('abstract', '')
+        if keywords is None:
+            keywords = self.extract_keywords(abstract)
+        if citations is None:
+            citations = self._analyze_citations(abstract)
+        if quality_score is None:
+            quality_score = self._evaluate_paper_quality(abstract)
+        
+        return {
+            'title': paper.get('title', ''),
+            'abstract': abstract,
+            'authors': paper.get('authors', []),
+            'citation_count': citations['total_citations'],
+            'keywords': keywords['combined'],
+            'innovation_score': quality_score['methodology'],
+            'experiment_score': quality_score['experiments']
+        }
+
     def _analyze_methodology(self, text: str) -> str:
         """分析论文的方法论部分"""
         # 这里可以使用更复杂的NLP模型来分析方法论
@@ -405,7 +483,7 @@ class PaperAnalysisService:
         
         if conference_text:
             vectors = self.vectorizer.fit_transform([paper_text, conference_text])
-            similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
+            similarity = sklearn_pairwise.cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
         else:
             similarity = 0.0
         
@@ -422,7 +500,7 @@ class PaperAnalysisService:
         
         for conference in conferences:
             vectors = self.vectorizer.fit_transform([paper_text, " ".join(conference_keywords.get(conference, []))])
-            similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
+            similarity = sklearn_pairwise.cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
             suggestions.append({
                 "conference": conference,
                 "similarity_score": float(similarity)
@@ -542,32 +620,115 @@ class PaperAnalysisService:
         return topic_evolution
     
     def _analyze_citation_trends(self, papers: List[Dict]) -> Dict:
-        """分析引用趋势"""
+        """
+        分析引用趋势
+        
+        参考文献已入库的论文通过引用图的索引查询引用网络和高被引论文，
+        其余论文仍对摘要做正则匹配。每篇论文的摘要只分析一次。
+        """
         citation_trends = {
             'highly_cited_papers': [],
+            'influential_papers': [],
+            'research_communities': [],
             'citation_networks': [],
             'citation_impact': {}
         }
         
-        # 识别高引用论文
-        for paper in papers:
-            citations = self._analyze_citations(paper['abstract'])
-            if citations['total_citations'] > 5:  # 设置阈值
+        citations = [self._analyze_citations(paper['abstract']) for paper in papers]
+        references, most_cited = self._stored_citations(papers)
+        
+        # 识别高引用论文：引用图中被这批论文引用最多的论文
+        # 两种来源的条目字段相同，缺少的字段为 None，source 标明引用数的来源
+        for paper in most_cited:
+            citation_trends['highly_cited_papers'].append({
+                'key': paper['key'],
+                'title': paper['title'],
+                'year': paper['year'],
+                'citations': paper['citations'],
+                'citation_types': None,
+                'source': 'citation_graph'
+            })
+        
+        # 未入库的论文按摘要中的引用数识别
+        for paper, paper_citations in zip(papers, citations):
+            paper_key = self._paper_key(paper)
+            if paper_key in references:
+                continue
+            if paper_citations['total_citations'] > 5:  # 设置阈值
+                year = (paper.get('published_date') or '').split('-')[0]
                 citation_trends['highly_cited_papers'].append({
+                    'key': paper_key,
                     'title': paper.get('title', ''),
-                    'citations': citations['total_citations'],
-                    'citation_types': citations['citation_types']
+                    'year': int(year) if year.isdigit() else None,
+                    'citations': paper_citations['total_citations'],
+                    'citation_types': paper_citations['citation_types'],
+                    'source': 'abstract'
                 })
         
         # 分析引用网络
-        citation_networks = self._build_citation_networks(papers)
+        citation_networks = self._build_citation_networks(papers, citations, references)
         citation_trends['citation_networks'] = citation_networks
         
         # 计算引用影响力
-        citation_trends['citation_impact'] = self._calculate_citation_impact(papers)
+        citation_trends['citation_impact'] = self._calculate_citation_impact(papers, citations, references)
+        
+        # 在整个引用图上按 PageRank 找出最具影响力的论文及其所在的研究社区
+        if references:
+            citation_trends.update(self._graph_influence(papers, references))
         
         return citation_trends
     
+    def _graph_influence(self, papers: List[Dict], references: Dict[str, List[Dict]],
+                         top_k: int = 20) -> Dict[str, List[Dict]]:
+        """
+        引用图分析：这批论文及其参考文献中 PageRank 最高的论文，以及它们所属的社区
+        
+        稀疏矩阵图按引用图版本缓存，PageRank 和社区划分在同一版本上只计算一次。
+        """
+        titles = {self._paper_key(paper): paper.get('title', '') for paper in papers}
+        for paper_references in references.values():
+            for reference in paper_references:
+                titles.setdefault(reference['key'], reference['title'])
+        
+        try:
+            graph = self.citation_store.load_graph()
+            influential = graph.influential_papers(top_k, candidates=list(titles))
+        except Exception as e:
+            logger.error(f"引用图分析失败: {str(e)}")
+            return {}
+        
+        for paper in influential:
+            paper['title'] = titles.get(paper['key']) or paper['key']
+        
+        communities: Dict[int, Dict[str, Any]] = {}
+        for paper in influential:
+            community = communities.setdefault(paper['community'], {
+                'community': paper['community'], 'papers': []
+            })
+            community['papers'].append(paper['title'])
+        
+        return {
+            'influential_papers': influential,
+            'research_communities': list(communities.values())
+        }
+    
+    def _paper_key(self, paper: Dict) -> str:
+        return paper_key(paper.get('title', ''), paper.get('doi'))
+    
+    def _stored_citations(self, papers: List[Dict]) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+        """从引用图中读取这些论文的参考文献和高被引论文，数据库不可用时返回空结果"""
+        store = self.citation_store
+        if store is None:
+            return {}, []
+        
+        try:
+            references = store.references_of(self._paper_key(paper) for paper in papers)
+            most_cited = store.most_cited(references.keys()) if references else []
+        except Exception as e:
+            logger.error(f"查询引用图失败: {str(e)}")
+            return {}, []
+        return references, most_cited
+    
     def _analyze_methodology_evolution(self, papers: List[Dict]) -> List[Dict]:
         """分析方法演化"""
         methodology_evolution = []
@@ -668,24 +829,30 @@ class PaperAnalysisService:
         declining_topics = previous_keywords - current_keywords
         return list(declining_topics)
     
-    def _build_citation_networks(self, papers: List[Dict]) -> List[Dict]:
-        """构建引用网络"""
+    def _build_citation_networks(self, papers: List[Dict], citations: List[Dict[str, Any]],
+                                 references: Dict[str, List[Dict]]) -> List[Dict]:
+        """构建引用网络（已入库的论文使用解析出的参考文献，其余使用摘要中的引用句）"""
         networks = []
         
-        for paper in papers:
-            citations = self._analyze_citations(paper['abstract'])
-            if citations['total_citations'] > 0:
-                network = {
-                    'paper': paper.get('title', ''),
-                    'cited_papers': citations['citation_sentences'],
-                    'citation_types': citations['citation_types']
-                }
-                networks.append(network)
+        for paper, paper_citations in zip(papers, citations):
+            paper_references = references.get(self._paper_key(paper))
+            if paper_references:
+                cited_papers = [reference['title'] or reference['key'] for reference in paper_references]
+            elif paper_citations['total_citations'] > 0:
+                cited_papers = paper_citations['citation_sentences']
+            else:
+                continue
+            networks.append({
+                'paper': paper.get('title', ''),
+                'cited_papers': cited_papers,
+                'citation_types': paper_citations['citation_types']
+            })
         
         return networks
     
-    def _calculate_citation_impact(self, papers: List[Dict]) -> Dict:
-        """计算引用影响力"""
+    def _calculate_citation_impact(self, papers: List[Dict], citations: List[Dict[str, Any]],
+                                   references: Dict[str, List[Dict]]) -> Dict:
+        """计算引用影响力（已入库的论文以参考文献条数作为引用总数）"""
         impact = {
             'methodology_citations': 0,
             'result_citations': 0,
@@ -693,12 +860,15 @@ class PaperAnalysisService:
             'total_citations': 0
         }
         
-        for paper in papers:
-            citations = self._analyze_citations(paper['abstract'])
-            impact['methodology_citations'] += citations['citation_types']['methodology']
-            impact['result_citations'] += citations['citation_types']['results']
-            impact['background_citations'] += citations['citation_types']['background']
-            impact['total_citations'] += citations['total_citations']
+        for paper, paper_citations in zip(papers, citations):
+            impact['methodology_citations'] += paper_citations['citation_types']['methodology']
+            impact['result_citations'] += paper_citations['citation_types']['results']
+            impact['background_citations'] += paper_citations['citation_types']['background']
+            paper_references = references.get(self._paper_key(paper))
+            if paper_references:
+                impact['total_citations'] += len(paper_references)
+            else:
+                impact['total_citations'] += paper_citations['total_citations']
         
         return impact
     
@@ -823,7 +993,7 @@ class PaperAnalysisService:
         result_vectors = self.vectorizer.fit_transform(results)
         
         # 计算方法和结果之间的相似度
-        similarity_matrix = cosine_similarity(method_vectors, result_vectors)
+        similarity_matrix = sklearn_pairwise.cosine_similarity(method_vectors, result_vectors)
         
         # 识别潜在的研究空白点
         for i, method in enumerate(methods):
@@ -0,0 +1,112 @@
+from typing import Dict, Iterator, Optional, Type
+import io
+from .lazy_imports import lazy_import
+
+# 各后端的依赖只在选用时导入；除 PyPDF2 外均为可选依赖
+PyPDF2 = lazy_import('PyPDF2')
+pypdf = lazy_import('pypdf')
+pymupdf = lazy_import('pymupdf')
+
+DEFAULT_BACKEND = 'pypdf2'
+
+
+class PdfTextBackend:
+    """PDF 文本提取后端：逐页惰性读取文本"""
+
+    name = ''
+
+    def page_count(self, file_path: str) -> int:
+        raise NotImplementedError
+
+    def iter_pages(self, file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """逐页返回 [start, stop) 范围内的文本"""
+        raise NotImplementedError
+
+
+class PyPDF2Backend(PdfTextBackend):
+    """PyPDF2（默认后端）"""
+
+    name = 'pypdf2'
+
+    def _reader(self, file):
+        return PyPDF2.PdfReader(file)
+
+    def page_count(self, file_path: str) -> int:
+        with open(file_path, 'rb') as file:
+            return len(self._reader(file).pages)
+
+    def iter_pages(self, file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        with open(file_path, 'rb') as file:
+            reader = self._reader(file)
+            num_pages = len(reader.pages)
+            for i in range(start, num_pages if stop is None else min(stop, num_pages)):
+                yield reader.pages[i].extract_text() or ""
+
+
+class PypdfBackend(PyPDF2Backend):
+    """pypdf（PyPDF2 的后续版本，纯 Python，pip install pypdf）"""
+
+    name = 'pypdf'
+
+    def _reader(self, file):
+        return pypdf.PdfReader(file)
+
+
+class PdfminerBackend(PdfTextBackend):
+    """pdfminer.six（纯 Python，版面分析较好，速度较慢，pip install pdfminer.six）"""
+
+    name = 'pdfminer'
+
+    def page_count(self, file_path: str) -> int:
+        from pdfminer.pdfpage import PDFPage
+        with open(file_path, 'rb') as file:
+            return sum(1 for _ in PDFPage.get_pages(file))
+
+    def iter_pages(self, file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resource_manager = PDFResourceManager()
+        laparams = LAParams()
+        with open(file_path, 'rb') as file:
+            for i, page in enumerate(PDFPage.get_pages(file)):
+                if i < start:
+                    continue
+                if stop is not None and i >= stop:
+                    break
+                output = io.StringIO()
+                device = TextConverter(resource_manager, output, laparams=laparams)
+                PDFPageInterpreter(resource_manager, device).process_page(page)
+                device.close()
+                yield output.getvalue()
+
+
+class PyMuPDFBackend(PdfTextBackend):
+    """PyMuPDF（MuPDF 的预编译 wheel，速度最快，pip install pymupdf）"""
+
+    name = 'pymupdf'
+
+    def page_count(self, file_path: str) -> int:
+        with pymupdf.open(file_path) as doc:
+            return doc.page_count
+
+    def iter_pages(self, file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        with pymupdf.open(file_path) as doc:
+            for i in range(start, doc.page_count if stop is None else min(stop, doc.page_count)):
+                yield doc[i].get_text()
+
+
+BACKENDS: Dict[str, Type[PdfTextBackend]] = {
+    backend.name: backend
+    for backend in (PyPDF2Backend, PypdfBackend, PdfminerBackend, PyMuPDFBackend)
+}
+
+
+def get_backend(name: Optional[str] = None) -> PdfTextBackend:
+    """根据名称获取文本提取后端，默认使用 PyPDF2"""
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"不支持的PDF文本后端: {name}（可选: {', '.join(BACKENDS)}）")
+    return BACKENDS[name]()
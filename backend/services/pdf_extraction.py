@@ -0,0 +1,364 @@
+from __future__ import annotations
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
+from concurrent.futures import Executor
+import re
+import logging
+from .lazy_imports import lazy_import
+
+from .pdf_backends import get_backend
+from .venue_detector import VenueDetector
+
+# NLP依赖在首次使用时才导入
+sklearn_text = lazy_import('sklearn.feature_extraction.text')
+spacy = lazy_import('spacy')
+
+logger = logging.getLogger(__name__)
+
+# 进程池中每个工作进程各自持有的提取器，由 init_extraction_worker 创建
+_worker_extractor: Optional["PdfInfoExtractor"] = None
+
+
+def init_extraction_worker(backend: Optional[str] = None) -> None:
+    """进程池初始化函数：每个工作进程只加载一次 spaCy 模型"""
+    global _worker_extractor
+    _worker_extractor = PdfInfoExtractor(backend=backend)
+
+
+def extract_in_worker(file_path: str) -> Dict[str, Any]:
+    """在进程池工作进程中解析PDF"""
+    return _worker_extractor.extract(file_path)
+
+
+def extract_many_in_worker(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """在进程池工作进程中批量解析PDF"""
+    return _worker_extractor.extract_many(file_paths)
+
+
+def iter_page_texts(file_path: str, start: int = 0, stop: Optional[int] = None,
+                    backend: Optional[str] = None) -> Iterator[str]:
+    """
+    逐页惰性读取PDF文本
+
+    各后端都按需解析页面对象，每次只有当前页的文本在内存中。
+    """
+    return get_backend(backend).iter_pages(file_path, start, stop)
+
+
+def page_count(file_path: str, backend: Optional[str] = None) -> int:
+    """读取PDF页数"""
+    return get_backend(backend).page_count(file_path)
+
+
+def extract_page_range(file_path: str, start: int, stop: int, backend: Optional[str] = None) -> List[str]:
+    """读取 [start, stop) 范围内各页的文本，供进程池按页分片并行提取"""
+    return list(iter_page_texts(file_path, start, stop, backend))
+
+
+class SectionSplitter:
+    """
+    增量识别论文章节
+
+    逐页调用 feed 传入文本，按行匹配章节标题（可带 "1"、"2.1"、"III." 等编号），
+    把正文归入当前章节。第一个标题之前的文本归入 front_matter。
+    每个章节最多保留 max_section_chars 个字符，保证长文档的内存占用有上限。
+    """
+
+    SECTION_PATTERNS = {
+        'abstract': r'abstract',
+        'introduction': r'introduction',
+        'related_work': r'related\s+work|background(\s+and\s+related\s+work)?|preliminaries',
+        'method': r'methods?|methodology|approach|proposed\s+(method|approach|model)',
+        'experiments': r'experiments?|experimental\s+(setup|results)|evaluation|results(\s+and\s+discussion)?',
+        'limitations': r'limitations?|threats\s+to\s+validity|discussion\s+and\s+limitations',
+        'discussion': r'(general\s+)?discussion',
+        'conclusion': r'conclusions?(\s+and\s+future\s+work)?|future\s+work',
+        'references': r'references|bibliography'
+    }
+
+    HEADING_PATTERN = re.compile(
+        r'^\s*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?(?P<title>'
+        + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_PATTERNS.items())
+        + r')\s*:?\s*$',
+        re.IGNORECASE
+    )
+
+    def __init__(self, max_section_chars: int = 200000, max_heading_chars: int = 80):
+        self.max_section_chars = max_section_chars
+        self.max_heading_chars = max_heading_chars
+        self.current = 'front_matter'
+        self.sections: Dict[str, List[str]] = {}
+        self._sizes: Dict[str, int] = {}
+
+    def feed(self, page_text: str) -> None:
+        """处理一页文本"""
+        for line in page_text.splitlines():
+            section = self._match_heading(line)
+            if section is not None:
+                self.current = section
+                continue
+            self._append(line)
+
+    def result(self) -> Dict[str, str]:
+        """返回 {章节名: 文本}，只包含出现过的章节"""
+        return {name: "\n".join(lines).strip() for name, lines in self.sections.items()}
+
+    def _match_heading(self, line: str) -> Optional[str]:
+        if len(line) > self.max_heading_chars:
+            return None
+        match = self.HEADING_PATTERN.match(line)
+        if not match:
+            return None
+        return next(name for name in self.SECTION_PATTERNS if match.group(name))
+
+    def _append(self, line: str) -> None:
+        size = self._sizes.get(self.current, 0)
+        if size >= self.max_section_chars:
+            return
+        line = line[:self.max_section_chars - size]
+        self.sections.setdefault(self.current, []).append(line)
+        self._sizes[self.current] = size + len(line) + 1
+
+
+def split_sections(page_texts: Iterable[str], max_section_chars: int = 200000) -> Dict[str, str]:
+    """按页顺序切分章节"""
+    splitter = SectionSplitter(max_section_chars=max_section_chars)
+    for page_text in page_texts:
+        splitter.feed(page_text)
+    return splitter.result()
+
+
+def extract_sections(file_path: str, max_section_chars: int = 200000,
+                     backend: Optional[str] = None) -> Dict[str, str]:
+    """逐页读取PDF全文并按章节切分"""
+    return split_sections(iter_page_texts(file_path, backend=backend), max_section_chars)
+
+
+def page_shards(num_pages: int, num_shards: int) -> List[Tuple[int, int]]:
+    """把 [0, num_pages) 均匀划分为 num_shards 个连续页范围"""
+    bounds = [num_pages * i // num_shards for i in range(num_shards + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def extract_sections_sharded(file_path: str, executor: Executor, num_pages: int, num_shards: int,
+                             max_section_chars: int = 200000, backend: Optional[str] = None) -> Dict[str, str]:
+    """
+    按页范围分片并行提取全文章节
+
+    每个分片由执行器中的一个工作进程独立打开文件提取，结果按页序拼接后再切分章节，
+    与 extract_sections 的结果一致。
+    """
+    futures = [
+        executor.submit(extract_page_range, file_path, start, stop, backend)
+        for start, stop in page_shards(num_pages, num_shards)
+    ]
+    return split_sections((text for future in futures for text in future.result()), max_section_chars)
+
+
+class PdfInfoExtractor:
+    """
+    PDF 信息提取器
+    
+    不依赖 FileService 的其他状态，既可以在主进程的线程池中使用，
+    也可以在进程池的每个工作进程中各自创建一份。
+    
+    spaCy 只对论文开头（标题、作者、摘要所在区域）运行一次，并且只保留
+    分句和命名实体识别；关键词、年份和会议识别仍使用前两页的完整文本。
+    """
+    
+    # 标题、作者、摘要只会用到的组件之外的组件都不加载
+    EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+    
+    def __init__(self, model: str = "en_core_web_sm", batch_size: int = 16, backend: Optional[str] = None):
+        # 加载spaCy模型（排除依存句法等组件，改用轻量的 senter 分句）
+        self.nlp = spacy.load(model, exclude=self.EXCLUDED_COMPONENTS)
+        if "senter" in self.nlp.disabled:
+            self.nlp.enable_pipe("senter")
+        elif not self.nlp.has_pipe("senter") and not self.nlp.has_pipe("sentencizer"):
+            self.nlp.add_pipe("sentencizer", first=True)
+        self.batch_size = batch_size
+        
+        # PDF文本提取后端（pypdf2 / pypdf / pdfminer / pymupdf）
+        self.backend = get_backend(backend)
+        
+        # 摘要标题之后保留的字符数（摘要最多收集 1000 字符），找不到摘要标题时保留的字符数
+        self.abstract_window = 2000
+        self.front_matter_chars = 3000
+        
+        # 会议/期刊别名词典编译成的自动机
+        self.venue_detector = VenueDetector()
+        
+        # TF-IDF向量化器的参数；每次提取新建向量化器，同一提取器在多个线程中并发使用时互不干扰
+        self.vectorizer_params = {
+            'max_features': 100,
+            'stop_words': 'english',
+            'ngram_range': (1, 3)
+        }
+
+    def extract(self, file_path: str) -> Dict[str, Any]:
+        """解析PDF并提取标题、摘要、作者等信息"""
+        return self.extract_many([file_path])[0]
+    
+    def extract_many(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量解析PDF
+        
+        各文件的开头区域通过 nlp.pipe 成批送入 spaCy。任何一个文件读取失败都会抛出异常，
+        需要逐个文件隔离错误时请使用 extract。
+        """
+        try:
+            pages = [self._read_first_pages(file_path) for file_path in file_paths]
+            texts = [text for text, _ in pages]
+            front_matters = [self._front_matter(text) for text in texts]
+            
+            results = []
+            docs = self.nlp.pipe(front_matters, batch_size=self.batch_size)
+            for file_path, (text, num_pages), doc in zip(file_paths, pages, docs):
+                # 提取标题和摘要
+                title, abstract = self._extract_title_and_abstract(doc)
+                
+                results.append({
+                    "title": title,
+                    "abstract": abstract,
+                    "authors": self._extract_authors(doc),
+                    "conference": self._extract_conference(text),
+                    "year": self._extract_year(doc, text),
+                    "keywords": self._extract_keywords(text),
+                    "num_pages": num_pages,
+                    "file_path": file_path
+                })
+            return results
+        except Exception as e:
+            logger.error(f"PDF解析失败: {str(e)}")
+            raise
+    
+    def _read_first_pages(self, file_path: str) -> Tuple[str, int]:
+        """读取前两页文本，返回 (文本, 总页数)"""
+        # 获取页数
+        num_pages = self.backend.page_count(file_path)
+        
+        # 提取前两页文本
+        text = ""
+        for page_text in self.backend.iter_pages(file_path, 0, 2):
+            text += page_text + "\n"
+        
+        return text, num_pages
+    
+    def _front_matter(self, text: str) -> str:
+        """截取标题、作者和摘要所在的开头区域"""
+        match = re.search(r'abstract', text, re.IGNORECASE)
+        if match:
+            return text[:match.end() + self.abstract_window]
+        return text[:self.front_matter_chars]
+
+    def _extract_title_and_abstract(self, doc: spacy.tokens.Doc) -> Tuple[str, str]:
+        """提取标题和摘要"""
+        try:
+            sentences = list(doc.sents)
+            title = ""
+            abstract = ""
+            in_abstract = False
+            
+            for sent in sentences:
+                text = sent.text.strip()
+                if not text:
+                    continue
+                
+                # 如果还没有找到标题，当前句子就是标题
+                if not title:
+                    title = text
+                    continue
+                
+                # 检查是否进入摘要部分
+                if "abstract" in text.lower():
+                    in_abstract = True
+                    continue
+                
+                # 如果在摘要部分，收集摘要内容
+                if in_abstract:
+                    if len(abstract) > 1000:  # 限制摘要长度
+                        break
+                    abstract += text + " "
+            
+            return title, abstract.strip()
+        except Exception as e:
+            logger.error(f"提取标题和摘要失败: {str(e)}")
+            return "", ""
+
+    def _extract_authors(self, doc: spacy.tokens.Doc) -> str:
+        """提取作者信息"""
+        try:
+            authors = []
+            found_title = False
+            
+            for sent in doc.sents:
+                text = sent.text.strip()
+                if not text:
+                    continue
+                
+                if not found_title:
+                    found_title = True
+                    continue
+                
+                if "abstract" in text.lower():
+                    break
+                
+                # 直接复用整篇文档的命名实体识别结果
+                person_entities = [ent.text for ent in sent.ents if ent.label_ == "PERSON"]
+                
+                if person_entities:
+                    authors.extend(person_entities)
+                elif any(keyword in text.lower() for keyword in ['university', 'institute', '@', '.edu']):
+                    authors.append(text)
+            
+            return '; '.join(authors) if authors else ""
+        except Exception as e:
+            logger.error(f"提取作者信息失败: {str(e)}")
+            return ""
+
+    def _extract_conference(self, text: str) -> Optional[str]:
+        """提取会议/期刊信息（按别名词典单遍匹配，最坏情况线性时间）"""
+        try:
+            return self.venue_detector.detect(text)
+        except Exception as e:
+            logger.error(f"提取会议/期刊信息失败: {str(e)}")
+            return None
+
+    def _extract_year(self, doc: spacy.tokens.Doc, text: str) -> Optional[int]:
+        """提取年份信息"""
+        try:
+            # 使用spaCy的命名实体识别
+            date_entities = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
+            
+            # 首先检查日期实体
+            for date in date_entities:
+                year_match = re.search(r'\b(19|20)\d{2}\b', date)
+                if year_match:
+                    return int(year_match.group(0))
+            
+            # 如果没有找到，检查整个文本
+            year_match = re.search(r'\b(19|20)\d{2}\b', text)
+            if year_match:
+                return int(year_match.group(0))
+            
+            return None
+        except Exception as e:
+            logger.error(f"提取年份信息失败: {str(e)}")
+            return None
+
+    def _extract_keywords(self, text: str) -> List[str]:
+        """提取关键词"""
+        try:
+            # 使用TF-IDF提取关键词（fit 会修改向量化器的状态，不能在线程之间共享）
+            vectorizer = sklearn_text.TfidfVectorizer(**self.vectorizer_params)
+            vectorizer.fit_transform([text])
+            feature_names = vectorizer.get_feature_names_out()
+            
+            # 获取前10个关键词
+            keywords = []
+            for i in range(min(10, len(feature_names))):
+                keywords.append(feature_names[i])
+            
+            return keywords
+        except Exception as e:
+            logger.error(f"提取关键词失败: {str(e)}")
+            return []
@@ -1,24 +1,83 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
+from collections import OrderedDict
+import hashlib
+import logging
+import threading
+import time
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import pandas as pd
-from datetime import datetime, timedelta
-import joblib
 import os
+from core.config import settings
+from .lazy_imports import lazy_import
+from .forecasting import TrendForecaster, create_forecaster, fit_linear_trends
+from .keyword_matrix import build_keyword_matrix, top_k_indices
+from .model_registry import ModelRegistry
+from .flat_forest import FlatForest
+
+# sklearn/joblib 在首次训练或加载模型时才导入
+sklearn_ensemble = lazy_import('sklearn.ensemble')
+sklearn_preprocessing = lazy_import('sklearn.preprocessing')
+joblib = lazy_import('joblib')
+
+logger = logging.getLogger(__name__)
+
+# 影响力模型的输入特征，顺序与 _extract_paper_features 一致
+IMPACT_FEATURES = [
+    'title_length',
+    'abstract_length',
+    'author_count',
+    'citation_count',
+    'keyword_count',
+    'innovation_score',
+    'experiment_score'
+]
+
+# 旧版本不经过模型仓库、直接保存 joblib 文件的目录（相对启动目录）
+_LEGACY_MODEL_DIR = "models"
+
+def _has_legacy_models(model_dir: str) -> bool:
+    """目录下是否有旧版本直接保存的模型文件"""
+    return any(os.path.exists(os.path.join(model_dir, name))
+               for name in ('trend_model.joblib', 'impact_model.joblib', 'scaler.joblib'))
+
+def _as_flat_forest(model: Any) -> Optional[FlatForest]:
+    """旧版本保存的 sklearn 随机森林转换为 FlatForest"""
+    if model is None or isinstance(model, FlatForest):
+        return model
+    return FlatForest.from_forest(model)
 
 class PredictionService:
-    def __init__(self):
-        # 创建模型存储目录
-        self.model_dir = "models"
+    def __init__(self,
+                 forecaster: Union[str, Callable[[], TrendForecaster]] = 'auto',
+                 forecast_cache_size: int = 256,
+                 model_dir: Optional[str] = None):
+        # 创建模型存储目录（默认取配置中的模型仓库路径）
+        self.model_dir = model_dir or settings.MODEL_REGISTRY_PATH
         os.makedirs(self.model_dir, exist_ok=True)
+        self.registry = ModelRegistry(self.model_dir)
+        
+        # 当前加载的模型版本；每隔 reload_interval 秒检查仓库是否有新版本
+        self.model_version: Optional[str] = None
+        self.reload_interval = 30.0
+        self._last_reload_check = time.monotonic()
+        self._reload_lock = threading.Lock()
         
         # 初始化模型
         self.trend_model = None
-        self.impact_model = None
-        self.scaler = StandardScaler()
+        # 影响力模型和标准化器作为一个元组 (模型, 标准化器) 整体替换，读取时一次取出；
+        # 模型以 FlatForest 保存，从模型仓库内存映射加载后各工作进程共享同一份节点数组
+        self._impact: Tuple[Any, Any] = (None, sklearn_preprocessing.StandardScaler())
+        
+        # 趋势预测器（名称或工厂函数），拟合结果按输入序列指纹缓存
+        self.forecaster = forecaster
+        self.forecast_cache_size = forecast_cache_size
+        self._forecast_cache: "OrderedDict[str, TrendForecaster]" = OrderedDict()
+        self._forecast_lock = threading.Lock()
+        
+        # 关键词趋势中上升/下降最快的关键词数量
+        self.keyword_top_k = 10
+        
+        # 加载已训练的影响力模型（如果存在）
+        self.load_models()
     
     def predict_trends(self, historical_data: Dict[str, List], prediction_horizon: int = 5) -> Dict[str, List]:
         """
@@ -31,43 +90,113 @@ class PredictionService:
         Returns:
             预测结果，包含未来几年的趋势预测
         """
-        # 准备训练数据
-        X = np.array(range(len(historical_data['years']))).reshape(-1, 1)
-        y_papers = np.array(historical_data['paper_counts'])
-        y_citations = np.array(historical_data['citation_counts'])
-        
-        # 训练论文数量预测模型
-        self.trend_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.trend_model.fit(X, y_papers)
-        
-        # 训练引用数量预测模型
-        self.impact_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.impact_model.fit(X, y_citations)
+        # 获取（或拟合）论文数量和引用数量的预测器，不修改实例上的共享模型
+        paper_model = self._get_forecaster(historical_data['paper_counts'])
+        citation_model = self._get_forecaster(historical_data['citation_counts'])
         
         # 生成预测时间点
         last_year = int(historical_data['years'][-1])
         future_years = [str(last_year + i + 1) for i in range(prediction_horizon)]
-        X_future = np.array(range(len(historical_data['years']), 
-                                 len(historical_data['years']) + prediction_horizon)).reshape(-1, 1)
         
         # 预测论文数量
-        paper_predictions = self.trend_model.predict(X_future)
+        paper_predictions = paper_model.predict(prediction_horizon)
         
         # 预测引用数量
-        citation_predictions = self.impact_model.predict(X_future)
+        citation_predictions = citation_model.predict(prediction_horizon)
         
         # 预测关键词趋势
-        keyword_predictions = self._predict_keyword_trends(historical_data['keyword_frequencies'], 
-                                                        prediction_horizon)
+        keyword_trends = self._predict_keyword_trends(historical_data['keyword_frequencies'], 
+                                                    prediction_horizon)
         
         return {
             'years': future_years,
             'paper_predictions': paper_predictions.tolist(),
             'citation_predictions': citation_predictions.tolist(),
-            'keyword_predictions': keyword_predictions
+            'keyword_predictions': keyword_trends['predictions'],
+            'keyword_slopes': keyword_trends['slopes'],
+            'rising_keywords': keyword_trends['rising'],
+            'falling_keywords': keyword_trends['falling']
         }
     
-    def predict_paper_impact(self, paper_features: Dict[str, Any]) -> Dict[str, float]:
+    def _get_forecaster(self, series: List[float]) -> TrendForecaster:
+        """按序列指纹获取已拟合的预测器，未命中时拟合并缓存"""
+        values = np.asarray(series, dtype=float)
+        forecaster_name = self.forecaster if isinstance(self.forecaster, str) else repr(self.forecaster)
+        key = hashlib.sha1(forecaster_name.encode('utf-8') + values.tobytes()).hexdigest()
+        
+        with self._forecast_lock:
+            model = self._forecast_cache.get(key)
+            if model is not None:
+                self._forecast_cache.move_to_end(key)
+                return model
+        
+        # 拟合在锁外进行；拟合完成后预测器只读，可在并发请求间共享
+        model = create_forecaster(self.forecaster).fit(values)
+        
+        with self._forecast_lock:
+            self._forecast_cache[key] = model
+            while len(self._forecast_cache) > self.forecast_cache_size:
+                self._forecast_cache.popitem(last=False)
+        
+        return model
+    
+    def fit_impact_model(self, papers: List[Dict[str, Any]], targets: List[float],
+                         n_estimators: int = 200, n_jobs: int = -1, **model_params) -> Dict[str, float]:
+        """
+        在论文语料上训练影响力模型
+        
+        Args:
+            papers: 论文特征列表，字段与 predict_paper_impact 的输入一致
+            targets: 每篇论文的影响力目标值
+            n_estimators: 随机森林的树数量
+            n_jobs: 并行训练的进程数
+            model_params: 传给 RandomForestRegressor 的其他超参数
+            
+        Returns:
+            训练样本数和袋外 R²
+        """
+        if len(papers) != len(targets):
+            raise ValueError("论文数量与目标值数量不一致")
+        if len(papers) < 2:
+            raise ValueError("训练影响力模型至少需要两篇论文")
+        
+        X = self._extract_paper_features_batch(papers)
+        y = np.asarray(targets, dtype=float)
+        
+        # 在局部变量上训练完成后再替换实例属性，训练期间的预测仍使用旧模型
+        scaler = sklearn_preprocessing.StandardScaler().fit(X)
+        model = sklearn_ensemble.RandomForestRegressor(
+            n_estimators=n_estimators,
+            n_jobs=n_jobs,
+            oob_score=True,
+            random_state=42,
+            **model_params
+        )
+        model.fit(scaler.transform(X), y)
+        self._impact = (FlatForest.from_forest(model), scaler)
+        
+        return {
+            'n_samples': len(papers),
+            'oob_r2': float(model.oob_score_)
+        }
+    
+    @property
+    def impact_model(self):
+        return self._impact[0]
+    
+    @impact_model.setter
+    def impact_model(self, model) -> None:
+        self._impact = (_as_flat_forest(model), self._impact[1])
+    
+    @property
+    def scaler(self):
+        return self._impact[1]
+    
+    @scaler.setter
+    def scaler(self, scaler) -> None:
+        self._impact = (self._impact[0], scaler)
+    
+    def predict_paper_impact(self, paper_features: Dict[str, Any]) -> Dict[str, Optional[float]]:
         """
         预测论文影响力
         
@@ -75,49 +204,73 @@ class PredictionService:
             paper_features: 论文特征，包含标题、摘要、作者等信息
             
         Returns:
-            影响力预测结果
+            影响力预测结果；没有可用模型时 impact_score 为 None
         """
-        # 提取特征
-        features = self._extract_paper_features(paper_features)
+        return self.predict_paper_impact_batch([paper_features])[0]
+    
+    def predict_paper_impact_batch(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Optional[float]]]:
+        """
+        批量预测论文影响力
         
-        # 标准化特征
-        features_scaled = self.scaler.transform([features])
+        所有论文的特征组成一个矩阵后一次性标准化和预测。置信度由森林中各棵树
+        预测值的离散程度得到：各树结果越一致，置信度越接近 1。
         
-        # 预测影响力
-        impact_score = self.impact_model.predict(features_scaled)[0]
+        Args:
+            papers: 论文特征列表
+            
+        Returns:
+            与输入顺序一致的影响力预测结果列表
+        """
+        if not papers:
+            return []
+        
+        self.refresh_models()
+        
+        # 在局部变量中持有模型，避免并发重新训练或热切换时拿到不匹配的模型和标准化器
+        model, scaler = self._impact
+        if model is None or not hasattr(scaler, 'mean_'):
+            logger.warning("影响力模型尚未训练，跳过影响力预测")
+            return [{'impact_score': None, 'confidence': 0.0} for _ in papers]
+        
+        X = scaler.transform(self._extract_paper_features_batch(papers))
+        tree_predictions = model.tree_predictions(X)
+        scores = tree_predictions.mean(axis=0)
+        spread = tree_predictions.std(axis=0)
+        confidence = 1.0 - spread / (np.abs(scores) + spread + 1e-9)
+        
+        return [
+            {'impact_score': float(score), 'confidence': float(conf)}
+            for score, conf in zip(scores, confidence)
+        ]
+    
+    def _predict_keyword_trends(self, historical_keywords: List[Dict], prediction_horizon: int) -> Dict[str, Any]:
+        """
+        预测关键词趋势
+        
+        所有关键词的时间序列堆叠为 年份×关键词 矩阵，一次最小二乘求解全部线性趋势。
+        
+        Returns:
+            predictions: {关键词: 未来各期预测值}
+            slopes: {关键词: 趋势斜率}
+            rising / falling: 斜率最大 / 最小的 keyword_top_k 个关键词
+        """
+        keywords, matrix = build_keyword_matrix(historical_keywords)
+        
+        # 只预测有足够历史数据的关键词
+        if matrix.shape[0] < 2 or not keywords:
+            return {'predictions': {}, 'slopes': {}, 'rising': [], 'falling': []}
+        
+        slopes, _, predictions = fit_linear_trends(matrix, prediction_horizon)
+        rising = top_k_indices(slopes, self.keyword_top_k)
+        falling = top_k_indices(-slopes, self.keyword_top_k)
         
         return {
-            'impact_score': float(impact_score),
-            'confidence': self._calculate_prediction_confidence(features_scaled)
+            'predictions': dict(zip(keywords, predictions.T.tolist())),
+            'slopes': dict(zip(keywords, slopes.tolist())),
+            'rising': [keywords[i] for i in rising if slopes[i] > 0],
+            'falling': [keywords[i] for i in falling if slopes[i] < 0]
         }
     
-    def _predict_keyword_trends(self, historical_keywords: List[Dict], prediction_horizon: int) -> List[Dict]:
-        """预测关键词趋势"""
-        # 收集所有关键词
-        all_keywords = set()
-        for year_keywords in historical_keywords:
-            all_keywords.update(year_keywords.keys())
-        
-        # 为每个关键词创建时间序列
-        keyword_trends = {}
-        for keyword in all_keywords:
-            values = [year_keywords.get(keyword, 0) for year_keywords in historical_keywords]
-            if len(values) > 1:  # 只预测有足够历史数据的关键词
-                X = np.array(range(len(values))).reshape(-1, 1)
-                y = np.array(values)
-                
-                # 训练模型
-                model = LinearRegression()
-                model.fit(X, y)
-                
-                # 预测未来趋势
-                X_future = np.array(range(len(values), len(values) + prediction_horizon)).reshape(-1, 1)
-                predictions = model.predict(X_future)
-                
-                keyword_trends[keyword] = predictions.tolist()
-        
-        return keyword_trends
-    
     def _extract_paper_features(self, paper_features: Dict[str, Any]) -> List[float]:
         """提取论文特征"""
         features = []
@@ -145,29 +298,91 @@ class PredictionService:
         
         return features
     
-    def _calculate_prediction_confidence(self, features_scaled: np.ndarray) -> float:
-        """计算预测置信度"""
-        # 使用特征的标准差作为置信度指标
-        confidence = 1.0 - np.std(features_scaled)
-        return float(max(0.0, min(1.0, confidence)))
+    def _extract_paper_features_batch(self, papers: List[Dict[str, Any]]) -> np.ndarray:
+        """提取多篇论文的特征矩阵，形状为 (论文数, 特征数)"""
+        return np.array([self._extract_paper_features(paper) for paper in papers], dtype=float)
     
-    def save_models(self):
-        """保存模型"""
+    def save_models(self, metadata: Optional[Dict[str, Any]] = None, promote: bool = True) -> str:
+        """
+        将模型发布为模型仓库中的新版本
+        
+        Args:
+            metadata: 附加信息，例如训练指标
+            promote: 是否立即切换为当前版本
+            
+        Returns:
+            新版本号
+        """
+        impact_model, scaler = self._impact
+        artifacts = {'scaler': scaler}
         if self.trend_model:
-            joblib.dump(self.trend_model, os.path.join(self.model_dir, 'trend_model.joblib'))
-        if self.impact_model:
-            joblib.dump(self.impact_model, os.path.join(self.model_dir, 'impact_model.joblib'))
-        joblib.dump(self.scaler, os.path.join(self.model_dir, 'scaler.joblib'))
+            artifacts['trend_model'] = self.trend_model
+        if impact_model:
+            artifacts['impact_model'] = impact_model
+        
+        version = self.registry.publish(artifacts, IMPACT_FEATURES, metadata, promote=promote)
+        if promote:
+            self.model_version = version
+        return version
     
-    def load_models(self):
-        """加载模型"""
-        trend_model_path = os.path.join(self.model_dir, 'trend_model.joblib')
-        impact_model_path = os.path.join(self.model_dir, 'impact_model.joblib')
-        scaler_path = os.path.join(self.model_dir, 'scaler.joblib')
+    def load_models(self, version: Optional[str] = None):
+        """
+        加载模型
+        
+        优先从模型仓库加载指定版本（默认当前版本），模型数组以内存映射方式共享；
+        仓库为空时回退到旧版的平铺 joblib 文件。
+        """
+        if version or self.registry.current_version():
+            try:
+                version, manifest, artifacts = self.registry.load(version)
+            except Exception as e:
+                logger.error(f"加载模型版本失败: {str(e)}")
+                return
+            
+            if manifest['feature_schema'] != IMPACT_FEATURES:
+                logger.error(f"模型版本 {version} 的特征定义与当前代码不一致，未加载")
+                return
+            
+            # 影响力模型和标准化器作为一个元组整体替换，预测时不会拿到来自不同版本的两者
+            self.trend_model = artifacts.get('trend_model')
+            self._impact = (_as_flat_forest(artifacts.get('impact_model')), artifacts['scaler'])
+            self.model_version = version
+            logger.info(f"已加载模型版本 {version}")
+            return
+        
+        # 兼容旧版本直接保存在模型目录下的产物；旧版本的默认目录是启动目录下的 models，只读不创建
+        legacy_dir = self.model_dir if _has_legacy_models(self.model_dir) else _LEGACY_MODEL_DIR
+        trend_model_path = os.path.join(legacy_dir, 'trend_model.joblib')
+        impact_model_path = os.path.join(legacy_dir, 'impact_model.joblib')
+        scaler_path = os.path.join(legacy_dir, 'scaler.joblib')
         
         if os.path.exists(trend_model_path):
             self.trend_model = joblib.load(trend_model_path)
+        model, scaler = self._impact
         if os.path.exists(impact_model_path):
-            self.impact_model = joblib.load(impact_model_path)
+            model = _as_flat_forest(joblib.load(impact_model_path))
         if os.path.exists(scaler_path):
-            self.scaler = joblib.load(scaler_path) 
\ No newline at end of file
+            scaler = joblib.load(scaler_path)
+        self._impact = (model, scaler)
+    
+    def refresh_models(self, force: bool = False) -> bool:
+        """
+        检查模型仓库的当前版本，有新版本时热切换
+        
+        Args:
+            force: 忽略检查间隔立即检查
+            
+        Returns:
+            是否切换了模型版本
+        """
+        now = time.monotonic()
+        if not force and now - self._last_reload_check < self.reload_interval:
+            return False
+        
+        with self._reload_lock:
+            self._last_reload_check = now
+            current = self.registry.current_version()
+            if current is None or current == self.model_version:
+                return False
+            self.load_models(current)
+            return self.model_version == current
@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional
+import re
+
+# 编号式参考文献的条目开头："[12] ..."、"12. ..."、"12 ..."
+_NUMBERED_ENTRY = re.compile(r'^\s*(?:\[(\d{1,4})\]|(\d{1,4})\.?)\s+(?=\S)', re.MULTILINE)
+# 作者-年份式参考文献的条目开头："Vaswani, A.,"、"Ashish Vaswani, Noam Shazeer,"、"LeCun Y,"
+_AUTHOR_ENTRY = re.compile(r"^[A-Z][A-Za-z'\-]+(?:\s+[A-Z][A-Za-z'\-]+)?,\s")
+_DOI = re.compile(r'\b(10\.\d{4,9}/[^\s"<>]+)', re.IGNORECASE)
+_YEAR = re.compile(r'(?<!\d)((?:19|20)\d{2})[a-z]?(?!\d)')
+_ARXIV = re.compile(r'arxiv(?:\s+preprint)?\s*:?\s*(?:arxiv:)?(\d{4}\.\d{4,5})', re.IGNORECASE)
+_VENUE_PREFIX = re.compile(r'^(?:in\s|proceedings\b|proc\.|advances\s+in\b|arxiv\b|journal\b|ieee\b|acm\b)',
+                           re.IGNORECASE)
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题：小写、只保留字母数字，连续空白合并为一个空格"""
+    return ' '.join(re.findall(r'[a-z0-9]+', (title or '').lower()))
+
+
+def paper_key(title: str, doi: Optional[str] = None) -> str:
+    """论文在引用图中的键：有 DOI 时使用 DOI，否则使用规范化标题"""
+    if doi:
+        return 'doi:' + doi.lower().rstrip('.')
+    return 'title:' + normalize_title(title)
+
+
+def split_references(text: str) -> List[str]:
+    """
+    把参考文献章节切分为条目
+
+    编号式（[1]、1.）按编号切分；否则按作者-年份式处理，上一行以句号结尾且下一行
+    以 "姓, 名" 开头时视为新条目。条目内部的换行合并为空格，行尾连字符断词会被还原。
+    """
+    if not text:
+        return []
+
+    markers = list(_NUMBERED_ENTRY.finditer(text))
+    # 编号需要大致递增才算编号式，避免把正文中的数字当成条目开头
+    numbers = [int(m.group(1) or m.group(2)) for m in markers]
+    if len(markers) >= 2 and sum(b == a + 1 for a, b in zip(numbers, numbers[1:])) >= len(markers) // 2:
+        bounds = [m.start() for m in markers] + [len(text)]
+        entries = [text[m.end():bounds[i + 1]] for i, m in enumerate(markers)]
+    else:
+        entries, current = [], []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if current and current[-1].endswith('.') and _AUTHOR_ENTRY.match(line):
+                entries.append(' '.join(current))
+                current = []
+            current.append(line)
+        if current:
+            entries.append(' '.join(current))
+
+    return [_join_lines(entry) for entry in entries if entry.strip()]
+
+
+def _join_lines(entry: str) -> str:
+    entry = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', entry)
+    return ' '.join(entry.split())
+
+
+def _split_fields(raw: str) -> List[str]:
+    """
+    按句点切分参考文献字段
+
+    作者名缩写（"J. Smith"、"Smith, J. and"）中的句点不作为字段边界：句点前是单个大写字母，
+    且后面紧跟另一个缩写、小写词（and）或后接逗号、句点、and、et al 的姓名时继续属于作者字段。
+    """
+    fields, start = [], 0
+    for match in re.finditer(r'\.\s+', raw):
+        end = match.start()
+        following = raw[match.end():]
+        if end >= 1 and raw[end - 1].isupper() and (end == 1 or not raw[end - 2].isalpha()):
+            if re.match(r"[A-Z]\.|[a-z]|[A-Z][A-Za-z'\-]+(?:,|\.|\s+(?:and|et\s+al)\b|\s+[A-Z]\.)", following):
+                continue
+        if not re.match(r'[A-Z0-9"“(]|arXiv\b|arxiv\b|in\s', following):
+            continue
+        fields.append(raw[start:end])
+        start = match.end()
+    fields.append(raw[start:])
+    return fields
+
+
+def parse_reference(raw: str) -> Optional[Dict[str, Any]]:
+    """
+    解析单条参考文献
+
+    返回 {'key', 'title', 'authors', 'year', 'doi', 'raw'}；识别不出标题且没有 DOI 时返回 None。
+    支持 "作者. 标题. 会议, 年份." 和 "作者. 年份. 标题. 会议." 两种常见格式。
+    """
+    doi_match = _DOI.search(raw)
+    doi = doi_match.group(1).rstrip('.,;') if doi_match else None
+    if doi is None:
+        arxiv = _ARXIV.search(raw)
+        if arxiv:
+            # arXiv 论文使用其 DataCite DOI，同一篇预印本在不同论文中引用时键一致
+            doi = f"10.48550/arXiv.{arxiv.group(1)}"
+
+    year_match = _YEAR.search(raw)
+    year = int(year_match.group(1)) if year_match else None
+
+    # 按 ". " 切分字段：第一个字段是作者，之后第一个像标题的字段作为标题
+    fields = [field.strip(' .,"“”') for field in _split_fields(raw)]
+    fields = [field for field in fields if field]
+    authors = fields[0] if fields else ''
+    title = ''
+    for field in fields[1:]:
+        if _YEAR.fullmatch(field) or re.fullmatch(r'\(?\d{4}[a-z]?\)?', field):
+            continue
+        if _VENUE_PREFIX.match(field) or len(field.split()) < 3:
+            continue
+        title = field
+        break
+    if not title and '"' in raw:
+        quoted = re.search(r'["“]([^"”]{10,})["”]', raw)
+        title = quoted.group(1).strip(' ,.') if quoted else ''
+
+    if not title and not doi:
+        return None
+    return {
+        'key': paper_key(title, doi),
+        'title': title[:500],
+        'authors': authors[:500],
+        'year': year,
+        'doi': doi,
+        'raw': raw[:2000]
+    }
+
+
+def parse_references(text: str) -> List[Dict[str, Any]]:
+    """解析参考文献章节，按键去重，保留首次出现的条目"""
+    records, seen = [], set()
+    for entry in split_references(text):
+        record = parse_reference(entry)
+        if record is None or record['key'] in seen or record['key'] == 'title:':
+            continue
+        seen.add(record['key'])
+        records.append(record)
+    return records
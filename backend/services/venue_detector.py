@@ -0,0 +1,169 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+# 会议/期刊规范名称及其别名（按词匹配，标点不敏感；大小写规则见 _is_acronym）
+VENUE_ALIASES: Dict[str, List[str]] = {
+    "ICML": ["ICML", "International Conference on Machine Learning"],
+    "ICLR": ["ICLR", "International Conference on Learning Representations"],
+    "NeurIPS": ["NeurIPS", "NIPS", "Neural Information Processing Systems",
+                "Advances in Neural Information Processing Systems"],
+    "AAAI": ["AAAI", "AAAI Conference on Artificial Intelligence"],
+    "IJCAI": ["IJCAI", "International Joint Conference on Artificial Intelligence"],
+    "AISTATS": ["AISTATS", "International Conference on Artificial Intelligence and Statistics"],
+    "UAI": ["UAI", "Conference on Uncertainty in Artificial Intelligence"],
+    "COLT": ["COLT", "Conference on Learning Theory"],
+    "KDD": ["KDD", "SIGKDD", "ACM SIGKDD Conference on Knowledge Discovery and Data Mining"],
+    "WWW": ["The Web Conference", "International World Wide Web Conference"],
+    "CVPR": ["CVPR", "Conference on Computer Vision and Pattern Recognition"],
+    "ICCV": ["ICCV", "International Conference on Computer Vision"],
+    "ECCV": ["ECCV", "European Conference on Computer Vision"],
+    "ACL": ["ACL", "Annual Meeting of the Association for Computational Linguistics"],
+    "EMNLP": ["EMNLP", "Conference on Empirical Methods in Natural Language Processing"],
+    "NAACL": ["NAACL", "NAACL-HLT"],
+    "COLING": ["COLING", "International Conference on Computational Linguistics"],
+    "SIGGRAPH": ["SIGGRAPH", "SIGGRAPH Asia"],
+    "CHI": ["CHI", "CHI Conference on Human Factors in Computing Systems"],
+    "UIST": ["UIST", "ACM Symposium on User Interface Software and Technology"],
+    "OSDI": ["OSDI", "USENIX Symposium on Operating Systems Design and Implementation"],
+    "SOSP": ["SOSP", "Symposium on Operating Systems Principles"],
+    "NSDI": ["NSDI", "USENIX Symposium on Networked Systems Design and Implementation"],
+    "EuroSys": ["EuroSys"],
+    "ATC": ["USENIX ATC", "USENIX Annual Technical Conference"],
+    "MLSys": ["MLSys", "Conference on Machine Learning and Systems", "SysML"],
+    "ASPLOS": ["ASPLOS", "International Conference on Architectural Support for Programming Languages and Operating Systems"],
+    "ISCA": ["ISCA", "International Symposium on Computer Architecture"],
+    "MICRO": ["IEEE/ACM International Symposium on Microarchitecture"],
+    "SIGMOD": ["SIGMOD", "International Conference on Management of Data"],
+    "VLDB": ["VLDB", "PVLDB", "Proceedings of the VLDB Endowment"],
+    "SIGCOMM": ["SIGCOMM"],
+    "PLDI": ["PLDI", "Conference on Programming Language Design and Implementation"],
+    "ICSE": ["ICSE", "International Conference on Software Engineering"],
+    "TPAMI": ["TPAMI", "IEEE Transactions on Pattern Analysis and Machine Intelligence"],
+    "JMLR": ["JMLR", "Journal of Machine Learning Research"],
+    "TMLR": ["TMLR", "Transactions on Machine Learning Research"],
+}
+
+# 没有命中词典时，包含这些词的行视为会议/期刊信息
+GENERIC_VENUE_WORDS = frozenset({"conference", "workshop", "symposium", "journal", "proceedings"})
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+")
+_LINE_PATTERN = re.compile(r"[^\n]+")
+
+# 不超过这个长度的全大写别名词按大小写精确匹配
+MAX_ACRONYM_LENGTH = 5
+
+
+def tokenize(text: str) -> List[str]:
+    """按字母数字切词，保留原始大小写（单次线性扫描，无回溯）"""
+    return _TOKEN_PATTERN.findall(text)
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """小写后按字母数字切词"""
+    return [token.lower() for token in tokenize(text)]
+
+
+def _is_acronym(token: str) -> bool:
+    # CHI、ACL、UAI 这类短缩写小写后是普通英文词（chi-square、acl 等），只按原样匹配
+    return len(token) <= MAX_ACRONYM_LENGTH and token.isupper()
+
+
+class VenueDetector:
+    """
+    会议/期刊识别
+
+    把别名词典编译为按词构建的 Aho-Corasick 自动机，对文本只扫描一遍即可找出所有别名，
+    时间与文本长度（加上命中数）成线性关系，不会像 `[A-Za-z\\s]+Conference` 这类正则那样
+    在长串字母上回溯。别名后紧跟的四位年份会一并返回，例如 "ICLR 2025"。
+
+    自动机按小写词匹配，命中后再检查别名中的短全大写词（CHI、ACL、ATC 等）在原文中
+    大小写是否一致，避免 "chi-square" 被识别为 CHI。
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, Iterable[str]]] = None):
+        aliases = VENUE_ALIASES if aliases is None else aliases
+        # 每个状态：转移表、失败指针、在该状态结束的 (别名词数, 规范名称, 需精确匹配的 (词序号, 原词))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str, Tuple[Tuple[int, str], ...]]]] = [[]]
+        for venue, names in aliases.items():
+            for name in names:
+                self._add(tokenize(name), venue)
+        self._build_failure_links()
+
+    def _add(self, tokens: List[str], venue: str) -> None:
+        if not tokens:
+            return
+        exact = tuple((i, token) for i, token in enumerate(tokens) if _is_acronym(token))
+        state = 0
+        for token in (token.lower() for token in tokens):
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(tokens), venue, exact))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                if state:
+                    fallback = self._fail[state]
+                    while fallback and token not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(token, 0)
+                # 失败状态上结束的别名也在当前状态结束
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[str, int, int]]:
+        """返回所有命中的 (规范名称, 起始词序号, 结束词序号)，按结束位置排列"""
+        return self._scan(tokenize(text))
+
+    def _scan(self, raw_tokens: List[str]) -> List[Tuple[str, int, int]]:
+        matches = []
+        state = 0
+        for i, raw_token in enumerate(raw_tokens):
+            token = raw_token.lower()
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for length, venue, exact in self._output[state]:
+                start = i + 1 - length
+                if all(raw_tokens[start + offset] == alias_token for offset, alias_token in exact):
+                    matches.append((venue, start, i + 1))
+        return matches
+
+    def detect(self, text: str) -> Optional[str]:
+        """
+        识别文本中的会议/期刊
+
+        优先返回后面紧跟年份的别名（通常是页眉或脚注中的 "Published at ICLR 2025"），
+        其次返回最先出现的别名；都没有时返回第一个含 Conference/Workshop 等词的行。
+        """
+        tokens = tokenize(text)
+        matches = self._scan(tokens)
+
+        first = None
+        for venue, start, end in sorted(matches, key=lambda m: (m[1], -m[2])):
+            if end < len(tokens) and _is_year(tokens[end]):
+                return f"{venue} {tokens[end]}"
+            if first is None:
+                first = venue
+        if first is not None:
+            return first
+
+        for line in _LINE_PATTERN.finditer(text):
+            if GENERIC_VENUE_WORDS.intersection(normalize_tokens(line.group(0))):
+                return line.group(0).strip()[:200]
+        return None
+
+
+def _is_year(token: str) -> bool:
+    return len(token) == 4 and token[:2] in ("19", "20") and token.isdigit()
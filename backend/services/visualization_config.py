@@ -1,6 +1,8 @@
-from typing import Dict, Any
-import plotly.graph_objects as go
-import plotly.express as px
+from __future__ import annotations
+from typing import Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 class VisualizationConfig:
     """可视化配置类，定义图表的样式和交互设置"""
@@ -276,9 +278,11 @@ class VisualizationConfig:
         # 应用样式配置
         if 'style' in config:
             for trace in fig.data:
+                # 柱状图的marker不支持size等折线图属性
+                is_bar = trace.type == 'bar'
                 if 'line' in config['style'] and hasattr(trace, 'line'):
                     trace.line.update(**config['style']['line'])
-                if 'marker' in config['style'] and hasattr(trace, 'marker'):
+                if 'marker' in config['style'] and hasattr(trace, 'marker') and not is_bar:
                     trace.marker.update(**config['style']['marker'])
                 if 'bar' in config['style'] and hasattr(trace, 'marker'):
                     trace.marker.update(**config['style']['bar'])
@@ -1,104 +1,167 @@
-from typing import List, Dict, Any
-import matplotlib.pyplot as plt
-import seaborn as sns
-import networkx as nx
-from datetime import datetime
+from __future__ import annotations
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from collections import Counter
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import json
 import os
+import hashlib
+import re
+import threading
 from .visualization_config import VisualizationConfig
+from .graph_layout import CitationLayoutEngine, aggregate_leaf_nodes
+from .keyword_matrix import build_keyword_matrix, select_top_keywords
+from .figure_export import FigureExportPool
+from .lazy_imports import lazy_import
+
+# plotly/matplotlib 在首次绘图时才导入
+go = lazy_import('plotly.graph_objects')
+matplotlib = lazy_import('matplotlib')
 
 class VisualizationService:
     def __init__(self):
         # 设置中文字体支持
-        plt.rcParams['font.sans-serif'] = ['Arial Unicode MS']
-        plt.rcParams['axes.unicode_minus'] = False
+        matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS']
+        matplotlib.rcParams['axes.unicode_minus'] = False
         
         # 创建输出目录
         self.output_dir = "static/visualizations"
         os.makedirs(self.output_dir, exist_ok=True)
+        # 每个HTML图表文件最近一次写入的内容哈希，内容未变时不重复写入
+        self._saved_keys: Dict[str, str] = {}
+        self._saved_keys_lock = threading.Lock()
+        
+        # 引用网络布局：超过阈值的节点数改用WebGL渲染并折叠叶子节点
+        self.layout_engine = CitationLayoutEngine()
+        self.webgl_threshold = 1000
+        self.aggregate_threshold = 2000
+        
+        # 关键词热力图：最多展示的关键词数、排序依据（total/variance）、是否对数缩放
+        self.heatmap_top_n = 50
+        self.heatmap_rank_by = 'total'
+        self.heatmap_log_scale = False
+        
+        # 静态图片导出进程池（首次导出时启动并保持预热）
+        self.export_pool = FigureExportPool(num_workers=2)
+        self.export_timeout = 60
     
     def generate_trend_visualizations(self, time_series: Dict[str, List]) -> Dict[str, str]:
         """生成趋势相关的可视化图表"""
-        visualizations = {}
+        return self._save_figures(self.build_trend_figures(time_series))
+    
+    def generate_topic_evolution_visualizations(self, topic_evolution: List[Dict]) -> Dict[str, str]:
+        """生成主题演化相关的可视化图表"""
+        return self._save_figures(self.build_topic_evolution_figures(topic_evolution))
+    
+    def generate_citation_visualizations(self, citation_trends: Dict) -> Dict[str, str]:
+        """生成引用相关的可视化图表"""
+        return self._save_figures(self.build_citation_figures(citation_trends))
+    
+    def generate_methodology_visualizations(self, methodology_evolution: List[Dict]) -> Dict[str, str]:
+        """生成方法演化相关的可视化图表"""
+        return self._save_figures(self.build_methodology_figures(methodology_evolution))
+    
+    def generate_experiment_visualizations(self, experiment_trends: Dict) -> Dict[str, str]:
+        """生成实验趋势相关的可视化图表"""
+        return self._save_figures(self.build_experiment_figures(experiment_trends))
+    
+    def build_trend_figures(self, time_series: Dict[str, List]) -> Dict[str, go.Figure]:
+        """构建趋势相关的图表对象"""
+        figures = {}
         
         # 生成论文数量趋势图
-        paper_count_fig = self._create_paper_count_trend(time_series)
-        visualizations['paper_count_trend'] = self._save_figure(paper_count_fig, 'paper_count_trend')
+        figures['paper_count_trend'] = self._create_paper_count_trend(time_series)
         
         # 生成引用趋势图
-        citation_fig = self._create_citation_trend(time_series)
-        visualizations['citation_trend'] = self._save_figure(citation_fig, 'citation_trend')
+        figures['citation_trend'] = self._create_citation_trend(time_series)
         
         # 生成关键词热力图
-        keyword_heatmap = self._create_keyword_heatmap(time_series)
-        visualizations['keyword_heatmap'] = self._save_figure(keyword_heatmap, 'keyword_heatmap')
+        figures['keyword_heatmap'] = self._create_keyword_heatmap(time_series)
         
-        return visualizations
+        return figures
     
-    def generate_topic_evolution_visualizations(self, topic_evolution: List[Dict]) -> Dict[str, str]:
-        """生成主题演化相关的可视化图表"""
-        visualizations = {}
+    def build_topic_evolution_figures(self, topic_evolution: List[Dict]) -> Dict[str, go.Figure]:
+        """构建主题演化相关的图表对象"""
+        figures = {}
         
         # 生成主题演化图
-        topic_evolution_fig = self._create_topic_evolution_chart(topic_evolution)
-        visualizations['topic_evolution'] = self._save_figure(topic_evolution_fig, 'topic_evolution')
+        figures['topic_evolution'] = self._create_topic_evolution_chart(topic_evolution)
         
         # 生成新兴主题图
-        emerging_topics_fig = self._create_emerging_topics_chart(topic_evolution)
-        visualizations['emerging_topics'] = self._save_figure(emerging_topics_fig, 'emerging_topics')
+        figures['emerging_topics'] = self._create_emerging_topics_chart(topic_evolution)
         
-        return visualizations
+        return figures
     
-    def generate_citation_visualizations(self, citation_trends: Dict) -> Dict[str, str]:
-        """生成引用相关的可视化图表"""
-        visualizations = {}
+    def build_citation_figures(self, citation_trends: Dict) -> Dict[str, go.Figure]:
+        """构建引用相关的图表对象"""
+        figures = {}
         
         # 生成引用网络图
-        citation_network_fig = self._create_citation_network(citation_trends['citation_networks'])
-        visualizations['citation_network'] = self._save_figure(citation_network_fig, 'citation_network')
+        figures['citation_network'] = self._create_citation_network(citation_trends['citation_networks'])
         
         # 生成引用影响力图
-        citation_impact_fig = self._create_citation_impact_chart(citation_trends['citation_impact'])
-        visualizations['citation_impact'] = self._save_figure(citation_impact_fig, 'citation_impact')
+        figures['citation_impact'] = self._create_citation_impact_chart(citation_trends['citation_impact'])
         
-        return visualizations
+        return figures
     
-    def generate_methodology_visualizations(self, methodology_evolution: List[Dict]) -> Dict[str, str]:
-        """生成方法演化相关的可视化图表"""
-        visualizations = {}
+    def build_methodology_figures(self, methodology_evolution: List[Dict]) -> Dict[str, go.Figure]:
+        """构建方法演化相关的图表对象"""
+        figures = {}
         
         # 生成方法演化图
-        method_evolution_fig = self._create_method_evolution_chart(methodology_evolution)
-        visualizations['method_evolution'] = self._save_figure(method_evolution_fig, 'method_evolution')
+        figures['method_evolution'] = self._create_method_evolution_chart(methodology_evolution)
         
         # 生成方法改进图
-        method_improvements_fig = self._create_method_improvements_chart(methodology_evolution)
-        visualizations['method_improvements'] = self._save_figure(method_improvements_fig, 'method_improvements')
+        figures['method_improvements'] = self._create_method_improvements_chart(methodology_evolution)
         
-        return visualizations
+        return figures
     
-    def generate_experiment_visualizations(self, experiment_trends: Dict) -> Dict[str, str]:
-        """生成实验趋势相关的可视化图表"""
-        visualizations = {}
+    def build_experiment_figures(self, experiment_trends: Dict) -> Dict[str, go.Figure]:
+        """构建实验趋势相关的图表对象"""
+        figures = {}
         
         # 生成数据集使用趋势图
-        dataset_trend_fig = self._create_dataset_trend_chart(experiment_trends['dataset_usage'])
-        visualizations['dataset_trend'] = self._save_figure(dataset_trend_fig, 'dataset_trend')
+        figures['dataset_trend'] = self._create_dataset_trend_chart(experiment_trends['dataset_usage'])
         
         # 生成评估指标演化图
-        metric_evolution_fig = self._create_metric_evolution_chart(experiment_trends['metric_evolution'])
-        visualizations['metric_evolution'] = self._save_figure(metric_evolution_fig, 'metric_evolution')
+        figures['metric_evolution'] = self._create_metric_evolution_chart(experiment_trends['metric_evolution'])
         
         # 生成实验设计趋势图
-        design_trend_fig = self._create_design_trend_chart(experiment_trends['experiment_design'])
-        visualizations['design_trend'] = self._save_figure(design_trend_fig, 'design_trend')
+        figures['design_trend'] = self._create_design_trend_chart(experiment_trends['experiment_design'])
         
-        return visualizations
+        return figures
+    
+    def export_figure(self, fig: go.Figure, filename: str, image_format: str = 'png') -> bytes:
+        """导出单个图表为静态图片字节"""
+        return self.export_figures({filename: fig}, image_format)[filename]
+    
+    def export_figures(self, figures: Dict[str, go.Figure], image_format: str = 'png',
+                       width: Optional[int] = None, height: Optional[int] = None,
+                       scale: float = 1.0) -> Dict[str, bytes]:
+        """
+        批量导出静态图片（PNG/SVG等）
+        
+        图片按图表内容哈希和导出尺寸命名，已导出的图片直接从磁盘读取；
+        未命中的图表并发提交给常驻导出进程池，写入新图片后删除同一图表同一尺寸的旧版本。
+        """
+        images = {}
+        pending = {}
+        size_suffix = f"{width or 'auto'}x{height or 'auto'}@{scale:g}.{image_format}"
+        for filename, fig in figures.items():
+            fig_json, key = self._figure_key(fig)
+            filepath = os.path.join(self.output_dir, f"{filename}_{key}_{size_suffix}")
+            if os.path.exists(filepath):
+                with open(filepath, 'rb') as f:
+                    images[filename] = f.read()
+            else:
+                future = self.export_pool.submit(fig_json, image_format, width, height, scale)
+                pending[filename] = (future, filepath)
+        
+        for filename, (future, filepath) in pending.items():
+            image = future.result(timeout=self.export_timeout)
+            self._write_atomic(filepath, image)
+            self._evict_stale_images(filename, size_suffix, filepath)
+            images[filename] = image
+        
+        return images
     
     def _create_paper_count_trend(self, time_series: Dict[str, List]) -> go.Figure:
         """创建论文数量趋势图"""
@@ -136,20 +199,18 @@ class VisualizationService:
     
     def _create_keyword_heatmap(self, time_series: Dict[str, List]) -> go.Figure:
         """创建关键词热力图"""
-        # 提取所有年份的关键词
-        all_keywords = set()
-        for year_freq in time_series['keyword_frequencies']:
-            all_keywords.update(year_freq.keys())
+        # 构建 年份×关键词 矩阵，列按首次出现顺序排列
+        keywords, matrix = build_keyword_matrix(time_series['keyword_frequencies'])
         
-        # 创建热力图数据
-        heatmap_data = []
-        for year_freq in time_series['keyword_frequencies']:
-            row = [year_freq.get(keyword, 0) for keyword in all_keywords]
-            heatmap_data.append(row)
+        # 只保留得分最高的关键词，控制热力图规模
+        columns = select_top_keywords(matrix, self.heatmap_top_n, self.heatmap_rank_by)
+        heatmap_data = matrix[:, columns]
+        if self.heatmap_log_scale:
+            heatmap_data = np.log1p(heatmap_data)
         
         fig = go.Figure(data=go.Heatmap(
             z=heatmap_data,
-            x=list(all_keywords),
+            x=[keywords[i] for i in columns],
             y=time_series['years']
         ))
         
@@ -209,59 +270,61 @@ class VisualizationService:
     
     def _create_citation_network(self, citation_networks: List[Dict]) -> go.Figure:
         """创建引用网络图"""
-        # 创建网络图
-        G = nx.Graph()
-        
-        # 添加节点和边
+        # 构建节点下标和去重后的无向边表
+        node_index = {}
+        edge_set = set()
         for network in citation_networks:
-            paper = network['paper']
-            G.add_node(paper)
-            
+            paper = node_index.setdefault(network['paper'], len(node_index))
             for cited_paper in network['cited_papers']:
-                G.add_node(cited_paper)
-                G.add_edge(paper, cited_paper)
+                cited = node_index.setdefault(cited_paper, len(node_index))
+                if cited != paper:
+                    edge_set.add((min(paper, cited), max(paper, cited)))
         
-        # 使用spring布局
-        pos = nx.spring_layout(G)
+        nodes = list(node_index)
+        edges = np.array(sorted(edge_set), dtype=np.int64).reshape(-1, 2)
+        weights = np.ones(len(nodes), dtype=np.int64)
         
-        # 创建图形
-        fig = go.Figure()
+        # 节点过多时将叶子节点折叠进其邻居
+        if len(nodes) > self.aggregate_threshold:
+            kept, edges, weights = aggregate_leaf_nodes(len(nodes), edges)
+            nodes = [nodes[i] for i in kept]
         
-        # 添加边
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        pos = self.layout_engine.layout(nodes, edges)
+        degree = np.bincount(edges.ravel(), minlength=len(nodes))
         
-        fig.add_trace(go.Scatter(
-            x=edge_x, y=edge_y,
+        # 大图使用WebGL渲染，并且不在节点上绘制文字标签
+        large_graph = len(nodes) > self.webgl_threshold
+        scatter = go.Scattergl if large_graph else go.Scatter
+        
+        fig = go.Figure()
+        
+        # 添加边（以NaN分隔各线段）
+        edge_xy = np.full((len(edges) * 3, 2), np.nan)
+        edge_xy[0::3] = pos[edges[:, 0]]
+        edge_xy[1::3] = pos[edges[:, 1]]
+        fig.add_trace(scatter(
+            x=edge_xy[:, 0], y=edge_xy[:, 1],
             line=dict(width=0.5),
             hoverinfo='none',
             mode='lines'
         ))
         
         # 添加节点
-        node_x = []
-        node_y = []
-        node_text = []
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(node)
-        
-        fig.add_trace(go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
+        node_text = [
+            f"{node} (+{weight - 1})" if weight > 1 else node
+            for node, weight in zip(nodes, weights.tolist())
+        ]
+        fig.add_trace(scatter(
+            x=pos[:, 0], y=pos[:, 1],
+            mode='markers' if large_graph else 'markers+text',
             hoverinfo='text',
-            text=node_text,
+            text=None if large_graph else nodes,
+            hovertext=node_text,
             marker=dict(
                 showscale=True,
                 colorscale='YlGnBu',
-                size=10
+                color=degree,
+                size=6 + 2 * np.log1p(weights - 1) if large_graph else 10
             )
         ))
         
@@ -388,8 +451,43 @@ class VisualizationService:
         
         return fig
     
+    def _save_figures(self, figures: Dict[str, go.Figure]) -> Dict[str, str]:
+        """保存一组图表并返回文件路径"""
+        return {name: self._save_figure(fig, name) for name, fig in figures.items()}
+    
     def _save_figure(self, fig: go.Figure, filename: str) -> str:
-        """保存图表并返回文件路径"""
+        """保存图表并返回文件路径（每个图表一个文件，内容未变时不重复写入）"""
+        fig_json, key = self._figure_key(fig)
         filepath = os.path.join(self.output_dir, f"{filename}.html")
-        fig.write_html(filepath)
-        return filepath 
\ No newline at end of file
+        with self._saved_keys_lock:
+            unchanged = self._saved_keys.get(filepath) == key and os.path.exists(filepath)
+        if not unchanged:
+            self._write_atomic(filepath, fig.to_html().encode('utf-8'))
+            with self._saved_keys_lock:
+                self._saved_keys[filepath] = key
+        return filepath
+    
+    def _evict_stale_images(self, filename: str, size_suffix: str, keep: str) -> None:
+        """删除同一图表、同一格式和尺寸的旧版本图片，每种导出只保留最新内容"""
+        pattern = re.compile(rf"^{re.escape(filename)}_[0-9a-f]{{16}}_{re.escape(size_suffix)}$")
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if pattern.match(name) and path != keep:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    @staticmethod
+    def _figure_key(fig: go.Figure) -> Tuple[str, str]:
+        """返回图表JSON及其内容哈希"""
+        fig_json = fig.to_json()
+        return fig_json, hashlib.sha256(fig_json.encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def _write_atomic(filepath: str, content: bytes) -> None:
+        """先写临时文件再重命名，避免并发请求读到不完整的文件"""
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
@@ -1,11 +1,13 @@
 from typing import Dict, List
-from transformers import pipeline
 import re
+from .lazy_imports import lazy_import
+
+transformers = lazy_import('transformers')
 
 class WritingAssistantService:
     def __init__(self):
-        self.grammar_checker = pipeline("text2text-generation", model="t5-base")
-        self.style_analyzer = pipeline("text-classification", model="distilbert-base-uncased")
+        self.grammar_checker = transformers.pipeline("text2text-generation", model="t5-base")
+        self.style_analyzer = transformers.pipeline("text-classification", model="distilbert-base-uncased")
         
     async def optimize_structure(self, content: str) -> Dict:
         """
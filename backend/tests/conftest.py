@@ -0,0 +1,27 @@
+"""
+pytest 入口：复用 benchmark.py 中的一致性检查
+
+检查函数不满足时以非零状态码退出（sys.exit），这里把 SystemExit 转为测试失败。
+在 backend 目录下执行: python -m pytest -q tests
+"""
+import argparse
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def run_check(capsys):
+    """以给定参数运行 benchmark 检查函数，退出码非零时测试失败并附上输出"""
+    def run(func, **kwargs):
+        try:
+            func(argparse.Namespace(**kwargs))
+        except SystemExit as e:
+            if e.code:
+                pytest.fail(f"{func.__name__} 检查失败:\n{capsys.readouterr().out}")
+    return run
@@ -0,0 +1,87 @@
+"""
+生成 pdf-backends 基准使用的 PDF 夹具（pdfs/ 下的 .pdf 与同名 .txt 参考文本）
+
+与 benchmark.py 中手写的 Type1 合成 PDF 不同，这里用 matplotlib 的 PDF 后端输出，
+字体为嵌入的 TrueType 子集（带 ToUnicode 映射），更接近真实论文的字体编码。
+夹具已提交到仓库，修改本脚本后在 backend 目录下重新生成:
+    python tests/fixtures/make_pdfs.py
+"""
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdfs")
+
+PAPERS = {
+    "single_column": (1, [
+        [
+            "Efficient Retrieval over Citation Graphs",
+            "Alice Zhang, Bob Smith",
+            "Published as a conference paper at ICLR 2024",
+            "Abstract",
+            "We study retrieval over large citation graphs and show that a sparse",
+            "index of reference keys answers most queries without touching the",
+            "full text. The offline pipeline finishes in minutes on a laptop.",
+            "1 Introduction",
+            "Literature review tools fetch the same papers many times a day.",
+            "Caching extracted text by content hash removes repeated parsing.",
+        ],
+        [
+            "2 Method",
+            "Each upload is hashed once while streaming to disk, and the hash",
+            "keys both the blob store and the extraction cache.",
+            "3 Results",
+            "Throughput grows linearly with workers until the disk saturates.",
+            "References",
+            "[1] C. Lee. Sparse indexes for scholarly search. In ACL 2022.",
+        ],
+    ]),
+    "two_column": (2, [
+        [
+            "Robust Venue Detection for Preprints",
+            "Carol Lee, Dan Brown",
+            "38th Conference on Neural Information Processing Systems",
+            "Abstract",
+            "Preprints rarely state where they were published.",
+            "We match venue strings against a curated list",
+            "using a single automaton over the first page.",
+            "1 Introduction",
+            "Regular expressions per venue scale poorly.",
+            "A trie of canonical names avoids backtracking.",
+            "2 Evaluation",
+            "On ten thousand first pages the detector agrees",
+            "with manual labels in almost every case.",
+            "Short acronyms only match in upper case.",
+            "References",
+            "[1] E. Wong. Automata for text search. 2019.",
+        ],
+    ]),
+}
+
+
+def render(path: str, columns: int, pages) -> None:
+    with PdfPages(path, metadata={"CreationDate": None, "ModDate": None}) as pdf:
+        for lines in pages:
+            fig = Figure(figsize=(8.5, 11))
+            per_column = -(-len(lines) // columns)
+            for column in range(columns):
+                for row, line in enumerate(lines[column * per_column:(column + 1) * per_column]):
+                    fig.text(0.08 + column * 0.46, 0.92 - row * 0.03, line,
+                             fontsize=10 if columns == 1 else 8, family="DejaVu Sans")
+            pdf.savefig(fig)
+
+
+def main():
+    matplotlib.rcParams["pdf.fonttype"] = 42
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, (columns, pages) in PAPERS.items():
+        render(os.path.join(FIXTURE_DIR, f"{name}.pdf"), columns, pages)
+        with open(os.path.join(FIXTURE_DIR, f"{name}.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(line for lines in pages for line in lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
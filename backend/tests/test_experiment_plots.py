@@ -0,0 +1,12 @@
+import benchmark
+
+
+def test_parallel_plots_match_serial(run_check, tmp_path, monkeypatch):
+    # 服务在当前目录下创建 static/experiments
+    monkeypatch.chdir(tmp_path)
+    run_check(benchmark.bench_experiment_plots, plots=8, workers=4, format="png")
+
+
+def test_parallel_svg_plots_are_deterministic(run_check, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    run_check(benchmark.bench_experiment_plots, plots=8, workers=4, format="svg")
@@ -0,0 +1,8 @@
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize("module", ["services.paper_analysis", "services.prediction_service"])
+def test_service_import_stays_within_budget(run_check, module):
+    run_check(benchmark.bench_imports, module=module, budget_ms=300, budget_mb=40, top=15, repeat=3)
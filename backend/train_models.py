@@ -0,0 +1,194 @@
+"""
+预测模型离线训练脚本
+
+从爬取的论文语料（JSON/JSONL）中并行提取特征，交叉验证搜索影响力模型的超参数，
+在留出集上评估后用全部数据重新训练，并发布为模型仓库中的新版本，
+供 PredictionService.load_models 加载。
+
+用法（在 backend 目录下执行）:
+    python train_models.py iclr2025_papers.json chi2025_papers.json --target rating
+    python train_models.py corpus.jsonl --target citations --workers 8 --cv 5 --n-jobs -1
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 每个特征提取进程各自持有一个 PaperAnalysisService
+_worker_analyzer = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    from services.paper_analysis import PaperAnalysisService
+    _worker_analyzer = PaperAnalysisService()
+
+
+def _extract_features(paper: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        return _worker_analyzer.extract_impact_features(paper)
+    except Exception as e:
+        logger.error(f"提取特征失败（{paper.get('title', '')[:50]}）: {str(e)}")
+        return None
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """读取论文语料：JSONL 每行一篇论文，JSON 为论文列表或包含 papers 字段的对象"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data['papers'] if isinstance(data, dict) else data
+
+
+def extract_features_parallel(papers: List[Dict[str, Any]], workers: int) -> List[Optional[Dict[str, Any]]]:
+    """在进程池中提取影响力特征，结果与输入顺序一致"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(_extract_features, papers, chunksize=32))
+
+
+def build_dataset(papers: List[Dict[str, Any]], target: str,
+                  workers: int) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """筛选带有目标值的论文并提取特征"""
+    labeled = []
+    for paper in papers:
+        try:
+            labeled.append((paper, float(paper[target])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    logger.info(f"共 {len(papers)} 篇论文，其中 {len(labeled)} 篇带有目标字段 {target}")
+
+    features = extract_features_parallel([paper for paper, _ in labeled], workers)
+    rows = [(feature, y) for feature, (_, y) in zip(features, labeled) if feature is not None]
+    return [feature for feature, _ in rows], np.array([y for _, y in rows])
+
+
+def measure_latency(service, papers: List[Dict[str, Any]], repeat: int = 20) -> Dict[str, float]:
+    """测量单篇预测和整批预测的延迟（毫秒）"""
+    start = time.perf_counter()
+    for paper in papers[:repeat]:
+        service.predict_paper_impact(paper)
+    single_ms = (time.perf_counter() - start) * 1000 / min(repeat, len(papers))
+
+    start = time.perf_counter()
+    service.predict_paper_impact_batch(papers)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    return {'single_ms': single_ms, 'batch_ms': batch_ms, 'batch_size': len(papers)}
+
+
+def train(args) -> Dict[str, Any]:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import GridSearchCV, train_test_split
+    from services.prediction_service import PredictionService
+
+    papers = []
+    for path in args.corpus:
+        papers.extend(load_corpus(path))
+
+    start = time.perf_counter()
+    features, targets = build_dataset(papers, args.target, args.workers)
+    extract_time = time.perf_counter() - start
+    logger.info(f"特征提取完成: {len(features)} 篇，耗时 {extract_time:.1f}s")
+    if len(features) < max(10, args.cv * 2):
+        raise SystemExit(f"可用样本过少（{len(features)}），无法训练")
+
+    service = PredictionService(model_dir=args.model_dir)
+
+    train_idx, test_idx = train_test_split(np.arange(len(features)), test_size=args.test_size,
+                                           random_state=42)
+    train_papers = [features[i] for i in train_idx]
+    test_papers = [features[i] for i in test_idx]
+
+    # 交叉验证搜索超参数（随机森林对特征缩放不敏感，直接使用原始特征）
+    search = GridSearchCV(
+        RandomForestRegressor(random_state=42),
+        param_grid={
+            'n_estimators': args.n_estimators,
+            'max_depth': [None if depth == 0 else depth for depth in args.max_depth],
+            'min_samples_leaf': args.min_samples_leaf
+        },
+        cv=args.cv,
+        scoring='r2',
+        n_jobs=args.n_jobs
+    )
+    start = time.perf_counter()
+    search.fit(service._extract_paper_features_batch(train_papers), targets[train_idx])
+    search_time = time.perf_counter() - start
+    best_params = dict(search.best_params_)
+    logger.info(f"超参数搜索完成，耗时 {search_time:.1f}s，最佳参数: {best_params}")
+
+    # 在训练集上用最佳参数训练，并在留出集上评估
+    start = time.perf_counter()
+    service.fit_impact_model(train_papers, targets[train_idx].tolist(), n_jobs=args.n_jobs, **best_params)
+    fit_time = time.perf_counter() - start
+    predictions = np.array([result['impact_score'] for result in service.predict_paper_impact_batch(test_papers)])
+    latency = measure_latency(service, test_papers)
+
+    report = {
+        'target': args.target,
+        'n_samples': len(features),
+        'best_params': best_params,
+        'cv_r2': float(search.best_score_),
+        'test_r2': float(r2_score(targets[test_idx], predictions)),
+        'test_mae': float(mean_absolute_error(targets[test_idx], predictions)),
+        'extract_time_s': extract_time,
+        'search_time_s': search_time,
+        'fit_time_s': fit_time,
+        'latency': latency
+    }
+
+    # 用全部数据重新训练后发布
+    service.fit_impact_model(features, targets.tolist(), n_jobs=args.n_jobs, **best_params)
+    version = service.save_models(metadata=report, promote=not args.no_promote)
+    version_dir = os.path.join(service.registry.versions_dir, version)
+    report['version'] = version
+    report['model_size_mb'] = sum(
+        os.path.getsize(os.path.join(version_dir, name)) for name in os.listdir(version_dir)
+    ) / 1024 / 1024
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency = report['latency']
+    print(f"模型版本:     {report['version']}")
+    print(f"样本数:       {report['n_samples']}（目标字段 {report['target']}）")
+    print(f"最佳参数:     {report['best_params']}")
+    print(f"交叉验证 R²:  {report['cv_r2']:.4f}")
+    print(f"留出集 R²:    {report['test_r2']:.4f}，MAE: {report['test_mae']:.4f}")
+    print(f"特征提取:     {report['extract_time_s']:.1f}s")
+    print(f"超参数搜索:   {report['search_time_s']:.1f}s")
+    print(f"训练耗时:     {report['fit_time_s']:.2f}s")
+    print(f"推理延迟:     单篇 {latency['single_ms']:.2f}ms，"
+          f"{latency['batch_size']} 篇批量 {latency['batch_ms']:.1f}ms")
+    print(f"模型大小:     {report['model_size_mb']:.2f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="训练 PredictionService 的影响力模型")
+    parser.add_argument("corpus", nargs="+", help="论文语料文件（.json 或 .jsonl）")
+    parser.add_argument("--target", default="impact_score", help="作为影响力目标值的论文字段")
+    parser.add_argument("--model-dir", default=None, help="模型仓库目录，默认取配置 MODEL_REGISTRY_PATH")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="特征提取进程数")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="超参数搜索和训练的并行数")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--n-estimators", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--max-depth", type=int, nargs="+", default=[0, 10, 20], help="0 表示不限制深度")
+    parser.add_argument("--min-samples-leaf", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--no-promote", action="store_true", help="只发布版本，不切换为当前版本")
+    args = parser.parse_args()
+
+    print_report(train(args))
+
+
+if __name__ == "__main__":
+    main()